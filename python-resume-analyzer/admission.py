@@ -0,0 +1,127 @@
+# File: python-resume-analyzer/admission.py
+# Description: Admission control in front of the CPU-heavy analysis: at most ANALYSIS_CONCURRENCY analyses run at
+# once per worker, the rest wait in bounded per-lane queues, and interactive requests always go before batch work.
+# A request that would queue past its lane's limit, or wait longer than its lane allows, is refused (503 +
+# Retry-After) rather than stretching everyone's latency.
+
+import math
+import os
+import threading
+import time
+from collections import deque
+import metrics
+
+LANES = ("interactive", "batch") # In priority order
+
+class Overloaded(Exception):
+    """No analysis slot within the lane's queue or wait limit; retry_after is a suggested delay in seconds."""
+
+    def __init__(self, lane: str, reason: str, retry_after: int):
+        super().__init__(f"The analyzer is busy ({lane} {'queue is full' if reason == 'queue_full' else 'wait timed out'}). Please retry in {retry_after}s.")
+        self.lane, self.reason, self.retry_after = lane, reason, retry_after
+
+class AdmissionController:
+    """Hands out up to concurrency analysis slots. Waiting requests are served strictly by lane priority, then in
+    arrival order, so interactive requests only ever wait for analyses already running, never for queued batch work.
+    Queue depth and time in queue are exported per lane."""
+
+    def __init__(self, concurrency: int = 1, queue_limits: dict = None, max_waits: dict = None):
+        self.concurrency = max(1, concurrency)
+        self.queue_limits = {"interactive": 32, "batch": 2, **(queue_limits or {})}
+        self.max_waits = {"interactive": 10.0, "batch": 60.0, **(max_waits or {})} # Seconds
+        self._waiting = {lane: deque() for lane in LANES}
+        self._running = {lane: 0 for lane in LANES}
+        self._service_seconds = 1.0 # Moving average of how long a slot is held, for Retry-After
+        self._condition = threading.Condition()
+        self._counters = {"admitted": 0, "rejected": 0}
+
+    def _next_ticket(self):
+        for lane in LANES:
+            if self._waiting[lane]: return self._waiting[lane][0]
+        return None
+
+    def _retry_after(self, lane: str) -> int:
+        ahead = sum(self._running.values()) + sum(len(self._waiting[name]) for name in LANES[:LANES.index(lane) + 1])
+        return min(60, max(1, math.ceil(ahead * self._service_seconds / self.concurrency)))
+
+    def _publish(self):
+        for lane in LANES: metrics.set_admission_depth(lane, len(self._waiting[lane]), self._running[lane])
+
+    def _reject(self, lane: str, reason: str, waited: float):
+        self._counters["rejected"] += 1
+        metrics.observe_admission_wait(lane, waited, reason)
+        raise Overloaded(lane, reason, self._retry_after(lane))
+
+    def acquire(self, lane: str, block: bool = False):
+        """Takes a slot in lane, waiting as long as needed. Unless block, raises Overloaded when the lane's queue is
+        already full or the wait passes its max_waits; with block, it waits without either limit (for work that was
+        already admitted elsewhere, e.g. async jobs in their own bounded queue)."""
+        if lane not in LANES: raise ValueError(f"Unknown lane '{lane}'")
+        start, ticket = time.perf_counter(), object()
+        with self._condition:
+            if sum(self._running.values()) >= self.concurrency or self._next_ticket() is not None:
+                if not block and len(self._waiting[lane]) >= self.queue_limits[lane]: self._reject(lane, "queue_full", 0.0)
+                self._waiting[lane].append(ticket)
+                self._publish()
+                deadline = None if block else start + self.max_waits[lane]
+                while sum(self._running.values()) >= self.concurrency or self._next_ticket() is not ticket:
+                    remaining = None if deadline is None else deadline - time.perf_counter()
+                    if remaining is not None and remaining <= 0:
+                        self._waiting[lane].remove(ticket)
+                        self._publish()
+                        self._condition.notify_all() # The next ticket may now be at the front
+                        self._reject(lane, "timeout", time.perf_counter() - start)
+                    self._condition.wait(remaining)
+                self._waiting[lane].popleft()
+            self._running[lane] += 1
+            self._counters["admitted"] += 1
+            self._publish()
+        metrics.observe_admission_wait(lane, time.perf_counter() - start, "admitted")
+        return time.perf_counter()
+
+    def release(self, lane: str, acquired_at: float):
+        with self._condition:
+            self._running[lane] -= 1
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * (time.perf_counter() - acquired_at)
+            self._publish()
+            self._condition.notify_all()
+
+    def slot(self, lane: str, block: bool = False):
+        """with admission.slot("interactive"): ... runs the block in an analysis slot (see acquire())."""
+        return _Slot(self, lane, block)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {"concurrency": self.concurrency, "running": dict(self._running), "waiting": {lane: len(queue) for lane, queue in self._waiting.items()},
+                    "avgServiceSeconds": round(self._service_seconds, 3), **self._counters}
+
+class _Slot:
+    __slots__ = ("controller", "lane", "block", "acquired_at")
+
+    def __init__(self, controller: AdmissionController, lane: str, block: bool):
+        self.controller, self.lane, self.block = controller, lane, block
+
+    def __enter__(self):
+        self.acquired_at = self.controller.acquire(self.lane, self.block)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.controller.release(self.lane, self.acquired_at)
+        return False
+
+class _NoAdmission:
+    # Stands in for the controller when ADMISSION_ENABLED=0
+    def slot(self, lane: str, block: bool = False): return self
+    def stats(self): return None
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc, tb): return False
+
+def admission_controller_from_env():
+    """Controller configured by ANALYSIS_CONCURRENCY (slots per worker, default 1: spaCy holds the GIL) and
+    ADMISSION_<LANE>_QUEUE / ADMISSION_<LANE>_MAX_WAIT_MS; ADMISSION_ENABLED=0 turns admission control off."""
+    if os.environ.get("ADMISSION_ENABLED", "1") == "0": return _NoAdmission()
+    return AdmissionController(
+        concurrency=int(os.environ.get("ANALYSIS_CONCURRENCY", 1)),
+        queue_limits={lane: int(os.environ[f"ADMISSION_{lane.upper()}_QUEUE"]) for lane in LANES if f"ADMISSION_{lane.upper()}_QUEUE" in os.environ},
+        max_waits={lane: float(os.environ[f"ADMISSION_{lane.upper()}_MAX_WAIT_MS"]) / 1000 for lane in LANES if f"ADMISSION_{lane.upper()}_MAX_WAIT_MS" in os.environ},
+    )
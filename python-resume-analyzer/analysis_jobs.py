@@ -0,0 +1,151 @@
+# File: python-resume-analyzer/analysis_jobs.py
+# Description: Background analysis jobs - a bounded worker pool plus an in-process or SQLite job store with progress events.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+FINISHED_STATUSES = ("done", "failed")
+
+class MemoryJobStore:
+    """Jobs and their event logs in this process only; waiting readers are woken as soon as an event is added."""
+
+    def __init__(self, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._jobs = {} # job_id -> job dict
+        self._events = {} # job_id -> list of (event, data)
+        self._changed = threading.Condition()
+
+    def create(self, job_id: str):
+        now = time.time()
+        with self._changed:
+            for old_id in [j for j, job in self._jobs.items() if job["status"] in FINISHED_STATUSES and now - job["updatedAt"] > self.ttl_seconds]:
+                del self._jobs[old_id], self._events[old_id]
+            self._jobs[job_id] = {"id": job_id, "status": "queued", "createdAt": now, "updatedAt": now, "result": None, "error": None}
+            self._events[job_id] = []
+
+    def update(self, job_id: str, **fields):
+        with self._changed:
+            self._jobs[job_id].update(fields, updatedAt=time.time())
+            self._changed.notify_all()
+
+    def add_event(self, job_id: str, event: str, data):
+        with self._changed:
+            self._events[job_id].append((event, data))
+            self._changed.notify_all()
+
+    def get(self, job_id: str):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def events(self, job_id: str, after: int = 0, timeout: float = 0) -> list:
+        """Events after the first `after` ones, waiting up to timeout seconds for at least one to arrive."""
+        deadline = time.time() + timeout
+        with self._changed:
+            while True:
+                events = self._events.get(job_id, [])[after:]
+                remaining = deadline - time.time()
+                if events or remaining <= 0: return list(events)
+                self._changed.wait(remaining)
+
+class SQLiteJobStore:
+    """Jobs and event logs in a SQLite file, so any gunicorn worker on the host can answer status and stream
+    requests for a job that another worker is running. Readers poll for new events."""
+
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, db_path: str, ttl_seconds: float = 3600):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, result TEXT, error TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS job_events (job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, data TEXT, PRIMARY KEY (job_id, seq))")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def create(self, job_id: str):
+        now = time.time()
+        with self._connect() as conn:
+            expired = [row[0] for row in conn.execute("SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?", FINISHED_STATUSES + (now - self.ttl_seconds,))]
+            conn.executemany("DELETE FROM job_events WHERE job_id = ?", [(j,) for j in expired])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(j,) for j in expired])
+            conn.execute("INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, 'queued', ?, ?)", (job_id, now, now))
+
+    def update(self, job_id: str, **fields):
+        columns = {"status": fields.get("status"), "result": json.dumps(fields["result"]) if fields.get("result") is not None else None, "error": fields.get("error")}
+        assignments = ", ".join(f"{name} = ?" for name in columns if name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?", [columns[name] for name in columns if name in fields] + [time.time(), job_id])
+
+    def add_event(self, job_id: str, event: str, data):
+        with self._connect() as conn:
+            conn.execute("INSERT INTO job_events (job_id, seq, event, data) SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM job_events WHERE job_id = ?", (job_id, event, json.dumps(data), job_id))
+
+    def get(self, job_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, status, created_at, updated_at, result, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row: return None
+        return {"id": row[0], "status": row[1], "createdAt": row[2], "updatedAt": row[3], "result": json.loads(row[4]) if row[4] else None, "error": row[5]}
+
+    def events(self, job_id: str, after: int = 0, timeout: float = 0) -> list:
+        deadline = time.time() + timeout
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute("SELECT event, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, after)).fetchall()
+            if rows or time.time() >= deadline: return [(event, json.loads(data)) for event, data in rows]
+            time.sleep(min(self.POLL_INTERVAL, max(0, deadline - time.time())))
+
+class AnalysisJobQueue:
+    """Runs submitted analyses on a fixed-size thread pool, at most max_pending (queued + running) at a time.
+
+    Each job function is called as fn(progress, *args), where progress(event, data) appends to the job's event log;
+    its return value becomes the job result. A "status" event marks the start and a "done"/"failed" event the end.
+    """
+
+    def __init__(self, store, max_workers: int = 2, max_pending: int = 32):
+        self.store = store
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args):
+        """Queues fn and returns the new job ID, or None if max_pending jobs are already queued or running."""
+        if not self._pending.acquire(blocking=False): return None
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id)
+        self._pool.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def _run(self, job_id: str, fn, args):
+        try:
+            self.store.update(job_id, status="running")
+            self.store.add_event(job_id, "status", {"status": "running"})
+            result = fn(lambda event, data: self.store.add_event(job_id, event, data), *args)
+            if isinstance(result, dict) and "error" in result:
+                self.store.update(job_id, status="failed", error=result["error"], result=result)
+                self.store.add_event(job_id, "failed", result)
+            else:
+                self.store.update(job_id, status="done", result=result)
+                self.store.add_event(job_id, "done", result)
+        except Exception as e:
+            print(f"PYTHON_ERROR: Analysis job {job_id} failed: {e}")
+            self.store.update(job_id, status="failed", error=str(e))
+            self.store.add_event(job_id, "failed", {"error": str(e)})
+        finally:
+            self._pending.release()
+
+def analysis_jobs_from_env() -> AnalysisJobQueue:
+    """Job queue configured by ANALYSIS_JOB_WORKERS, ANALYSIS_JOB_MAX_PENDING, ANALYSIS_JOB_TTL and ANALYSIS_JOBS_DB.
+    Without ANALYSIS_JOBS_DB jobs live in this process, which only works with a single worker: another worker would
+    answer 404 for them. gunicorn.conf.py therefore sets it whenever it starts more than one worker."""
+    ttl_seconds = float(os.environ.get("ANALYSIS_JOB_TTL", 3600))
+    db_path = os.environ.get("ANALYSIS_JOBS_DB")
+    store = SQLiteJobStore(db_path, ttl_seconds) if db_path else MemoryJobStore(ttl_seconds)
+    return AnalysisJobQueue(store, max_workers=int(os.environ.get("ANALYSIS_JOB_WORKERS", 2)), max_pending=int(os.environ.get("ANALYSIS_JOB_MAX_PENDING", 32)))
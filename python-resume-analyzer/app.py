@@ -1,17 +1,150 @@
 # File: python-resume-analyzer/app.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+import contextlib
+import json
 import os
-from resume_analyzer import extract_text_from_pdf, analyze_resume_text
+import time
+import resume_analyzer
+from resume_analyzer import extract_document_text, analyze_resume_text, analyze_resumes, analyzer_version, preload_nlp, compare_resume_to_jobs, DocumentTooLarge
+from resume_analyzer import extract_resume_skills, extract_job_skills, get_nlp, COMMON_SKILLS, TimeBudget
+from lite_analyzer import analyze_resume_text_lite, analyze_resumes_lite, lite_analyzer_version
+from job_index import job_index_from_env
+from analysis_jobs import analysis_jobs_from_env, FINISHED_STATUSES
+from admission import LANES, Overloaded, admission_controller_from_env
+from result_cache import digest_cache_key, result_cache_from_env
+from response_format import FastJSONProvider, requested_fields, select_fields
+from uploads import MAX_REQUEST_BYTES, SpoolingRequest, Upload, UploadRejected
+from werkzeug.exceptions import RequestEntityTooLarge
+import metrics
+import profiling
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app) # orjson when installed; large analyses serialize several times faster
+# Bodies over MAX_REQUEST_MB are refused with 413 before they are read; large file parts are spooled to disk
+app.request_class = SpoolingRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BYTES
 # Configure CORS to allow requests from any domain (you can restrict this later)
 CORS(app, resources={r"/*": {"origins": "*"}})
+# Repeat uploads of the same PDF are served from here instead of re-running extraction and analysis
+result_cache = result_cache_from_env()
+job_index = job_index_from_env(COMMON_SKILLS)
+analysis_jobs = analysis_jobs_from_env() # Background runner for POST /analyze?async=1
+# Processes /analyze/batch spreads full analyses over: server config only, since each gunicorn worker keeps a pool
+# of this many model-loaded processes (so keep GUNICORN_WORKERS * ANALYZE_BATCH_N_PROCESS near the core count)
+ANALYZE_BATCH_N_PROCESS = int(os.environ.get('ANALYZE_BATCH_N_PROCESS', 1))
+# At most ANALYSIS_CONCURRENCY full analyses run at once in this worker; the rest queue by lane (interactive first)
+admission = admission_controller_from_env()
+
+# The spaCy model loads lazily on the first analysis. Set SPACY_PRELOAD=1 to load it at import instead,
+# e.g. with `gunicorn --preload` so forked workers share the loaded model.
+if os.environ.get('SPACY_PRELOAD') == '1':
+    preload_nlp()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    # Labelled by route pattern (e.g. /jobs/<job_id>), not the raw path, to keep the series count bounded.
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.observe_request(endpoint, request.method, response.status_code, time.perf_counter() - g.get('request_started', time.perf_counter()))
+    return response
+
+@app.teardown_request
+def remove_spooled_uploads(exc):
+    # Spooled upload files that no Upload took over (e.g. the request failed before reading them)
+    request.remove_spooled_files()
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({"error": f"Request body is larger than the {MAX_REQUEST_BYTES / (1024 * 1024):g} MB limit."}), 413
+
+@app.errorhandler(UploadRejected)
+def upload_rejected(e):
+    return jsonify({"error": str(e)}), e.status
+
+@app.errorhandler(Overloaded)
+def overloaded(e):
+    return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+
+ANALYSIS_MODES = ("full", "lite")
+
+def requested_mode(args):
+    """?mode=full (default, the spaCy analysis) or ?mode=lite (regexes and the skill index only); None if invalid."""
+    mode = args.get('mode') or "full"
+    return mode if mode in ANALYSIS_MODES else None
+
+def requested_budget(req):
+    """Seconds the analysis may take, from the X-Time-Budget-Ms header or ?budget_ms= (default ANALYSIS_TIME_BUDGET_MS;
+    0 means no limit). Raises ValueError if the value is not a non-negative number."""
+    budget_ms = float(req.headers.get('X-Time-Budget-Ms') or req.args.get('budget_ms') or os.environ.get('ANALYSIS_TIME_BUDGET_MS', 0))
+    if not budget_ms >= 0: raise ValueError(budget_ms)
+    return budget_ms / 1000 or None
+
+def requested_lane(req):
+    """Admission lane from the X-Priority header or ?priority=: "interactive" (default) or "batch"; None if invalid."""
+    lane = req.headers.get('X-Priority') or req.args.get('priority') or "interactive"
+    return lane if lane in LANES else None
+
+def analyze_upload(upload: Upload, on_section=None, include_text: bool = False, mode: str = "full", budget_seconds: float = None, lane: str = "interactive", block: bool = False):
+    """Extracts and analyzes one uploaded PDF or DOCX (through the result cache); returns (result, HTTP status).
+    include_text adds the extracted text as "extractedText" (what role_offsets index into); it is never cached.
+    mode="lite" runs analyze_resume_text_lite() instead, which never loads the spaCy model.
+    budget_seconds (counted from here, so including extraction) caps the full analysis: stages that would start
+    after it has run out are skipped and the result has "partial": true; partial results are not cached.
+    A full analysis that misses the cache runs in an admission slot of lane; unless block, Overloaded is raised when
+    none comes free in time. Time spent waiting for the slot counts against the budget."""
+    budget = TimeBudget(budget_seconds) if budget_seconds and mode != "lite" else None
+    lite = mode == "lite"
+    document_name = "DOCX file" if upload.kind == "docx" else "PDF"
+    try:
+        version = lite_analyzer_version() if lite else analyzer_version()
+        key = digest_cache_key(upload.sha256, version)
+        cached_result = result_cache.get(key) if result_cache else None
+        if cached_result is not None:
+            if on_section:
+                for name, section_analysis in cached_result.get("sections", {}).items(): on_section(name, section_analysis)
+            if include_text: cached_result = dict(cached_result, extractedText=extract_document_text(upload.source, upload.kind))
+            return cached_result, 200
+
+        with contextlib.nullcontext() if lite else admission.slot(lane, block=block):
+            extracted_text = extract_document_text(upload.source, upload.kind)
+            if not extracted_text.strip():
+                 return {"error": f"Could not extract text from the {document_name}. It may be image-based, corrupted or password-protected."}, 400
+
+            if lite:
+                analysis_result = analyze_resume_text_lite(extracted_text, on_section=on_section)
+            else:
+                analysis_result = analyze_resume_text(extracted_text, on_section=on_section, budget=budget)
+        if result_cache and "error" not in analysis_result and not analysis_result.get("partial"):
+            result_cache.set(key, analysis_result)
+        if include_text and "error" not in analysis_result: analysis_result = dict(analysis_result, extractedText=extracted_text)
+        return analysis_result, 200
+            
+    except DocumentTooLarge as e:
+        return {"error": str(e)}, 413
+    except Overloaded:
+        raise # 503 with Retry-After, from overloaded()
+    except Exception as e:
+        app.logger.error(f"PYTHON_FLASK_ERROR: Error processing resume '{upload.filename}': {e}", exc_info=True)
+        metrics.count_error("analyze", type(e).__name__)
+        if "PdfReadError" in str(type(e).__name__) or "EOF marker not found" in str(e) :
+             return {"error": "Failed to read PDF (Flask backend). It might be corrupted, password-protected, or not a valid PDF."}, 400
+        return {"error": f"An unexpected error occurred during analysis in Flask: {str(e)}"}, 500
+
+def run_analysis_job(progress, upload: Upload, mode: str = "full", budget_seconds: float = None, lane: str = "interactive") -> dict:
+    # Runs on the analysis job pool; every finished section is pushed to the job's event stream as it completes.
+    # The job owns the upload (and its spooled file) from submission on; its time budget starts when it starts running.
+    # The job queue already bounds how many jobs there are, so a job waits for its admission slot instead of failing.
+    with upload:
+        result, _ = analyze_upload(upload, on_section=lambda name, section_analysis: progress("section", {"name": name, "analysis": section_analysis}), mode=mode, budget_seconds=budget_seconds, lane=lane, block=True)
+    return result
 
 @app.route('/analyze', methods=['POST'])
 def analyze_resume_route():
-    # Log all received headers
-    app.logger.info("PYTHON_FLASK_LOG: Headers received: %s", dict(request.headers))
+    app.logger.debug("PYTHON_FLASK_LOG: Headers received: %s", dict(request.headers))
     
     if 'file' not in request.files:
         app.logger.warning("PYTHON_FLASK_WARNING: No file part in request")
@@ -22,25 +155,218 @@ def analyze_resume_route():
     if file.filename == '':
         app.logger.warning("PYTHON_FLASK_WARNING: No selected file")
         return jsonify({"error": "No selected file"}), 400
-    
+
+    # ?mode=lite skips spaCy: a few milliseconds per resume, with approximate action verb and entity counts
+    mode = requested_mode(request.args)
+    if mode is None: return jsonify({"error": f"'mode' must be one of: {', '.join(ANALYSIS_MODES)}."}), 400
+    # X-Time-Budget-Ms / ?budget_ms= caps the analysis; when it runs out, the sections finished so far come back with "partial": true
     try:
-        extracted_text = extract_text_from_pdf(file.stream)
-        if not extracted_text.strip():
-             return jsonify({"error": "Could not extract text from the PDF. It may be image-based."}), 400
+        budget_seconds = requested_budget(request)
+    except ValueError:
+        return jsonify({"error": "The time budget (X-Time-Budget-Ms or 'budget_ms') must be a non-negative number of milliseconds."}), 400
+    # X-Priority: batch (or ?priority=batch) queues scripted traffic behind every interactive upload
+    lane = requested_lane(request)
+    if lane is None: return jsonify({"error": f"'priority' must be one of: {', '.join(LANES)}."}), 400
 
-        analysis_result = analyze_resume_text(extracted_text)
-        return jsonify(analysis_result), 200
-            
-    except Exception as e:
-        app.logger.error(f"PYTHON_FLASK_ERROR: Error processing resume '{file.filename}': {e}", exc_info=True)
-        if "PdfReadError" in str(type(e).__name__) or "EOF marker not found" in str(e) :
-             return jsonify({"error": "Failed to read PDF (Flask backend). It might be corrupted, password-protected, or not a valid PDF."}), 400
-        return jsonify({"error": f"An unexpected error occurred during analysis in Flask: {str(e)}"}), 500
+    # Size and type are checked here, before any parsing; large uploads stay on disk and are memory-mapped later.
+    upload = Upload.from_file_storage(file)
+    if request.args.get('async') == '1':
+        # Returns straight away; poll GET /jobs/<id> or stream GET /jobs/<id>/events for the result.
+        job_id = analysis_jobs.submit(run_analysis_job, upload, mode, budget_seconds, lane)
+        if job_id is None:
+            upload.close()
+            return jsonify({"error": "Too many analyses in progress. Please retry shortly."}), 503, {"Retry-After": "5"}
+        return jsonify({"jobId": job_id, "status": "queued", "statusUrl": f"/jobs/{job_id}", "eventsUrl": f"/jobs/{job_id}/events"}), 202, {"Location": f"/jobs/{job_id}"}
+
+    # ?compact=1 or ?fields=score,keywords.missing,... trims the response; "extractedText" can be asked for as a field.
+    fields = requested_fields(request.args)
+    # X-Profile: 1 from an admin, or a request slower than PROFILE_SLOW_MS, stores a profile (see GET /admin/profiles)
+    with upload, profiling.request_profile(request.headers, "/analyze") as profile:
+        analysis_result, status = analyze_upload(upload, include_text=bool(fields and "extractedText" in fields), mode=mode, budget_seconds=budget_seconds, lane=lane)
+        profile.document = profiling.document_summary(upload.kind, upload.size, analysis_result)
+    return jsonify(select_fields(analysis_result, fields)), status, {"X-Profile-Id": profile.capture_id} if profile.capture_id else {}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def analysis_job_route(job_id):
+    job = analysis_jobs.store.get(job_id)
+    if job is None: return jsonify({"error": "Unknown or expired job ID"}), 404
+    fields = requested_fields(request.args)
+    if fields is not None and job["result"] is not None: job["result"] = select_fields(job["result"], fields)
+    return jsonify(job), 200
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def analysis_job_events_route(job_id):
+    # Server-Sent Events: "status" when the job starts, one "section" per finished section analysis, then "done"
+    # (the full result) or "failed". Event IDs let a reconnecting client resume with Last-Event-ID.
+    if analysis_jobs.store.get(job_id) is None: return jsonify({"error": "Unknown or expired job ID"}), 404
+    after = request.headers.get('Last-Event-ID', type=int) or request.args.get('after', type=int) or 0
+
+    def stream(seq):
+        while True:
+            events = analysis_jobs.store.events(job_id, seq, timeout=15)
+            if not events:
+                job = analysis_jobs.store.get(job_id)
+                if job is None or job["status"] in FINISHED_STATUSES: return
+                yield ": keep-alive\n\n"
+                continue
+            for event, data in events:
+                seq += 1
+                yield f"id: {seq}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                if event in FINISHED_STATUSES: return
+
+    return Response(stream_with_context(stream(after)), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def analyze_in_batch_slots(texts: list, batch_size: int, n_process: int) -> list:
+    """analyze_resumes() over texts in the batch admission lane. The texts are analyzed ADMISSION_BATCH_CHUNK (default
+    4) at a time, each chunk in its own slot, so an interactive request waits for at most one chunk. Only the first
+    chunk can be refused (Overloaded); once a batch is admitted, its later chunks wait for their slot. With
+    n_process > 1 a chunk is one round of the process pool (n_process batches of batch_size), and the slot is held
+    while the pool works on it, so pool work never runs outside this worker's limit or ahead of interactive requests."""
+    results, chunk_size = [], max(1, int(os.environ.get('ADMISSION_BATCH_CHUNK', 4)) if n_process <= 1 else n_process * max(1, batch_size))
+    for start in range(0, len(texts), chunk_size):
+        with admission.slot("batch", block=start > 0): results += analyze_resumes(texts[start:start + chunk_size], batch_size=batch_size, n_process=n_process)
+    return results
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_resume_batch_route():
+    # Accepts either a JSON body {"texts": [...]} or a multipart upload with several "files" parts.
+    # Results come back in input order; a bad item gets its own {"error": ...} entry instead of failing the batch.
+    # ?mode=lite analyzes each text without spaCy, e.g. for live feedback while a resume is edited.
+    # Full analyses always run in the batch admission lane, behind interactive /analyze requests.
+    mode = requested_mode(request.args)
+    if mode is None: return jsonify({"error": f"'mode' must be one of: {', '.join(ANALYSIS_MODES)}."}), 400
+    batch_size = request.args.get('batch_size', os.environ.get('ANALYZE_BATCH_SIZE', 16), type=int)
+    analyze_texts = analyze_resumes_lite if mode == "lite" else lambda texts: analyze_in_batch_slots(texts, batch_size, ANALYZE_BATCH_N_PROCESS)
+
+    if request.is_json:
+        texts = (request.get_json(silent=True) or {}).get('texts')
+        if not isinstance(texts, list) or not texts:
+            return jsonify({"error": "Request body must be a JSON object with a non-empty 'texts' list"}), 400
+        results = analyze_texts(texts)
+        fields = requested_fields(request.args)
+        return jsonify({"results": [select_fields(result, fields) for result in results]}), 200
+
+    files = request.files.getlist('files')
+    if not files:
+        app.logger.warning("PYTHON_FLASK_WARNING: No files in batch request")
+        return jsonify({"error": "No 'files' parts or JSON 'texts' in request"}), 400
+
+    texts, extraction_errors = [], {}
+    for i, file in enumerate(files):
+        extracted_text = ""
+        try:
+            with Upload.from_file_storage(file) as upload: extracted_text = extract_document_text(upload.source, upload.kind)
+            if not extracted_text.strip():
+                extraction_errors[i] = {"error": "Could not extract text from the file. It may be image-based, corrupted or password-protected."}
+        except (UploadRejected, DocumentTooLarge) as e:
+            extraction_errors[i] = {"error": str(e)}
+        texts.append(extracted_text)
+
+    to_analyze = [i for i in range(len(files)) if i not in extraction_errors]
+    analyzed = iter(analyze_texts([texts[i] for i in to_analyze]))
+    fields = requested_fields(request.args)
+    results = [dict(extraction_errors[i] if i in extraction_errors else select_fields(next(analyzed), fields), filename=file.filename) for i, file in enumerate(files)]
+    return jsonify({"results": results}), 200
+
+@app.route('/compare', methods=['POST'])
+def compare_route():
+    # {"resumeText": ..., "jobDescription": "..."} returns {"matching", "missing", "extra", "score", "resumeSkills"};
+    # {"resumeText": ..., "jobDescriptions": [...]} returns {"resumeSkills", "results": [...]} with one entry per job, in order.
+    data = request.get_json(silent=True) or {}
+    resume_text = data.get('resumeText')
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        return jsonify({"error": "Resume text is required."}), 400
+    single = 'jobDescriptions' not in data
+    job_descriptions = [data.get('jobDescription')] if single else data.get('jobDescriptions')
+    if not isinstance(job_descriptions, list) or not job_descriptions or (single and not isinstance(job_descriptions[0], str)):
+        return jsonify({"error": "A job description ('jobDescription') or a non-empty list ('jobDescriptions') is required."}), 400
+    max_jobs = int(os.environ.get('COMPARE_MAX_JOB_DESCRIPTIONS', 500))
+    if len(job_descriptions) > max_jobs:
+        return jsonify({"error": f"At most {max_jobs} job descriptions can be compared per request."}), 400
+
+    comparison = compare_resume_to_jobs(resume_text, job_descriptions)
+    if "error" in comparison: return jsonify(comparison), 500
+    if single:
+        result = comparison["results"][0]
+        return jsonify(dict(result, resumeSkills=comparison["resumeSkills"])), 400 if "error" in result else 200
+    return jsonify(comparison), 200
+
+@app.route('/recommend/jobs', methods=['POST'])
+def recommend_jobs_update_route():
+    # {"jobs": [{"id": ..., "text": ...} or {"id": ..., "skills": [...]}], "remove": [ids]} adds/replaces and removes
+    # postings in the recommendation index. Text is scanned for skills here, once per posting.
+    data = request.get_json(silent=True) or {}
+    jobs, removed = data.get('jobs') or [], data.get('remove') or []
+    if not isinstance(jobs, list) or not isinstance(removed, list) or not (jobs or removed):
+        return jsonify({"error": "Request body must contain a 'jobs' list and/or a 'remove' list."}), 400
+    if any('text' in job for job in jobs if isinstance(job, dict)) and not get_nlp():
+        return jsonify({"error": "NLP model (spaCy) could not be loaded. Send 'skills' instead of 'text'."}), 500
+    added = {}
+    for job in jobs:
+        if not isinstance(job, dict) or job.get('id') in (None, ''):
+            return jsonify({"error": "Every job needs an 'id' and either 'text' or 'skills'."}), 400
+        if isinstance(job.get('skills'), list): added[str(job['id'])] = job['skills']
+        elif isinstance(job.get('text'), str): added[str(job['id'])] = extract_job_skills(job['text'])
+        else: return jsonify({"error": f"Job '{job['id']}' needs either 'text' or 'skills'."}), 400
+    return jsonify(job_index.update(added=added, removed=[str(job_id) for job_id in removed])), 200
+
+@app.route('/recommend/jobs/<job_id>', methods=['DELETE'])
+def recommend_jobs_remove_route(job_id):
+    counts = job_index.update(removed=[job_id])
+    return jsonify(counts), 200 if counts["removed"] else 404
+
+@app.route('/recommend', methods=['POST'])
+def recommend_route():
+    # {"resumeText": ...} or {"skills": [...]} (e.g. keywords.present from /analyze), plus optional "k" (default 10).
+    data = request.get_json(silent=True) or {}
+    k = data.get('k', 10)
+    if not isinstance(k, int) or not 0 < k <= 1000:
+        return jsonify({"error": "'k' must be an integer between 1 and 1000."}), 400
+    if isinstance(data.get('skills'), list):
+        skills = [s for s in data['skills'] if isinstance(s, str)]
+    elif isinstance(data.get('resumeText'), str) and data['resumeText'].strip():
+        if not get_nlp(): return jsonify({"error": "NLP model (spaCy) could not be loaded. Send 'skills' instead."}), 500
+        skills = extract_resume_skills(data['resumeText'])
+    else:
+        return jsonify({"error": "Resume text ('resumeText') or a skills list ('skills') is required."}), 400
+    index = job_index.current()
+    return jsonify({"results": index.top_k(skills, k), "resumeSkills": sorted(skills), "indexedJobs": len(index)}), 200
+
+def admin_denied():
+    # The /admin routes exist only when PROFILE_ADMIN_TOKEN is set, and need it in X-Admin-Token
+    if not profiling.PROFILE_ADMIN_TOKEN: return jsonify({"error": "Not found"}), 404
+    if not profiling.is_admin(request.headers): return jsonify({"error": "Missing or invalid X-Admin-Token."}), 403
+    return None
+
+@app.route('/admin/profiles', methods=['GET'])
+def profiles_route():
+    # Stored profiles, newest first: trigger ("admin" or "slow"), duration, format and the redacted document summary
+    denied = admin_denied()
+    if denied: return denied
+    return jsonify({"captures": profiling.list_captures(), "slowThresholdMs": profiling.PROFILE_SLOW_MS or None, "maxCaptures": profiling.PROFILE_MAX_CAPTURES}), 200
+
+@app.route('/admin/profiles/<capture_id>', methods=['GET'])
+def profile_download_route(capture_id):
+    # The profile itself: .pstats (python -m pstats, snakeviz) or .speedscope.json (https://www.speedscope.app)
+    denied = admin_denied()
+    if denied: return denied
+    found = profiling.capture_file(capture_id)
+    if found is None: return jsonify({"error": "Unknown or expired profile ID"}), 404
+    path, kind = found
+    return send_file(path, mimetype="application/json" if kind == "speedscope" else "application/octet-stream", as_attachment=True, download_name=os.path.basename(path))
+
+@app.route('/metrics', methods=['GET'])
+def metrics_route():
+    # Prometheus text format: per-stage and per-request latency histograms, request/error counters and process RSS.
+    return Response(metrics.render_metrics(), mimetype="text/plain; version=0.0.4")
 
 # Add a health check endpoint
 @app.route('/health', methods=['GET'])
 def health_check():
-    return jsonify({"status": "healthy"}), 200
+    health = {"status": "healthy", "nlp_loaded": resume_analyzer.nlp is not None}
+    if result_cache: health["result_cache"] = result_cache.stats()
+    if admission.stats(): health["admission"] = admission.stats()
+    return jsonify(health), 200
 
 if __name__ == '__main__':
     # Use environment variable for port if available (for PythonAnywhere)
@@ -0,0 +1,70 @@
+# File: python-resume-analyzer/bench_admission.py
+# Description: Interactive /analyze latency under mixed load - a steady trickle of PDF uploads while several clients
+# keep /analyze/batch busy - with admission control off and on. Runs the app in-process with Flask's test client;
+# batch clients back off for Retry-After (scaled down) when refused.
+# Usage: python bench_admission.py [--batch-clients 4] [--interactive 40] [--interval-ms 150]
+
+import argparse
+import io
+import os
+import threading
+import time
+
+os.environ.setdefault("RESULT_CACHE_ENABLED", "0") # Every request must really be analyzed
+import app as app_module
+from admission import AdmissionController, _NoAdmission
+from synthetic_resumes import synthetic_resume, text_to_pdf
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(round(len(values) * q)) - 1)]
+
+def run(controller, args, pdfs: list, texts: list) -> dict:
+    app_module.admission = controller
+    stop, batch_stats, lock = threading.Event(), {"ok": 0, "refused": 0, "texts": 0}, threading.Lock()
+
+    def batch_client():
+        client = app_module.app.test_client()
+        while not stop.is_set():
+            response = client.post("/analyze/batch", json={"texts": texts})
+            with lock:
+                if response.status_code == 503: batch_stats["refused"] += 1
+                else: batch_stats["ok"] += 1; batch_stats["texts"] += len(texts)
+            if response.status_code == 503: stop.wait(int(response.headers["Retry-After"]) / 10)
+
+    clients = [threading.Thread(target=batch_client, daemon=True) for _ in range(args.batch_clients)]
+    for client in clients: client.start()
+    time.sleep(0.5) # Let the batch load build up
+    client, latencies, statuses, start = app_module.app.test_client(), [], {}, time.perf_counter()
+    for i in range(args.interactive):
+        sent = time.perf_counter()
+        response = client.post("/analyze", data={"file": (io.BytesIO(pdfs[i % len(pdfs)]), f"resume{i}.pdf")}, content_type="multipart/form-data")
+        latencies.append(time.perf_counter() - sent)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        time.sleep(max(0.0, args.interval_ms / 1000 - (time.perf_counter() - sent)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in clients: thread.join()
+    return {"p50": percentile(latencies, 0.5), "p99": percentile(latencies, 0.99), "max": max(latencies), "statuses": statuses,
+            "batch_texts_per_s": batch_stats["texts"] / elapsed, "batch_refused": batch_stats["refused"]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-clients", type=int, default=4)
+    parser.add_argument("--batch-texts", type=int, default=16, help="texts per /analyze/batch request")
+    parser.add_argument("--interactive", type=int, default=40, help="interactive uploads to time")
+    parser.add_argument("--interval-ms", type=float, default=150, help="time between interactive uploads")
+    args = parser.parse_args()
+
+    pdfs = [text_to_pdf(synthetic_resume(seed)) for seed in range(20)]
+    texts = [synthetic_resume(100 + seed, roles=6, bullets=8) for seed in range(args.batch_texts)]
+    app_module.analyze_resumes(texts[:2]) # Load the model
+    quiet, stdout = open(os.devnull, "w"), os.sys.stdout
+    for name, controller in (("admission off", _NoAdmission()), ("admission on", AdmissionController(concurrency=1))):
+        os.sys.stdout = quiet # The analyzer logs every resume
+        try:
+            result = run(controller, args, pdfs, texts)
+        finally:
+            os.sys.stdout = stdout
+        print(f"{name:14} interactive p50 {result['p50'] * 1000:6.0f} ms  p99 {result['p99'] * 1000:6.0f} ms  max {result['max'] * 1000:6.0f} ms  "
+              f"statuses {result['statuses']}  batch {result['batch_texts_per_s']:.1f} texts/s ({result['batch_refused']} refused)")
@@ -0,0 +1,117 @@
+# File: python-resume-analyzer/bench_analyzer.py
+# Description: Per-stage benchmark of the analysis pipeline on a synthetic corpus; writes JSON for comparing commits.
+# Usage: python bench_analyzer.py [--sizes small,medium,large] [--count 10] [--repeat 3] [--out bench.json] [--compare old.json]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import resume_analyzer
+from resume_analyzer import (
+    get_nlp, extract_text_from_pdf, identify_section_spans, section_doc, extract_keywords_from_text_spacy, segment_experience,
+    analyze_education_section_spacy, analyze_projects_section_spacy, analyze_resume_text, analyzer_version, COMMON_SKILLS,
+)
+from synthetic_resumes import SIZE_PRESETS, synthetic_corpus
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def stage_inputs(text: str) -> dict:
+    nlp = get_nlp()
+    doc = nlp(text)
+    spans = identify_section_spans(text)
+    doc_for = lambda name: section_doc(doc, *spans[name]) if name in spans else None
+    return {"text": text, "doc": doc, "spans": spans, "experience": doc_for("experience"), "education": doc_for("education"), "projects": doc_for("projects")}
+
+# Each stage takes (text, pdf_bytes, inputs) and runs exactly one call of the function being measured.
+STAGES = {
+    "extract_text_from_pdf": lambda text, pdf, inputs: extract_text_from_pdf(io.BytesIO(pdf)),
+    "identify_sections": lambda text, pdf, inputs: identify_section_spans(text),
+    "spacy_parse": lambda text, pdf, inputs: get_nlp()(text),
+    "extract_keywords_from_text_spacy": lambda text, pdf, inputs: extract_keywords_from_text_spacy(inputs["doc"], COMMON_SKILLS),
+    "segment_experience": lambda text, pdf, inputs: inputs["experience"] is not None and segment_experience(inputs["experience"].text),
+    "analyze_education_section_spacy": lambda text, pdf, inputs: inputs["education"] is not None and analyze_education_section_spacy(inputs["education"]),
+    "analyze_projects_section_spacy": lambda text, pdf, inputs: inputs["projects"] is not None and analyze_projects_section_spacy(inputs["projects"], COMMON_SKILLS),
+    "analyze_resume_text": lambda text, pdf, inputs: analyze_resume_text(text),
+}
+
+def summarize(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "calls": len(latencies), "throughput_per_s": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3), "p95_ms": round(latencies[max(0, int(round(len(latencies) * 0.95)) - 1)] * 1000, 3),
+        "mean_ms": round(total / len(latencies) * 1000, 3),
+    }
+
+def bench_size(size: str, count: int, repeat: int, stages: list) -> dict:
+    corpus = synthetic_corpus(size, count)
+    prepared = [(text, pdf, stage_inputs(text)) for text, pdf in corpus]
+    result = {"preset": SIZE_PRESETS[size], "documents": count, "avg_chars": round(sum(len(t) for t, _ in corpus) / count), "avg_pdf_bytes": round(sum(len(p) for _, p in corpus) / count), "stages": {}}
+    for stage in stages:
+        fn = STAGES[stage]
+        fn(*prepared[0]) # Warm-up (matcher compilation, PDF worker pool start-up, ...)
+        latencies = []
+        for _ in range(repeat):
+            for text, pdf, inputs in prepared:
+                start = time.perf_counter()
+                fn(text, pdf, inputs)
+                latencies.append(time.perf_counter() - start)
+        result["stages"][stage] = summarize(latencies)
+    return result
+
+def git_commit() -> str:
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): return None
+
+def print_comparison(current: dict, baseline: dict):
+    print(f"\nComparison against {baseline.get('commit') or 'baseline'} (p50, negative is faster):")
+    for size, size_result in current["sizes"].items():
+        old_stages = baseline.get("sizes", {}).get(size, {}).get("stages", {})
+        for stage, stats in size_result["stages"].items():
+            old = old_stages.get(stage)
+            if not old or not old["p50_ms"]: continue
+            change = (stats["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100
+            print(f"  {size:9} {stage:34} {old['p50_ms']:10.3f} -> {stats['p50_ms']:10.3f} ms  ({change:+.1f}%)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline stage by stage.")
+    parser.add_argument("--sizes", default="small,medium,large", help=f"Comma-separated presets from {', '.join(SIZE_PRESETS)}")
+    parser.add_argument("--count", type=int, default=10, help="Synthetic resumes per size")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per stage")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to time")
+    parser.add_argument("--out", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Earlier JSON results to compare p50 latencies against")
+    parser.add_argument("--verbose", action="store_true", help="Keep the analyzer's PYTHON_LOG output")
+    args = parser.parse_args()
+
+    if not get_nlp(): sys.exit("spaCy model not loaded; nothing to benchmark.")
+    stages = [s for s in args.stages.split(",") if s]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown: sys.exit(f"Unknown stage(s): {', '.join(unknown)}")
+
+    results = {"commit": git_commit(), "analyzer_version": analyzer_version(), "python": platform.python_version(), "sizes": {}}
+    for size in args.sizes.split(","):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            results["sizes"][size] = bench_size(size, args.count, args.repeat, stages)
+        print(f"\n{size} ({results['sizes'][size]['avg_chars']} chars, {SIZE_PRESETS[size]['pages']} page(s) per resume)")
+        print(f"  {'stage':34} {'per sec':>9} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+        for stage, stats in results["sizes"][size]["stages"].items():
+            print(f"  {stage:34} {stats['throughput_per_s']:9.1f} {stats['p50_ms']:10.3f} {stats['p95_ms']:10.3f}")
+    results["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    print(f"\nPeak RSS: {results['peak_rss_mb']} MB")
+
+    if args.out:
+        with open(args.out, "w") as f: json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f: print_comparison(results, json.load(f))
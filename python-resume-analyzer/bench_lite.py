@@ -0,0 +1,101 @@
+# File: python-resume-analyzer/bench_lite.py
+# Description: Side-by-side latency of ?mode=lite and the full spaCy analysis, and how far lite scores diverge from
+# full scores on a corpus (synthetic resumes, optionally with some sections left out, or a directory of real ones).
+# Usage: python bench_lite.py [--sizes small,medium,large] [--count 20] [--drop-sections] [--dir resumes/] [--repeat 3]
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import time
+
+from lite_analyzer import analyze_resume_text_lite
+from resume_analyzer import analyze_resume_text, extract_document_text, get_nlp
+from synthetic_resumes import ALL_SECTIONS, SIZE_PRESETS, synthetic_resume
+
+SCORES = ("score", "contentQuality", "atsCompatibility", "keywordOptimization")
+
+def corpus_for(size: str, count: int, drop_sections: bool) -> list:
+    preset = {k: v for k, v in SIZE_PRESETS[size].items() if k != "pages"}
+    rng = random.Random(0)
+    texts = []
+    for i in range(count):
+        sections = [name for name in ALL_SECTIONS if not drop_sections or rng.random() < 0.75] or ["experience"]
+        texts.append(synthetic_resume(i, sections=sections, **preset))
+    return texts
+
+def directory_corpus(path: str) -> list:
+    texts = []
+    for name in sorted(os.listdir(path)):
+        full_path = os.path.join(path, name)
+        extension = os.path.splitext(name)[1].lower()
+        if extension == ".txt":
+            with open(full_path, encoding="utf-8", errors="replace") as f: texts.append(f.read())
+        elif extension in (".pdf", ".docx"):
+            texts.append(extract_document_text(full_path, extension[1:]))
+    return [text for text in texts if text.strip()]
+
+def timed_runs(analyze, texts: list, repeat: int) -> tuple:
+    """(results of the first pass, per-document latencies in ms over all passes)."""
+    results, latencies = [], []
+    for run in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            result = analyze(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if run == 0: results.append(result)
+    return results, latencies
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(round(len(values) * q)) - 1)]
+
+def divergence(full_results: list, lite_results: list) -> dict:
+    """Mean and max absolute difference per score, share of resumes within 5 points on "score", and the mean
+    Jaccard similarity of the keywords each mode found."""
+    pairs = [(full, lite) for full, lite in zip(full_results, lite_results) if "error" not in full and "error" not in lite]
+    if not pairs: return {}
+    report = {}
+    for name in SCORES:
+        diffs = [abs(full[name] - lite[name]) for full, lite in pairs]
+        report[name] = (statistics.mean(diffs), max(diffs))
+    report["within_5"] = sum(abs(full["score"] - lite["score"]) <= 5 for full, lite in pairs) / len(pairs)
+    jaccard = []
+    for full, lite in pairs:
+        full_keywords, lite_keywords = set(full["keywords"]["present"]), set(lite["keywords"]["present"])
+        union = full_keywords | lite_keywords
+        jaccard.append(len(full_keywords & lite_keywords) / len(union) if union else 1.0)
+    report["keywords_jaccard"] = statistics.mean(jaccard)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="small,medium,large")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--drop-sections", action="store_true", help="leave each section out of a synthetic resume with probability 0.25")
+    parser.add_argument("--dir", help="also run on the .pdf/.docx/.txt resumes in this directory")
+    args = parser.parse_args()
+
+    full_available = get_nlp() is not None
+    if not full_available: print("spaCy model not installed; only lite mode is measured.")
+    corpora = [(size, corpus_for(size, args.count, args.drop_sections)) for size in args.sizes.split(",")]
+    if args.dir: corpora.append((os.path.basename(os.path.normpath(args.dir)), directory_corpus(args.dir)))
+
+    print(f"{'corpus':10} {'docs':>5} {'lite p50':>9} {'lite p95':>9} {'full p50':>9} {'full p95':>9} {'speedup':>8}   "
+          + " ".join(f"{'|d ' + name + '|':>22}" for name in SCORES) + f" {'<=5 pts':>8} {'kw jacc':>8}")
+    for name, texts in corpora:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            analyze_resume_text_lite(texts[0]) # Builds the skill index outside the timed runs
+            lite_results, lite_ms = timed_runs(analyze_resume_text_lite, texts, args.repeat)
+            if full_available:
+                analyze_resume_text(texts[0])
+                full_results, full_ms = timed_runs(analyze_resume_text, texts, args.repeat)
+        row = f"{name:10} {len(texts):5} {percentile(lite_ms, 0.5):9.2f} {percentile(lite_ms, 0.95):9.2f}"
+        if full_available:
+            report = divergence(full_results, lite_results)
+            row += f" {percentile(full_ms, 0.5):9.2f} {percentile(full_ms, 0.95):9.2f} {statistics.median(full_ms) / statistics.median(lite_ms):7.1f}x   "
+            row += " ".join(f"{'%.1f mean / %d max' % report[score]:>22}" for score in SCORES) if report else ""
+            row += f" {report['within_5']:8.0%} {report['keywords_jaccard']:8.2f}" if report else ""
+        print(row)
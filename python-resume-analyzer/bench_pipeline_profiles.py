@@ -0,0 +1,52 @@
+# File: python-resume-analyzer/bench_pipeline_profiles.py
+# Description: Reports model load time and per-document analysis latency for each spaCy pipeline profile.
+# Usage: python bench_pipeline_profiles.py [resume.txt ...] [--repeat 20]
+# Each profile runs in a fresh interpreter so load times are cold-start numbers.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from resume_analyzer import PIPELINE_PROFILES
+
+CHILD_SCRIPT = r"""
+import json, statistics, sys, time
+start = time.perf_counter()
+import resume_analyzer
+resume_analyzer.preload_nlp()
+load_seconds = time.perf_counter() - start
+if resume_analyzer.nlp is None:
+    print(json.dumps({"error": "model not loaded"})); sys.exit(0)
+texts = json.loads(sys.stdin.read())
+resume_analyzer.analyze_resume_text(texts[0]) # Warm-up
+latencies = []
+for _ in range(int(sys.argv[1])):
+    for text in texts:
+        t = time.perf_counter(); resume_analyzer.analyze_resume_text(text); latencies.append(time.perf_counter() - t)
+print(json.dumps({"pipeline": resume_analyzer.nlp.pipe_names, "load_seconds": load_seconds, "samples": len(latencies),
+                  "p50_ms": statistics.median(latencies) * 1000, "p95_ms": (statistics.quantiles(latencies, n=20, method="inclusive")[-1] if len(latencies) > 1 else latencies[0]) * 1000}))
+"""
+
+def sample_texts(paths):
+    if paths: return [open(p).read() for p in paths]
+    from bench_skill_matcher import SAMPLE_TEXT
+    return ["Summary\n" + SAMPLE_TEXT + "\nExperience\nSenior Engineer\nAcme Corp\nJan 2019 - Present\n" + "\n".join(f"- {line}" for line in SAMPLE_TEXT.splitlines())]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model load time and analysis latency for each spaCy pipeline profile.")
+    parser.add_argument("paths", nargs="*", help="resume .txt files (default: a built-in sample)")
+    parser.add_argument("--repeat", type=int, default=20, help="passes over the texts per profile; p95 needs at least 20 samples to mean anything")
+    args = parser.parse_args()
+    texts = sample_texts(args.paths)
+    print(f"{'profile':8} {'load (s)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'samples':>8}  pipeline")
+    for profile in PIPELINE_PROFILES:
+        env = dict(os.environ, SPACY_PROFILE=profile)
+        proc = subprocess.run([sys.executable, "-c", CHILD_SCRIPT, str(max(1, args.repeat))], input=json.dumps(texts), capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+        line = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else json.dumps({"error": proc.stderr.strip()[-300:]})
+        result = json.loads(line)
+        if "error" in result:
+            print(f"{profile:8} failed: {result['error']}")
+            continue
+        print(f"{profile:8} {result['load_seconds']:9.2f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} {result['samples']:8}  {', '.join(result['pipeline'])}")
@@ -0,0 +1,57 @@
+# File: python-resume-analyzer/bench_rescoring.py
+# Description: Bulk re-scoring of stored feature records - score_matrix() over N records vs. score_features() one at a
+# time, after checking that score_matrix() reproduces the scores of real analyses of synthetic resumes.
+# Usage: python bench_rescoring.py [--records 1000000] [--check 20]
+
+import argparse
+import contextlib
+import os
+import time
+import numpy as np
+
+from resume_analyzer import analyze_resume_text, get_nlp
+from scoring import FEATURE_NAMES, FEATURE_VERSION, features_matrix, score_features, score_matrix
+from synthetic_resumes import ALL_SECTIONS, synthetic_resume
+
+SCORES = ("score", "contentQuality", "atsCompatibility", "keywordOptimization")
+
+def random_features(n: int, seed: int = 0) -> np.ndarray:
+    """n plausible feature rows: small counts, section flags set 80% of the time, section scores from 0 to 10."""
+    rng = np.random.default_rng(seed)
+    features = rng.integers(0, 11, size=(n, len(FEATURE_NAMES))).astype(np.float64)
+    for i, name in enumerate(FEATURE_NAMES):
+        if name.startswith("has_"): features[:, i] = rng.random(n) < 0.8
+        elif name == "word_count": features[:, i] = rng.integers(50, 1500, size=n)
+        elif name.startswith("keywords_"): features[:, i] = rng.integers(0, 40, size=n)
+    return features
+
+def check_against_analyses(count: int) -> int:
+    """Analyzes count synthetic resumes and returns how many score_matrix() scores differently from the analysis."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # Seed bits pick the sections left out, so the check covers missing-section scoring too
+        sections = [[name for bit, name in enumerate(ALL_SECTIONS) if not (seed >> bit) & 1] or ["experience"] for seed in range(count)]
+        results = [analyze_resume_text(synthetic_resume(seed, sections=sections[seed])) for seed in range(count)]
+    scores = score_matrix(features_matrix(results))
+    return sum(any(int(scores[name][i]) != result[name] for name in SCORES) for i, result in enumerate(results))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--check", type=int, default=20, help="real analyses to compare score_matrix() against (0 to skip)")
+    args = parser.parse_args()
+
+    if args.check and get_nlp():
+        mismatches = check_against_analyses(args.check)
+        print(f"score_matrix() vs. {args.check} analyses: {mismatches} mismatches")
+    features = random_features(args.records)
+    start = time.perf_counter()
+    scores = score_matrix(features)
+    matrix_seconds = time.perf_counter() - start
+    sample = min(args.records, 20_000)
+    records = [{"version": FEATURE_VERSION, **dict(zip(FEATURE_NAMES, row.tolist()))} for row in features[:sample]]
+    start = time.perf_counter()
+    for record in records: score_features(record)
+    per_record_seconds = (time.perf_counter() - start) / sample
+    print(f"score_matrix():   {args.records} records in {matrix_seconds:.3f}s ({args.records / matrix_seconds / 1e6:.1f}M records/s)")
+    print(f"score_features(): {per_record_seconds * 1e6:.1f}us per record, ~{per_record_seconds * args.records:.1f}s for {args.records}")
+    print(f"mean score {scores['score'].mean():.2f}")
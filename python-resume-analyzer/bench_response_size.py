@@ -0,0 +1,56 @@
+# File: python-resume-analyzer/bench_response_size.py
+# Description: Payload size and serialization time of /analyze responses - full vs. ?compact=1 / ?fields=, stdlib json vs. orjson.
+# Usage: python bench_response_size.py [--sizes large,long_pdf] [--count 5] [--min-seconds 1.0]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+from flask import Flask
+from resume_analyzer import analyze_resume_text, extract_text_from_pdf
+from response_format import COMPACT_FIELDS, FastJSONProvider, orjson, select_fields
+from synthetic_resumes import synthetic_corpus
+
+MODES = {
+    "full": None,
+    "no_role_text": ("score", "contentQuality", "atsCompatibility", "keywordOptimization", "keywords", "suggestions", "sections"),
+    "compact": COMPACT_FIELDS,
+}
+
+def stdlib_dumps(obj) -> bytes:
+    # What Flask's default provider sends outside debug mode
+    return json.dumps(obj, sort_keys=True, ensure_ascii=True, separators=(",", ":")).encode()
+
+def per_call_ms(fn, min_seconds: float) -> float:
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds: return elapsed / calls * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="large,long_pdf")
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    provider = FastJSONProvider(Flask(__name__))
+    encoders = {"json": stdlib_dumps}
+    if orjson is not None: encoders["orjson"] = provider._orjson_dumps
+    else: print("orjson is not installed; only the stdlib encoder is measured.")
+
+    print(f"{'size':10} {'mode':13} {'bytes':>9} {'select ms':>10}" + "".join(f" {name + ' ms':>10}" for name in encoders))
+    for size in args.sizes.split(","):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            results = [analyze_resume_text(extract_text_from_pdf(io.BytesIO(pdf))) for _, pdf in synthetic_corpus(size, args.count)]
+        for mode, fields in MODES.items():
+            selected = [select_fields(result, fields) for result in results]
+            payload = sum(len(stdlib_dumps(result)) for result in selected) / len(selected)
+            select_ms = per_call_ms(lambda: [select_fields(result, fields) for result in results], args.min_seconds) / len(results)
+            timings = [per_call_ms(lambda: [dumps(result) for result in selected], args.min_seconds) / len(selected) for dumps in encoders.values()]
+            print(f"{size:10} {mode:13} {payload:9.0f} {select_ms:10.3f}" + "".join(f" {ms:10.3f}" for ms in timings))
@@ -0,0 +1,75 @@
+# File: python-resume-analyzer/bench_skill_matcher.py
+# Description: Microbenchmark for skill extraction - per-call Matcher rebuild vs. the shared SkillMatcher, and how the
+# SkillMatcher's build and match times scale with the size of the taxonomy.
+# Usage: python bench_skill_matcher.py [path/to/resume.txt] [--sizes 200,2000,10000,50000]
+
+import argparse
+import random
+import sys
+import time
+from spacy.matcher import Matcher
+from resume_analyzer import get_nlp, COMMON_SKILLS, SKILL_TAXONOMY, extract_keywords_from_text_spacy, generate_skill_patterns
+from skill_matcher import SkillMatcher, SkillTaxonomy
+
+SAMPLE_TEXT = """Senior Software Engineer with 8 years of experience building Python and Java services on AWS.
+Led migration of a monolith to Microservices on Kubernetes and Docker, cutting deploy time by 40%.
+Built data pipelines with Apache Spark, Kafka and Airflow feeding a Snowflake warehouse.
+Frontend work in React.js, Next.js and TypeScript; APIs in Node.js, Express.js, FastAPI and GraphQL.
+Skills: Python, C++, C#, Go, SQL, PostgreSQL, MongoDB, Redis, Terraform, CI/CD, Jenkins, Agile, Scrum.
+Machine Learning with TensorFlow, PyTorch and Scikit-learn; Data Analysis with Pandas and NumPy.
+"""
+
+def legacy_extract_keywords(doc, skill_list):
+    # The pre-SkillMatcher implementation: compile every pattern and scan the list per hit, on every call.
+    found_keywords = set()
+    nlp = get_nlp()
+    matcher = Matcher(nlp.vocab)
+    for p in generate_skill_patterns(skill_list): matcher.add(p["label"], [p["pattern"]])
+    for match_id, start, end in matcher(doc):
+        label = nlp.vocab.strings[match_id]
+        found_keywords.add(next((s for s in skill_list if s.upper() == label), label))
+    return list(found_keywords)
+
+def synthetic_taxonomy(size: int, seed: int = 0) -> SkillTaxonomy:
+    # The real taxonomy padded with made-up one- to three-word skills (each with an alias) up to size entries.
+    rng = random.Random(seed)
+    syllables = ["ka", "zu", "mo", "ri", "ten", "vex", "lo", "qua", "dra", "nix", "po", "sel"]
+    word = lambda: "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+    entries = list(SKILL_TAXONOMY.entries)
+    while len(entries) < size:
+        name = " ".join(word() for _ in range(rng.randint(1, 3)))
+        entries.append({"skill": name, "aliases": [name.replace(" ", "") + "JS"], "category": "synthetic"})
+    return SkillTaxonomy(entries[:size])
+
+def calls_per_second(fn, doc, min_seconds=2.0, skill_list=COMMON_SKILLS):
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(doc, skill_list)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds: return calls / elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("resume", nargs="?")
+    parser.add_argument("--sizes", default="200,2000,10000,50000")
+    args = parser.parse_args()
+    nlp = get_nlp()
+    if not nlp:
+        sys.exit("spaCy model not loaded; nothing to benchmark.")
+    text = open(args.resume).read() if args.resume else SAMPLE_TEXT * 3
+    doc = nlp(text)
+    legacy, shared = legacy_extract_keywords(doc, COMMON_SKILLS), extract_keywords_from_text_spacy(doc, COMMON_SKILLS)
+    print(f"Tokens: {len(doc)}, skills found: legacy={len(legacy)} taxonomy={len(shared)} (taxonomy adds aliases and case-insensitive matching)")
+    before = calls_per_second(legacy_extract_keywords, doc)
+    after = calls_per_second(extract_keywords_from_text_spacy, doc)
+    print(f"Per-call Matcher rebuild: {before:10.1f} calls/s")
+    print(f"Shared SkillMatcher:      {after:10.1f} calls/s  ({after / before:.1f}x)")
+
+    print("Taxonomy size   build s   calls/s")
+    for size in (int(n) for n in args.sizes.split(",")):
+        taxonomy = synthetic_taxonomy(size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(nlp.tokenizer, taxonomy)
+        build_seconds = time.perf_counter() - start
+        print(f"{size:13d} {build_seconds:9.2f} {calls_per_second(lambda d, skill_list: matcher(d), doc):9.1f}")
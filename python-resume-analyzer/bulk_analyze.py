@@ -0,0 +1,184 @@
+# File: python-resume-analyzer/bulk_analyze.py
+# Description: Offline bulk analysis of a directory (or manifest) of PDF/DOCX resumes into JSON lines, on a pool of
+# worker processes that each load the spaCy model once. Lines come out in input order, keyed by file. A checkpoint
+# next to the output is updated as lines are written, so a killed run picks up where it stopped when started again.
+# Usage: python bulk_analyze.py resumes/ --out results.jsonl [--workers 4] [--mode full|lite] [--restart]
+#        python bulk_analyze.py --manifest files.txt --out results.jsonl   (one path per line, or "key<TAB>path")
+
+import argparse
+import collections
+import hashlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DOCUMENT_KINDS = {".pdf": "pdf", ".docx": "docx"}
+FAILURES = ("no_text", "unreadable", "too_large", "analysis_error")
+
+def directory_inputs(root: str) -> list:
+    """(key, path) for every PDF/DOCX under root, in a stable order; the key is the path relative to root."""
+    inputs = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in DOCUMENT_KINDS:
+                path = os.path.join(directory, name)
+                inputs.append((os.path.relpath(path, root), path))
+    return inputs
+
+def manifest_inputs(manifest_path: str) -> list:
+    """(key, path) for every line of a manifest: "path" (the key is the path as written) or "key<TAB>path".
+    Relative paths are relative to the manifest's directory."""
+    base, inputs = os.path.dirname(os.path.abspath(manifest_path)), []
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"): continue
+            key, _, path = line.rpartition("\t")
+            inputs.append((key or path, os.path.join(base, path)))
+    return inputs
+
+_analyze = _version = None # Set in each worker by _init_worker()
+
+def _exit_with_parent(parent_pid: int):
+    # A killed run (kill -9, the OOM killer) would otherwise leave its workers waiting on the queue, model loaded
+    while os.getppid() == parent_pid: time.sleep(1)
+    os._exit(1)
+
+def _init_worker(mode: str, quiet: bool, parent_pid: int):
+    global _analyze, _version
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    if quiet: sys.stdout = open(os.devnull, "w") # The analyzer logs every resume
+    if mode == "lite":
+        from lite_analyzer import analyze_resume_text_lite, lite_analyzer_version
+        _analyze, _version = analyze_resume_text_lite, lite_analyzer_version()
+    else:
+        from resume_analyzer import analyze_resume_text, analyzer_version, preload_nlp
+        preload_nlp()
+        _analyze, _version = analyze_resume_text, analyzer_version()
+
+def analyze_file(key: str, path: str) -> tuple:
+    """(JSON line, failure kind or None) for one document. The line is {"key", "path", "analyzerVersion", "result"},
+    or {"key", "path", "failure", "error"} when the document could not be analyzed."""
+    from resume_analyzer import DocumentTooLarge, extract_text_from_docx, extract_text_from_pdf
+    record, failure = {"key": key, "path": path}, None
+    try:
+        if DOCUMENT_KINDS.get(os.path.splitext(path)[1].lower()) == "docx":
+            text = extract_text_from_docx(path, strict=True)
+        else:
+            text = extract_text_from_pdf(path, strict=True, max_workers=1) # This process is already one of a pool
+    except DocumentTooLarge as e:
+        text, failure, record["error"] = "", "too_large", str(e)
+    except Exception as e: # PdfReadError, a corrupt DOCX zip, a missing file, ...
+        text, failure, record["error"] = "", "unreadable", f"{type(e).__name__}: {e}"
+    if not failure and not text.strip():
+        failure, record["error"] = "no_text", "No text could be extracted; the document may be image-based or empty."
+    if not failure:
+        try:
+            result = _analyze(text)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        if "error" in result: failure, record["error"] = "analysis_error", result["error"]
+        else: record.update(analyzerVersion=_version, result=result)
+    if failure: record["failure"] = failure
+    return json.dumps(record, ensure_ascii=False) + "\n", failure
+
+def inputs_digest(inputs: list) -> str:
+    return hashlib.sha256("\n".join(f"{key}\t{path}" for key, path in inputs).encode("utf-8")).hexdigest()
+
+class Checkpoint:
+    """Progress of a run, in <out>.checkpoint: how many inputs have their line in the output, the output's length
+    after those lines, the failure counts so far, and a digest of the input list so a resumed run can tell it is
+    still working through the same files."""
+
+    def __init__(self, out_path: str, inputs: list):
+        self.path, self.digest = out_path + ".checkpoint", inputs_digest(inputs)
+        self.done, self.output_bytes, self.failures = 0, 0, collections.Counter()
+
+    def load(self) -> bool:
+        """Restores a saved checkpoint of the same inputs; False if there is none. Raises ValueError for other inputs."""
+        try:
+            with open(self.path, encoding="utf-8") as f: saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        if saved["inputs"] != self.digest: raise ValueError(f"{self.path} belongs to a different list of inputs; rerun with --restart to start over.")
+        self.done, self.output_bytes, self.failures = saved["done"], saved["output_bytes"], collections.Counter(saved["failures"])
+        return True
+
+    def save(self, out_file):
+        out_file.flush()
+        os.fsync(out_file.fileno()) # The lines must be on disk before the checkpoint that counts them
+        self.output_bytes = out_file.tell()
+        tmp_path = f"{self.path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"inputs": self.digest, "done": self.done, "output_bytes": self.output_bytes, "failures": self.failures}, f)
+        os.replace(tmp_path, self.path)
+
+def report(checkpoint: Checkpoint, total: int, started_done: int, started_at: float, stream=sys.stderr):
+    elapsed = time.perf_counter() - started_at
+    rate = (checkpoint.done - started_done) / elapsed if elapsed > 0 else 0.0
+    eta = f", ETA {(total - checkpoint.done) / rate / 60:.1f} min" if rate and checkpoint.done < total else ""
+    failures = ", ".join(f"{kind} {checkpoint.failures[kind]}" for kind in FAILURES if checkpoint.failures[kind])
+    print(f"{checkpoint.done}/{total} files, {rate:.1f} files/s, {sum(checkpoint.failures.values())} failed{' (' + failures + ')' if failures else ''}{eta}", file=stream, flush=True)
+
+def run(inputs: list, out_path: str, workers: int = None, mode: str = "full", restart: bool = False, checkpoint_every: int = 100, progress_seconds: float = 10, quiet: bool = True) -> Checkpoint:
+    """Analyzes inputs ([(key, path)]) into out_path, resuming from its checkpoint unless restart; returns the final checkpoint."""
+    checkpoint = Checkpoint(out_path, inputs)
+    if not restart and not checkpoint.load() and os.path.exists(out_path) and os.path.getsize(out_path):
+        raise ValueError(f"{out_path} exists but has no checkpoint; rerun with --restart to overwrite it.")
+    workers = max(1, workers or os.cpu_count() or 1)
+    started_done, started_at, last_report = checkpoint.done, time.perf_counter(), time.perf_counter()
+    if checkpoint.done: print(f"Resuming after {checkpoint.done} of {len(inputs)} files.", file=sys.stderr)
+    with open(out_path, "ab" if checkpoint.done else "wb") as out_file:
+        out_file.truncate(checkpoint.output_bytes) # Drops lines written after the last checkpoint
+        out_file.seek(checkpoint.output_bytes)
+        try:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(mode, quiet, os.getpid())) as pool:
+                # A bounded window of submitted files keeps the order of the output without holding every result
+                remaining = iter(inputs[checkpoint.done:])
+                pending = collections.deque(pool.submit(analyze_file, key, path) for key, path in itertools.islice(remaining, workers * 4))
+                while pending:
+                    line, failure = pending.popleft().result()
+                    for key, path in itertools.islice(remaining, 1): pending.append(pool.submit(analyze_file, key, path))
+                    out_file.write(line.encode("utf-8"))
+                    checkpoint.done += 1
+                    if failure: checkpoint.failures[failure] += 1
+                    if checkpoint.done % checkpoint_every == 0: checkpoint.save(out_file)
+                    if time.perf_counter() - last_report >= progress_seconds:
+                        report(checkpoint, len(inputs), started_done, started_at)
+                        last_report = time.perf_counter()
+        except BrokenProcessPool:
+            print(f"A worker process died (out of memory?) after {checkpoint.done} files; rerun to resume from there.", file=sys.stderr)
+            raise
+        finally:
+            checkpoint.save(out_file)
+    report(checkpoint, len(inputs), started_done, started_at)
+    return checkpoint
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory", nargs="?", help="analyze every .pdf/.docx under this directory")
+    parser.add_argument("--manifest", help="or the files listed here: one path per line, or key<TAB>path")
+    parser.add_argument("--out", required=True, help="JSON lines output; its checkpoint is <out>.checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes, each with its own model (default: CPU count)")
+    parser.add_argument("--mode", choices=("full", "lite"), default="full")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and overwrite the output")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="files between checkpoints")
+    parser.add_argument("--progress-seconds", type=float, default=10)
+    parser.add_argument("--verbose", action="store_true", help="keep the analyzer's per-resume log lines")
+    args = parser.parse_args()
+    if bool(args.directory) == bool(args.manifest): parser.error("give either a directory or --manifest")
+
+    inputs = manifest_inputs(args.manifest) if args.manifest else directory_inputs(args.directory)
+    try:
+        checkpoint = run(inputs, args.out, args.workers, args.mode, args.restart, max(1, args.checkpoint_every), args.progress_seconds, quiet=not args.verbose)
+    except (ValueError, BrokenProcessPool) as e:
+        sys.exit(str(e) or type(e).__name__)
+    except KeyboardInterrupt:
+        sys.exit("Interrupted; rerun the same command to resume.")
+    print(f"Wrote {checkpoint.done} results to {args.out} ({sum(checkpoint.failures.values())} failed).")
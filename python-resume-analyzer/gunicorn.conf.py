@@ -0,0 +1,49 @@
+# File: python-resume-analyzer/gunicorn.conf.py
+# Description: Production serving config. Run with: gunicorn -c gunicorn.conf.py app:app
+# Every setting can be overridden with the GUNICORN_* environment variables below (or on the command line).
+
+import gc
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Analysis is CPU-bound (spaCy holds the GIL), so one worker per core does the real work. Admission control lets
+# ANALYSIS_CONCURRENCY threads per worker analyze at a time; the other threads serve uploads, /health and cache hits,
+# or wait in the worker's admission queue, where interactive requests go ahead of batch work (in gunicorn's accept
+# backlog they could not).
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# POST /analyze?async=1 runs the analysis in the background of the worker that took the upload, but GET /jobs/<id>
+# and its event stream can land on any worker, so with more than one worker the jobs go into a SQLite file they
+# all open. Set ANALYSIS_JOBS_DB to choose the file (e.g. on a faster disk).
+if workers > 1: os.environ.setdefault("ANALYSIS_JOBS_DB", os.path.join(tempfile.gettempdir(), f"resume-analyzer-jobs-{bind.rsplit(':', 1)[-1]}.sqlite"))
+
+# A typical resume analyzes in well under a second, but long PDFs and /analyze/batch can take much longer.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Recycle each worker after a jittered number of requests so spaCy's growing vocab/string store cannot creep
+# memory up forever, without all workers restarting at the same moment.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 500))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 50))
+
+# Load the app, and with it the spaCy model and skill matcher, once in the master before forking, so the workers
+# share those pages copy-on-write instead of each loading its own copy.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+if preload_app: os.environ.setdefault("SPACY_PRELOAD", "1")
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the GC's tracked generations; otherwise the first collection in each
+    # worker touches (and so copies) every preloaded object.
+    gc.freeze()
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} started ({threads} thread(s), recycles after ~{max_requests} requests)")
@@ -0,0 +1,280 @@
+# File: python-resume-analyzer/job_index.py
+# Description: Inverted skill index over job postings with TF-IDF cosine ranking for top-k job recommendations.
+
+import contextlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import numpy as np
+
+class JobSkillIndex:
+    """Job postings indexed by the skills they mention.
+
+    Each skill keeps a postings list of row numbers (one row per job). Skills are binary per job (a posting either
+    asks for Docker or not), so the TF-IDF weight of a (job, skill) pair is just the skill's smoothed IDF, and a
+    job's vector norm is the root of the sum of its skills' squared IDFs. Ranking a resume accumulates
+    idf^2 over the postings of the resume's skills into one score array, divides by the job norms and takes the
+    top k with argpartition, so a query touches only the postings of skills the resume actually has.
+
+    Nothing is recomputed for the whole catalog when a job is added or removed. With N jobs and df_s jobs per skill,
+    idf_s = a - b_s where a = ln(1 + N) + 1 and b_s = ln(1 + df_s), so a job's squared norm is
+    n * a^2 - 2a * sum(b_s) + sum(b_s^2) over its n skills. Each row keeps n and the two sums; when a skill's df
+    changes, only the rows in that skill's postings have their sums adjusted, once, before the next query.
+
+    Removing a job leaves a dead row behind; rows are compacted once more than half of them are dead.
+    """
+
+    def __init__(self, skill_list: list):
+        self.skill_list = list(skill_list)
+        self.column_by_skill = {skill: i for i, skill in enumerate(self.skill_list)}
+        self.job_ids = [] # row -> job id (None for removed rows)
+        self.job_skills = [] # row -> tuple of skill columns
+        self.row_by_job_id = {}
+        self.postings = [[] for _ in self.skill_list] # column -> list of rows (may include dead rows)
+        self._posting_arrays = [None] * len(self.skill_list) # column -> np.ndarray of its postings, rebuilt after it grows
+        self.doc_freq = np.zeros(len(self.skill_list), dtype=np.int64) # column -> live jobs with that skill
+        self._folded = np.zeros(len(self.skill_list)) # column -> b_s as last added into the row sums
+        self._stale = set() # Columns whose df changed since they were last folded in
+        self._rows = np.zeros((1024, 3)) # row -> (skills, sum of b_s, sum of b_s^2); grown by doubling
+        self._live = np.zeros(1024, dtype=bool)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.row_by_job_id)
+
+    def __contains__(self, job_id):
+        return job_id in self.row_by_job_id
+
+    def _columns(self, skills) -> tuple:
+        return tuple(sorted({self.column_by_skill[s] for s in skills if s in self.column_by_skill}))
+
+    def add(self, job_id: str, skills) -> int:
+        """Indexes (or re-indexes) a job under the given skills; returns the number of known skills it has."""
+        columns = self._columns(skills)
+        with self._lock:
+            if job_id in self.row_by_job_id: self._remove_row(self.row_by_job_id.pop(job_id))
+            row = len(self.job_ids)
+            if row == len(self._live):
+                self._rows = np.concatenate([self._rows, np.zeros_like(self._rows)])
+                self._live = np.concatenate([self._live, np.zeros_like(self._live)])
+            self.job_ids.append(job_id)
+            self.job_skills.append(columns)
+            self.row_by_job_id[job_id] = row
+            folded = self._folded[list(columns)]
+            self._rows[row] = (len(columns), folded.sum(), (folded ** 2).sum())
+            self._live[row] = True
+            for column in columns:
+                self.postings[column].append(row)
+                self._posting_arrays[column] = None
+                self.doc_freq[column] += 1
+                self._stale.add(column)
+        return len(columns)
+
+    def _remove_row(self, row: int):
+        for column in self.job_skills[row]:
+            self.doc_freq[column] -= 1
+            self._stale.add(column)
+        self.job_ids[row] = None
+        self.job_skills[row] = ()
+        self._live[row] = False
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            row = self.row_by_job_id.pop(job_id, None)
+            if row is None: return False
+            self._remove_row(row)
+            if len(self.job_ids) > 64 and len(self.row_by_job_id) * 2 < len(self.job_ids): self._compact()
+            return True
+
+    def _compact(self):
+        live = [(job_id, columns) for job_id, columns in zip(self.job_ids, self.job_skills) if job_id is not None]
+        self.__init__(self.skill_list)
+        for job_id, columns in live: self.add(job_id, [self.skill_list[c] for c in columns])
+
+    def _posting_array(self, column: int) -> np.ndarray:
+        if self._posting_arrays[column] is None: self._posting_arrays[column] = np.asarray(self.postings[column], dtype=np.int64)
+        return self._posting_arrays[column]
+
+    def _prepare(self):
+        # Brings the row sums of rows with a skill whose df changed up to date (dead rows too; they are never ranked)
+        for column in self._stale:
+            old, new = self._folded[column], math.log1p(self.doc_freq[column])
+            rows = self._posting_array(column)
+            self._rows[rows, 1] += new - old
+            self._rows[rows, 2] += new * new - old * old
+            self._folded[column] = new
+        self._stale.clear()
+
+    def top_k(self, skills, k: int = 10) -> list:
+        """The k jobs most similar to a resume with these skills (cosine of TF-IDF vectors), best first.
+        Each result is {"jobId", "score" (0-1), "matching": [skills shared with the resume]}."""
+        columns = self._columns(skills)
+        if not columns or k <= 0: return []
+        with self._lock:
+            self._prepare()
+            a = math.log1p(len(self.row_by_job_id)) + 1
+            idf = a - self._folded
+            scores = np.zeros(len(self.job_ids))
+            for column in columns:
+                rows = self._posting_array(column)
+                if len(rows): scores[rows] += idf[column] ** 2 # Rows within one posting list are unique
+            candidates = np.flatnonzero(scores * self._live[:len(scores)])
+            if not len(candidates): return []
+            query_norm = math.sqrt(sum(idf[column] ** 2 for column in columns))
+            n_skills, sum_b, sum_b2 = self._rows[candidates].T
+            scores = scores[candidates] / (np.sqrt(n_skills * a * a - 2 * a * sum_b + sum_b2) * query_norm)
+            if len(candidates) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(len(candidates))
+            best = best[np.lexsort((candidates[best], -scores[best]))] # By score, ties in insertion order
+            query = set(columns)
+            return [{
+                "jobId": self.job_ids[candidates[i]], "score": round(float(scores[i]), 4),
+                "matching": [self.skill_list[c] for c in self.job_skills[candidates[i]] if c in query],
+            } for i in best]
+
+    def save(self, path: str):
+        """Writes the index to path (NumPy .npz, CSR layout of job -> skills), replacing the file atomically."""
+        with self._lock:
+            live = [(job_id, columns) for job_id, columns in zip(self.job_ids, self.job_skills) if job_id is not None]
+            indptr = np.cumsum([0] + [len(columns) for _, columns in live], dtype=np.int64)
+            indices = np.array([c for _, columns in live for c in columns], dtype=np.int32)
+            job_ids = np.array([job_id for job_id, _ in live], dtype=str)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, skill_list=np.array(self.skill_list, dtype=str), job_ids=job_ids, indptr=indptr, indices=indices)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, skill_list: list = None):
+        """Reads an index written by save(). With skill_list, skills outside it are dropped (columns are remapped)."""
+        with np.load(path) as data:
+            saved_skills, job_ids = data["skill_list"].tolist(), data["job_ids"].tolist()
+            indptr, indices = data["indptr"], data["indices"]
+        index = cls(skill_list if skill_list is not None else saved_skills)
+        for row, job_id in enumerate(job_ids):
+            index.add(job_id, [saved_skills[c] for c in indices[indptr[row]:indptr[row + 1]]])
+        return index
+
+class PersistentJobIndex:
+    """A JobSkillIndex backed by a SQLite file that every gunicorn worker shares.
+
+    Each job is one row (its skills as a JSON list) stamped with the change number that last wrote it; a removal
+    keeps the row with NULL skills as a tombstone. Before each use a worker reads the rows changed since the last
+    change it has seen and applies them to its in-memory index as adds and removes, so an update costs every other
+    worker only the jobs that changed, not a reload of the catalog. An update runs inside a BEGIN IMMEDIATE
+    transaction (catch up, write, apply), so concurrent updates from different workers are applied one after the
+    other. Tombstones more than TOMBSTONE_WINDOW changes old are deleted; a worker that far behind reloads everything.
+
+    A path ending in .npz (the format save() writes) is read from the .sqlite file next to it, which is seeded from
+    the .npz the first time.
+    """
+
+    TOMBSTONE_WINDOW = 100_000
+
+    def __init__(self, skill_list: list, path: str = None):
+        self.skill_list = list(skill_list)
+        self.path = path
+        self.db_path = path[:-len(".npz")] + ".sqlite" if path and path.endswith(".npz") else path
+        self.index = JobSkillIndex(self.skill_list)
+        self._seq = 0 # Last change applied to self.index
+        self._lock = threading.Lock()
+        if not self.db_path: return
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, skills TEXT, seq INTEGER NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_seq ON jobs (seq)")
+            conn.execute("CREATE TABLE IF NOT EXISTS job_index_meta (id INTEGER PRIMARY KEY CHECK (id = 0), seq INTEGER NOT NULL, pruned_through INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO job_index_meta VALUES (0, 0, 0)")
+            if self.db_path != path and self._meta(conn)[0] == 0 and os.path.exists(path): self._import(conn, path)
+            self._catch_up(conn)
+            conn.execute("COMMIT")
+        print(f"PYTHON_LOG: Loaded job index with {len(self.index)} postings from {self.db_path}.")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _meta(conn) -> tuple:
+        return conn.execute("SELECT seq, pruned_through FROM job_index_meta WHERE id = 0").fetchone()
+
+    def _import(self, conn, npz_path: str):
+        try:
+            saved = JobSkillIndex.load(npz_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"PYTHON_ERROR: Could not load job index from {npz_path}: {e}")
+            return
+        rows = [(job_id, json.dumps([saved.skill_list[c] for c in columns]), 1) for job_id, columns in zip(saved.job_ids, saved.job_skills) if job_id is not None]
+        conn.executemany("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)", rows)
+        conn.execute("UPDATE job_index_meta SET seq = 1 WHERE id = 0")
+        print(f"PYTHON_LOG: Imported {len(rows)} job postings from {npz_path} into {self.db_path}.")
+
+    def _catch_up(self, conn):
+        # Applies the changes other workers have made since self._seq (all jobs, if their tombstones are gone)
+        seq, pruned_through = self._meta(conn)
+        if seq == self._seq: return
+        if self._seq < pruned_through:
+            self.index, self._seq = JobSkillIndex(self.skill_list), 0
+        for job_id, skills in conn.execute("SELECT job_id, skills FROM jobs WHERE seq > ? ORDER BY seq", (self._seq,)):
+            if skills is None: self.index.remove(job_id)
+            else: self.index.add(job_id, json.loads(skills))
+        self._seq = seq
+
+    def current(self) -> JobSkillIndex:
+        with self._lock:
+            if self.db_path:
+                with self._connect() as conn:
+                    conn.execute("BEGIN") # One snapshot for the change number and the rows
+                    self._catch_up(conn)
+                    conn.execute("COMMIT")
+            return self.index
+
+    def update(self, added: dict = None, removed: list = None) -> dict:
+        """Applies {job_id: skills} additions and job_id removals in one step on top of the latest shared index."""
+        with self._lock, contextlib.ExitStack() as stack:
+            conn = stack.enter_context(self._connect()) if self.db_path else None
+            if conn is not None:
+                conn.execute("BEGIN IMMEDIATE")
+                self._catch_up(conn)
+            counts, changes = {"added": 0, "removed": 0}, []
+            for job_id, skills in (added or {}).items():
+                self.index.add(job_id, skills)
+                counts["added"] += 1
+                changes.append((job_id, json.dumps(list(skills))))
+            for job_id in removed or []:
+                if self.index.remove(job_id):
+                    counts["removed"] += 1
+                    changes.append((job_id, None))
+            if conn is not None and changes:
+                seq = self._seq + 1 # One change number for the whole update
+                conn.executemany("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)", [(job_id, skills, seq) for job_id, skills in changes])
+                pruned_through = self._meta(conn)[1]
+                if seq - self.TOMBSTONE_WINDOW > pruned_through and removed:
+                    pruned_through = seq - self.TOMBSTONE_WINDOW
+                    conn.execute("DELETE FROM jobs WHERE skills IS NULL AND seq <= ?", (pruned_through,))
+                conn.execute("UPDATE job_index_meta SET seq = ?, pruned_through = ? WHERE id = 0", (seq, pruned_through))
+                self._seq = seq
+            if conn is not None:
+                try:
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self.index, self._seq = JobSkillIndex(self.skill_list), 0 # Applied locally only: reload next time
+                    raise
+            counts["total"] = len(self.index)
+            return counts
+
+def job_index_from_env(skill_list: list) -> PersistentJobIndex:
+    """Job index persisted in the SQLite file at JOB_INDEX_PATH (in memory only when unset)."""
+    return PersistentJobIndex(skill_list, os.environ.get("JOB_INDEX_PATH") or None)
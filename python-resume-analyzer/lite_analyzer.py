@@ -0,0 +1,177 @@
+# File: python-resume-analyzer/lite_analyzer.py
+# Description: "lite" analysis mode (POST /analyze?mode=lite) - sections, skills, bullets, quantifiable results and a
+# score from regular expressions and a token-level skill index, without running (or even loading) the spaCy pipeline.
+# A resume takes a few milliseconds, so it suits live feedback while typing, and it still works when the model is
+# missing. Scores use the same formula as the full analysis; bench_lite.py reports how far they diverge.
+
+import re
+from metrics import timed, size_class
+from patterns import count_quantifiables, DATE_RANGE_RE, YEAR_RE
+from skill_matcher import SkillTaxonomy, build_trie, find_in_trie
+from resume_analyzer import (
+    ANALYZER_VERSION, SKILL_TAXONOMY, COMMON_SKILLS, BULLET_POINT_STARTS, IMPACT_WORDS, identify_section_spans, iter_line_offsets, is_potential_title,
+    scored_sections, combine_section_analyses, empty_text_result, with_impact, with_resume_offsets, job_entry_analysis,
+    experience_analysis, summary_analysis, skills_analysis, education_analysis, projects_analysis, _strip_offsets,
+)
+
+TOKEN_RE = re.compile(r"\w+(?:\.\w+)*|[^\w\s]") # Words (dotted ones like "Node.js" whole) and single punctuation ("C++" -> c, +, +)
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+FIRST_WORD_RE = re.compile(r"[^\w]*([A-Za-z]+)\b")
+INSTITUTION_RE = re.compile(r"\b(?:University|College|Institute|School|Academy|Polytechnic)\b")
+INSTITUTION_SPLIT_RE = re.compile(r"\s*[|,–—]\s*|\s+-\s+")
+
+# Without a tagger, a bullet "starts with an action verb" when its first word is a past-tense form or one of these
+IRREGULAR_ACTION_VERBS = frozenset(["led", "built", "ran", "grew", "drove", "won", "made", "wrote", "began", "cut", "sold", "taught", "brought", "found", "kept", "held", "oversaw", "rebuilt", "took", "set"])
+BASE_ACTION_VERBS = frozenset(["lead", "build", "run", "grow", "drive", "own", "manage", "develop", "design", "create", "implement", "deliver", "maintain", "optimize", "automate", "mentor", "coordinate", "analyze", "support", "write", "test", "deploy", "migrate", "launch", "improve", "reduce", "increase", "architect", "establish", "collaborate"])
+
+_lite_skill_indexes = {} # tuple(skill_list) -> LiteSkillIndex
+
+def lite_analyzer_version() -> str:
+    # Lite results do not depend on the spaCy model, so unlike analyzer_version() this never loads it
+    return f"{ANALYZER_VERSION}/lite"
+
+def tokenize(text: str) -> list:
+    """Lowercase word and punctuation tokens, the keys of the lite skill index."""
+    return [token.lower() for token in TOKEN_RE.findall(text)]
+
+def _singular(token: str) -> str:
+    # Stands in for the lemma of plural forms ("microservices" -> "microservice")
+    return token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+class LiteSkillIndex:
+    """The taxonomy trie of SkillMatcher, keyed by lowercase regex tokens instead of spaCy token hashes.
+    Ambiguous forms ("Go") need their exact casing; with no tagger there is no part-of-speech check."""
+
+    def __init__(self, taxonomy):
+        if isinstance(taxonomy, (list, tuple)): taxonomy = SkillTaxonomy.from_skills(taxonomy)
+        self.taxonomy = taxonomy
+        self.trie = build_trie(taxonomy, tokenize)
+
+    def __call__(self, text: str) -> list:
+        matches = list(TOKEN_RE.finditer(text))
+        keys = [match.group().lower() for match in matches]
+        found_keywords = set()
+        for match_start, match_end, skills in find_in_trie(self.trie, keys, [_singular(key) for key in keys]):
+            for skill, forms in skills.items():
+                if skill in found_keywords: continue
+                if forms and text[matches[match_start].start():matches[match_end - 1].end()] not in forms: continue
+                found_keywords.add(skill)
+        return list(found_keywords)
+
+def get_lite_skill_index(skill_list: list = None) -> LiteSkillIndex:
+    """Process-wide index for skill_list (default: the full taxonomy with aliases), built on first use."""
+    key = tuple(skill_list or COMMON_SKILLS)
+    index = _lite_skill_indexes.get(key)
+    if index is None:
+        taxonomy = SKILL_TAXONOMY if key == tuple(COMMON_SKILLS) else SkillTaxonomy.from_skills(skill_list)
+        with timed("skill_matcher_build"): index = _lite_skill_indexes[key] = LiteSkillIndex(taxonomy)
+    return index
+
+def sentences(text: str) -> list:
+    return [sentence for sentence in SENTENCE_SPLIT_RE.split(text.strip()) if sentence]
+
+def action_verb(text: str):
+    """The first word of text, lowercased, if it looks like an action verb ("Developed", "Led", "Manage"); else None."""
+    match = FIRST_WORD_RE.match(text)
+    if not match: return None
+    word = match.group(1).lower()
+    return word if (len(word) > 4 and word.endswith("ed")) or word in IRREGULAR_ACTION_VERBS or word in BASE_ACTION_VERBS else None
+
+def analyze_job_entry_lite(job_text: str) -> dict:
+    action_verb_lemmas, bullet_points_count = set(), 0
+    for line in job_text.splitlines():
+        stripped_line = line.strip()
+        if stripped_line.startswith(BULLET_POINT_STARTS):
+            bullet_points_count += 1
+            verb = action_verb(stripped_line[1:])
+            if verb: action_verb_lemmas.add(verb)
+    if bullet_points_count == 0:
+        job_entry_sents = sentences(job_text)
+        action_verb_lemmas.update(verb for verb in map(action_verb, job_entry_sents) if verb)
+        bullet_points_count = len(job_entry_sents)
+    return job_entry_analysis(action_verb_lemmas, bullet_points_count, sum(count_quantifiables(job_text).values()))
+
+def segment_experience_lite(experience_text: str) -> list:
+    """Splits the experience section into roles. A role starts with header lines (title, company, dates) and a
+    line with a date range or a job title after the role's first bullet or sentence, or a short line right after a
+    bullet, starts the next one. Without ORG entities, the company is the first short header line that is neither
+    the title nor the dates."""
+    parsed_roles = []
+    role_start = role_end = None
+    title, company, dates, in_header, after_bullet = "N/A", "N/A", "N/A", True, False
+
+    def save_role():
+        start, end = _strip_offsets(experience_text, role_start, role_end)
+        role_text = experience_text[start:end]
+        parsed_roles.append({"role_text": role_text, "role_offsets": [start, end], "title_guess": title, "company_guess": company, "dates_guess": dates, **analyze_job_entry_lite(role_text)})
+
+    for line, line_start, line_end in iter_line_offsets(experience_text):
+        stripped_line = line.strip()
+        if not stripped_line: continue
+        date_match = DATE_RANGE_RE.search(stripped_line)
+        line_is_potential_title = is_potential_title(stripped_line)
+        is_bullet, is_short = stripped_line.startswith(BULLET_POINT_STARTS), len(stripped_line.split()) < 7 and not stripped_line.endswith(".")
+        starts_role = date_match or (line_is_potential_title and title.lower() not in stripped_line.lower()) or (after_bullet and is_short and not is_bullet)
+        after_bullet = is_bullet
+        if role_start is not None and not in_header and starts_role:
+            save_role()
+            role_start, title, company, dates, in_header = None, "N/A", "N/A", "N/A", True
+        if role_start is None: role_start = line_start
+        role_end = line_end
+        if title == "N/A" and line_is_potential_title: title = stripped_line
+        elif dates == "N/A" and date_match: dates = date_match.group(0).strip()
+        elif in_header and is_short and not is_bullet:
+            if company == "N/A": company = stripped_line
+        else: in_header = False
+    if role_start is not None: save_role()
+    if not parsed_roles:
+        parsed_roles.append({"role_text": experience_text, "role_offsets": [0, len(experience_text)], "title_guess": "Experience Details", "company_guess": "N/A", "dates_guess": "N/A", **analyze_job_entry_lite(experience_text)})
+    return parsed_roles
+
+def analyze_education_lite(education_text: str) -> dict:
+    institutions = [part.strip() for line in education_text.splitlines() if INSTITUTION_RE.search(line) for part in INSTITUTION_SPLIT_RE.split(line) if INSTITUTION_RE.search(part)]
+    grad_dates = [match.group(0).strip() for match in DATE_RANGE_RE.finditer(education_text)] or YEAR_RE.findall(education_text)
+    return education_analysis(education_text, sorted(set(institutions)), sorted(set(grad_dates)))
+
+def analyze_section_lite(name: str, section_text: str, skill_index: LiteSkillIndex) -> dict:
+    """Lite counterpart of analyze_section(): the same fields, from the section text alone."""
+    if name == "summary":
+        impact_verb_count = sum(1 for word in tokenize(section_text) if word in IMPACT_WORDS)
+        return summary_analysis(section_text, len(sentences(section_text)), impact_verb_count)
+    if name == "experience": return experience_analysis(section_text, segment_experience_lite(section_text), lambda: analyze_job_entry_lite(section_text))
+    if name == "skills": return skills_analysis(section_text, skill_index(section_text))
+    if name == "education": return with_impact(name, analyze_education_lite(section_text))
+    if name == "projects": return with_impact(name, projects_analysis(section_text, skill_index(section_text)))
+    raise ValueError(f"Unknown section '{name}'")
+
+def analyze_resume_text_lite(text: str, on_section=None) -> dict:
+    """Lite analysis of one resume: the response shape of analyze_resume_text() plus "mode": "lite".
+    Approximate where the full analysis relies on the model (action verbs, sentences, ORG/DATE entities)."""
+    if not text.strip(): return dict(empty_text_result(), mode="lite")
+    with timed("lite_analysis", size=size_class(len(text))):
+        skill_index = get_lite_skill_index()
+        section_spans = identify_section_spans(text)
+        extracted_sections_content = {name: text[start:end] for name, (start, end) in section_spans.items()}
+        all_keywords_present = skill_index(text)
+        final_sections_analysis = {}
+        for name, source in scored_sections(extracted_sections_content):
+            section_analysis = analyze_section_lite(name, extracted_sections_content[source], skill_index)
+            final_sections_analysis[name] = with_resume_offsets(name, section_analysis, section_spans[source][0])
+            if on_section: on_section(name, final_sections_analysis[name])
+        analysis = combine_section_analyses(text, extracted_sections_content, final_sections_analysis, all_keywords_present)
+    analysis["mode"] = "lite"
+    return analysis
+
+def analyze_resumes_lite(texts: list) -> list:
+    """Lite counterpart of analyze_resumes(): one result per input, in order, with an {"error": ...} result for a failing item."""
+    results = []
+    for i, text in enumerate(texts):
+        if not isinstance(text, str):
+            results.append({"error": "Resume text must be a string."})
+            continue
+        try:
+            results.append(analyze_resume_text_lite(text))
+        except Exception as e:
+            print(f"PYTHON_ERROR: Batch item {i} failed during lite analysis: {e}")
+            results.append({"error": f"An unexpected error occurred during analysis: {str(e)}"})
+    return results
@@ -0,0 +1,91 @@
+# File: python-resume-analyzer/load_test.py
+# Description: Load test against a running analyzer; reports requests/second and latency percentiles per concurrency level.
+# Usage: python load_test.py [--url http://localhost:5000] [--pdf resume.pdf | --pdf-mb 50] [--concurrency 1,2,4,8] [--requests 40]
+# Without --pdf it posts resume text to /analyze/batch. With --pdf it uploads to /analyze; start the server with
+# RESULT_CACHE_ENABLED=0 for that, or every request after the first is a cache hit. --pdf-mb uploads a synthetic
+# resume PDF padded to that many MB (raise the server's MAX_UPLOAD_MB to have it analyzed rather than refused).
+# After each level the peak RSS reported by the worker that answers /metrics is printed as well.
+
+import argparse
+import json
+import re
+import statistics
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_skill_matcher import SAMPLE_TEXT
+from synthetic_resumes import synthetic_resume, text_to_pdf
+
+SAMPLE_RESUME = "Summary\n" + SAMPLE_TEXT + "\nExperience\nSenior Engineer\nAcme Corp\nJan 2019 - Present\n" + "\n".join(f"- {line}" for line in SAMPLE_TEXT.splitlines())
+
+def text_request(url: str):
+    body = json.dumps({"texts": [SAMPLE_RESUME]}).encode()
+    return urllib.request.Request(f"{url}/analyze/batch", data=body, headers={"Content-Type": "application/json"})
+
+def pdf_request(url: str, pdf_bytes: bytes):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"resume.pdf\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode() + pdf_bytes + f"\r\n--{boundary}--\r\n".encode()
+    return urllib.request.Request(f"{url}/analyze", data=body, headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+
+def server_peak_rss_mb(url: str):
+    try:
+        with urllib.request.urlopen(f"{url}/metrics", timeout=10) as response: text = response.read().decode()
+    except Exception:
+        return None
+    match = re.search(r"^process_peak_resident_memory_bytes\S* (\d+)", text, re.MULTILINE)
+    return int(match.group(1)) / (1024 * 1024) if match else None
+
+def timed_request(make_request) -> tuple:
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(make_request(), timeout=300) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run_level(make_request, concurrency: int, total: int) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda _: timed_request(make_request), range(total)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in outcomes)
+    return {
+        "concurrency": concurrency, "requests": total, "errors": sum(1 for _, ok in outcomes if not ok),
+        "rps": total / elapsed, "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[max(0, int(round(len(latencies) * 0.95)) - 1)] * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--pdf", help="PDF to upload to /analyze (default: post sample text to /analyze/batch)")
+    parser.add_argument("--pdf-mb", type=float, help="Upload a synthetic resume PDF padded to this many MB to /analyze")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per concurrency level")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    if args.pdf or args.pdf_mb:
+        if args.pdf: pdf_bytes = open(args.pdf, "rb").read()
+        else: pdf_bytes = text_to_pdf(synthetic_resume(0), 2, padding_bytes=int(args.pdf_mb * 1024 * 1024))
+        make_request = lambda: pdf_request(url, pdf_bytes)
+    else:
+        make_request = lambda: text_request(url)
+    timed_request(make_request) # Warm-up: loads the model if the server is not preloaded
+
+    results = []
+    print(f"{'concurrency':>11} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'errors':>7} {'peak RSS MB':>12}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        result = run_level(make_request, concurrency, max(args.requests, concurrency))
+        result["server_peak_rss_mb"] = server_peak_rss_mb(url)
+        results.append(result)
+        rss = f"{result['server_peak_rss_mb']:12.1f}" if result["server_peak_rss_mb"] is not None else f"{'n/a':>12}"
+        print(f"{result['concurrency']:>11} {result['rps']:8.1f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} {result['errors']:>7} {rss}")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(results, f, indent=2)
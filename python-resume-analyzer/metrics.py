@@ -0,0 +1,168 @@
+# File: python-resume-analyzer/metrics.py
+# Description: In-process stage timings, request counters and process stats, rendered in Prometheus text format.
+# Set METRICS_ENABLED=0 to turn recording off; timed() then hands back a shared no-op span.
+
+import os
+import resource
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def size_class(n_chars: int) -> str:
+    """Low-cardinality document size label (characters of text)."""
+    return "lt2k" if n_chars < 2000 else "2k-8k" if n_chars < 8000 else "8k-32k" if n_chars < 32000 else "ge32k"
+
+def token_class(n_tokens: int) -> str:
+    """Low-cardinality token count label."""
+    return "lt500" if n_tokens < 500 else "500-2k" if n_tokens < 2000 else "2k-8k" if n_tokens < 8000 else "ge8k"
+
+def _label_text(labels: tuple) -> str:
+    if not labels: return ""
+    escape = lambda value: str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.buckets = name, help_text, tuple(buckets)
+        self._series = {} # sorted label tuple -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None: series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock: series_items = [(key, list(series)) for key, series in sorted(self._series.items())]
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_label_text(key + (('le', '+Inf'),))} {series[-2]}")
+            lines.append(f"{self.name}_count{_label_text(key)} {series[-2]}")
+            lines.append(f"{self.name}_sum{_label_text(key)} {series[-1]:.6f}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help_text = name, help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock: self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock: lines += [f"{self.name}{_label_text(key)} {value}" for key, value in sorted(self._series.items())]
+        return lines
+
+class Gauge:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help_text = name, help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock: self._series[key] = value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock: lines += [f"{self.name}{_label_text(key)} {value}" for key, value in sorted(self._series.items())]
+        return lines
+
+STAGE_SECONDS = Histogram("resume_analyzer_stage_seconds", "Time spent in each analysis stage.")
+REQUEST_SECONDS = Histogram("resume_analyzer_request_seconds", "HTTP request latency by endpoint.")
+REQUESTS = Counter("resume_analyzer_requests_total", "HTTP requests by endpoint, method and status code.")
+ERRORS = Counter("resume_analyzer_errors_total", "Errors by stage and exception class.")
+ADMISSION_QUEUED = Gauge("resume_analyzer_admission_queued", "Requests waiting for an analysis slot, by lane.")
+ADMISSION_RUNNING = Gauge("resume_analyzer_admission_running", "Analyses holding a slot, by lane.")
+ADMISSION_WAIT_SECONDS = Histogram("resume_analyzer_admission_wait_seconds", "Time spent waiting for an analysis slot, by lane and outcome (admitted, queue_full, timeout).")
+_START_TIME = time.time()
+
+class _Span:
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage: str, labels: dict):
+        self.stage, self.labels = stage, labels
+
+    def set(self, **labels):
+        """Adds labels that are only known once the stage has run (e.g. the size of the extracted text)."""
+        self.labels.update(labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, stage=self.stage, **self.labels)
+        if exc_type is not None: ERRORS.inc(stage=self.stage, error_class=exc_type.__name__)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+    def set(self, **labels): pass
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc, tb): return False
+
+_NOOP_SPAN = _NoopSpan()
+
+def timed(stage: str, **labels):
+    """with timed("parse", size=size_class(len(text))) as span: ... records the block's duration for the stage."""
+    return _Span(stage, labels) if METRICS_ENABLED else _NOOP_SPAN
+
+def count_error(stage: str, error_class: str):
+    if METRICS_ENABLED: ERRORS.inc(stage=stage, error_class=error_class)
+
+def set_admission_depth(lane: str, queued: int, running: int):
+    if not METRICS_ENABLED: return
+    ADMISSION_QUEUED.set(queued, lane=lane)
+    ADMISSION_RUNNING.set(running, lane=lane)
+
+def observe_admission_wait(lane: str, seconds: float, outcome: str):
+    if METRICS_ENABLED: ADMISSION_WAIT_SECONDS.observe(seconds, lane=lane, outcome=outcome)
+
+def observe_request(endpoint: str, method: str, status: int, seconds: float):
+    if not METRICS_ENABLED: return
+    REQUESTS.inc(endpoint=endpoint, method=method, status=str(status))
+    REQUEST_SECONDS.observe(seconds, endpoint=endpoint)
+
+def _resident_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def render_metrics() -> str:
+    """Everything recorded in this process, plus its RSS and CPU time, in Prometheus text exposition format.
+    Each gunicorn worker keeps its own numbers; the pid label tells them apart."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    peak_rss = usage.ru_maxrss if os.uname().sysname == "Darwin" else usage.ru_maxrss * 1024
+    pid = (("pid", os.getpid()),)
+    lines = [
+        "# HELP process_resident_memory_bytes Resident memory size in bytes.", "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes{_label_text(pid)} {_resident_bytes()}",
+        "# HELP process_peak_resident_memory_bytes Peak resident memory size in bytes.", "# TYPE process_peak_resident_memory_bytes gauge",
+        f"process_peak_resident_memory_bytes{_label_text(pid)} {peak_rss}",
+        "# HELP process_cpu_seconds_total Total user and system CPU time.", "# TYPE process_cpu_seconds_total counter",
+        f"process_cpu_seconds_total{_label_text(pid)} {usage.ru_utime + usage.ru_stime:.3f}",
+        "# HELP process_start_time_seconds Start time of the process since the epoch.", "# TYPE process_start_time_seconds gauge",
+        f"process_start_time_seconds{_label_text(pid)} {_START_TIME:.3f}",
+        "# HELP resume_analyzer_metrics_enabled Whether stage and request metrics are being recorded.", "# TYPE resume_analyzer_metrics_enabled gauge",
+        f"resume_analyzer_metrics_enabled {int(METRICS_ENABLED)}",
+    ]
+    for metric in (STAGE_SECONDS, REQUEST_SECONDS, REQUESTS, ERRORS, ADMISSION_QUEUED, ADMISSION_RUNNING, ADMISSION_WAIT_SECONDS): lines += metric.render()
+    return "\n".join(lines) + "\n"
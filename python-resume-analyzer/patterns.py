@@ -0,0 +1,66 @@
+# File: python-resume-analyzer/patterns.py
+# Description: Precompiled regular expressions shared by the resume analyzer.
+
+import re
+
+# --- Section headers ---------------------------------------------------------
+# One alternation with a named group per section, tried in this order, so each line costs a single match.
+SECTION_HEADER_ALTERNATIVES = {
+    "summary": r"summary|objective|profile|about\s+me|professional\s+profile",
+    "experience": r"experience|professional\s+experience|work\s+history|employment|career\s+history|relevant\s+experience",
+    "education": r"education|academic\s+background|qualifications|academic\s+profile",
+    "skills": r"skills|technical\s+skills|core\s+competencies|proficiencies|technical\s+expertise|technologies",
+    "projects": r"projects|personal\s+projects|portfolio|key\s+projects|technical\s+projects|selected\s+projects",
+    "awards": r"awards|honors|recognitions|achievements",
+    "publications": r"publications|presentations",
+    "references": r"references",
+    "contact": r"contact|contact\s+information|personal\s+details",
+}
+SECTION_HEADER_RE = re.compile(
+    r"^\s*(?:" + "|".join(f"(?P<{name}>{alternatives})" for name, alternatives in SECTION_HEADER_ALTERNATIVES.items()) + r")\s*[:\-\s]*$",
+    re.IGNORECASE,
+)
+
+def match_section_header(line_stripped: str):
+    """Returns the section name if the (already stripped) line is a section header, else None."""
+    words = line_stripped.split()
+    if len(words) >= 7 or any(char.isdigit() for char in line_stripped): return None
+    match = SECTION_HEADER_RE.match(line_stripped)
+    return match.lastgroup if match else None
+
+# --- Experience ---------------------------------------------------------------
+DATE_RANGE_RE = re.compile(r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Present|Current|To\sDate)[\w\s\.,\-–'’]*\d{4}\b|\b\d{4}\s*-\s*\d{4}\b|\b\d{4}\s*-\s*Present\b", re.IGNORECASE)
+
+QUANTIFIABLE_PATTERNS = {
+    "numbers": r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?%?\b",
+    "magnitudes": r"\b\d+(?:\.\d+)?[KMBkm]\b",
+    "currency": r"[\$€£]\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?",
+    "change_verbs": r"\b(?:increase[sd]?|decrease[sd]?|grew|reduce[sd]?|save[sd]?|improve[sd]?|optimize[sd]?|achieve[sd]?|manage[sd]?|led|generate[sd]?|deliver[sd]?|exceed[ed]*|surpasse[sd]*)\s+(?:by\s+|to\s+|approx\.?\s+)?\d+(?:\.\d+)?%?",
+    "approximations": r"\b(?:over|more\s+than|under|less\s+than|approx(?:imately)?\.?|about|up\s+to|at\s+least)\s+\d+(?:\.\d+)?\b",
+    "unit_counts": r"\b\d+(?:\.\d+)?\s+(?:units|users|clients|projects|dollars|hours|transactions|downloads|features|campaigns|items|records|revenue|percent|points|members|customers|leads|bugs|tickets|deployments|releases)\b",
+}
+QUANTIFIABLE_RES = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in QUANTIFIABLE_PATTERNS.items()}
+DIGIT_RE = re.compile(r"\d") # Every quantifiable category needs at least one digit
+
+def count_quantifiables(text: str) -> dict:
+    """Per-category counts of quantifiable results in text, same as len(re.findall(pattern, text, re.IGNORECASE)) per category.
+
+    Categories overlap ("improved by 20%" is both a change verb and a number), so each keeps its own scan;
+    a single combined alternation would have to re-try every category at each candidate position and was
+    measured no faster. Text without a digit skips all scans.
+    """
+    if not DIGIT_RE.search(text): return dict.fromkeys(QUANTIFIABLE_RES, 0)
+    return {name: len(pattern.findall(text)) for name, pattern in QUANTIFIABLE_RES.items()}
+
+# --- Education ----------------------------------------------------------------
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+DEGREE_KEYWORD_PATTERNS = [r"B\.S\.?", r"M\.S\.?", r"Ph\.D\.?", r"Bachelor(?:'s)?\s*(?:of\s*(?:Science|Arts|Engineering|Technology|Business|Commerce|Applied\sScience))?", r"Master(?:'s)?\s*(?:of\s*(?:Science|Arts|Engineering|Technology|Business|Administration|Applied\sScience))?", r"Associate(?:'s)?", r"Diploma", r"Certificate", r"B\.Tech", r"M\.Tech", r"MBA", r"Doctorate", r"B\.A\.", r"M\.A\."]
+DEGREE_RES = [re.compile(keyword_pattern + r"(?:\s+(?:in|of)\s+[\w\s\(\)&/-]+)?", re.IGNORECASE) for keyword_pattern in DEGREE_KEYWORD_PATTERNS]
+# A single-word match only counts as a degree if it contains one of these
+DEGREE_NAME_KEYWORDS = tuple(kw.lower() for kw in ["Bachelor", "Master", "Associate", "Doctorate", "Diploma", "Certificate", "B.S", "M.S", "Ph.D", "MBA", "B.Tech", "M.Tech"])
+GPA_RE = re.compile(r"(?i)(?:GPA|Grade\s*Point\s*Average|CGPA)\s*[:\s]*\d\.\d+")
+COURSEWORK_HONORS_RE = re.compile(r"(?i)(?:Relevant\s*Coursework|Honors|Dean's\s*List|Cum\s*Laude|Scholarship|Awarded)")
+
+# --- Projects -----------------------------------------------------------------
+PROJECT_TITLE_PIPE_SUFFIX_RE = re.compile(r"\s*\|.*$")
+PROJECT_TITLE_PAREN_SUFFIX_RE = re.compile(r"\s*\(.*$")
@@ -0,0 +1,164 @@
+# File: python-resume-analyzer/pdf_workers.py
+# Description: Long-lived PDF text extraction processes, spawned once per server worker and reused by every upload,
+# so a page that hangs can be stopped (by killing its process) without forking a threaded server per document.
+
+import io
+import mmap
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import wait
+import PyPDF2
+
+PAST_DEADLINE = "text extraction ran past the document's time limit"
+
+def open_document_stream(source):
+    """A seekable binary stream over source. A path is memory-mapped, so the document is read through the page
+    cache instead of being copied onto the worker's heap; streams are returned as they are."""
+    if not isinstance(source, (str, os.PathLike)): return source
+    with open(source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0: return io.BytesIO()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # The mapping stays valid after the file is closed
+
+_reader = None # The document this extraction process was last sent
+
+def open_document(pdf_source):
+    # pdf_source is a path (the process maps the file itself) or the document's bytes
+    global _reader
+    _reader = PyPDF2.PdfReader(open_document_stream(pdf_source) if isinstance(pdf_source, str) else io.BytesIO(pdf_source))
+
+def extract_page(page_num: int) -> str:
+    return _reader.pages[page_num].extract_text() or ""
+
+def _exit_with_parent(parent_pid: int):
+    while os.getppid() == parent_pid: time.sleep(1)
+    os._exit(1)
+
+def _serve(conn, parent_pid: int, extract):
+    # For each (pdf_source, page numbers) received, sends (page_number, text) per page, or (page_number, exception)
+    # and stops; a pdf_source of None means the document it was sent last
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    conn.send("ready")
+    while True:
+        try:
+            pdf_source, page_nums = conn.recv()
+        except EOFError:
+            return
+        page_num = page_nums[0]
+        try:
+            if pdf_source is not None: open_document(pdf_source)
+            for page_num in page_nums: conn.send((page_num, extract(page_num)))
+        except Exception as e:
+            conn.send((page_num, e))
+
+class PdfExtractWorkers:
+    """Extraction processes for one server worker. They are spawned rather than forked (forking a threaded server
+    can deadlock), started on first use and handed back after each document, keeping up to max_idle for the next
+    one. A process whose page overran, or that was still busy when its document's time ran out, is killed instead.
+    extract(page_num) runs in the process after open_document(); it must be importable there."""
+
+    def __init__(self, max_idle: int = 4, extract=extract_page):
+        self.max_idle = max_idle
+        self.extract = extract
+        self._idle = [] # (process, connection)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _checkout(self, n: int) -> list:
+        with self._lock:
+            if self._pid != os.getpid(): self._idle, self._pid = [], os.getpid() # Forked: those processes are the parent's
+            workers, self._idle = self._idle[:n], self._idle[n:]
+        return workers + [self._start() for _ in range(n - len(workers))]
+
+    def prestart(self, n: int):
+        """Starts processes until n are idle (up to max_idle), e.g. before a document's time limit starts counting."""
+        with self._lock:
+            if self._pid != os.getpid(): self._idle, self._pid = [], os.getpid()
+            missing = min(n, self.max_idle) - len(self._idle)
+        for _ in range(missing): self._release(self._start())
+
+    def _start(self) -> tuple:
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        process = context.Process(target=_serve, args=(child_conn, os.getpid(), self.extract), daemon=True)
+        process.start()
+        child_conn.close()
+        conn.recv() # Started and imported, so its start-up does not count against the first page's time
+        return process, conn
+
+    def _release(self, worker: tuple):
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.max_idle and worker[0].is_alive():
+                self._idle.append(worker)
+                return
+        self._kill(worker)
+
+    @staticmethod
+    def _kill(worker: tuple):
+        process, conn = worker
+        process.kill()
+        process.join()
+        conn.close()
+
+    def shutdown(self):
+        with self._lock: workers, self._idle = self._idle, []
+        for worker in workers: self._kill(worker)
+
+    def iter_pages(self, pdf_source, num_pages: int, processes: int, page_timeout: float, deadline: float):
+        """Yields (page_number, text, skip reason) for every page in order; text is None for a skipped page.
+        With one process a page that overruns page_timeout is skipped and a fresh process carries on from the next;
+        with several each takes the next page as it finishes one, and only the document deadline applies."""
+        if processes > 1: return self._iter_pages_parallel(pdf_source, num_pages, processes, deadline)
+        return self._iter_pages_in_order(pdf_source, num_pages, page_timeout, deadline)
+
+    def _iter_pages_in_order(self, pdf_source, num_pages: int, page_timeout: float, deadline: float):
+        page_num = 0
+        while page_num < num_pages:
+            worker, finished = self._checkout(1)[0], False
+            try:
+                worker[1].send((pdf_source, list(range(page_num, num_pages))))
+                while page_num < num_pages:
+                    timeout = min(page_timeout or float("inf"), deadline - time.monotonic() if deadline else float("inf"))
+                    if timeout <= 0 or not worker[1].poll(None if timeout == float("inf") else timeout): break
+                    _, page_text = worker[1].recv()
+                    if isinstance(page_text, Exception): raise page_text
+                    yield page_num, page_text, None
+                    page_num += 1
+                finished = page_num == num_pages
+            finally:
+                if finished: self._release(worker)
+                else: self._kill(worker) # Stuck on a page, or the caller stopped reading
+            if page_num < num_pages and deadline and time.monotonic() >= deadline:
+                for skipped in range(page_num, num_pages): yield skipped, None, PAST_DEADLINE
+                return
+            if page_num < num_pages:
+                yield page_num, None, f"text extraction exceeded {page_timeout}s"
+                page_num += 1
+
+    def _iter_pages_parallel(self, pdf_source, num_pages: int, processes: int, deadline: float):
+        # Each process is sent one page at a time and the next as soon as it answers, so a page that hangs holds up
+        # only its own process
+        workers = self._checkout(min(processes, num_pages))
+        busy, next_page, texts = {}, 0, {} # connection -> page it is working on
+        try:
+            for _, conn in workers:
+                conn.send((pdf_source, [next_page]))
+                busy[conn], next_page = next_page, next_page + 1
+            for page_num in range(num_pages):
+                while page_num not in texts:
+                    ready = wait(list(busy), max(0.0, deadline - time.monotonic()) if deadline else None)
+                    if not ready: break
+                    for conn in ready:
+                        done, page_text = conn.recv()
+                        if isinstance(page_text, Exception): raise page_text
+                        texts[done] = page_text
+                        del busy[conn]
+                        if next_page < num_pages:
+                            conn.send((None, [next_page]))
+                            busy[conn], next_page = next_page, next_page + 1
+                yield (page_num, texts.pop(page_num), None) if page_num in texts else (page_num, None, PAST_DEADLINE)
+        finally:
+            for worker in workers:
+                if worker[1] in busy: self._kill(worker)
+                else: self._release(worker)
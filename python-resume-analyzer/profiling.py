@@ -0,0 +1,184 @@
+# File: python-resume-analyzer/profiling.py
+# Description: Opt-in profiles of single /analyze requests. An admin can ask for a deterministic cProfile capture of
+# one request (X-Profile: 1 with X-Admin-Token), and with PROFILE_SLOW_MS set every request is stack-sampled and kept
+# as a speedscope profile when it turns out slower than that. Captures go to PROFILE_DIR with a summary of the
+# document's size and shape (never its text or filename) and are listed on GET /admin/profiles.
+
+import cProfile
+import hmac
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "resume-analyzer-profiles")
+PROFILE_ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN") # Unset: no header-triggered profiles and no admin routes
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", 0)) # Sample every request, keep those slower than this (0 disables)
+PROFILE_SAMPLE_MS = float(os.environ.get("PROFILE_SAMPLE_MS", 5))
+PROFILE_MAX_CAPTURES = int(os.environ.get("PROFILE_MAX_CAPTURES", 50))
+PROFILE_MAX_BYTES = int(float(os.environ.get("PROFILE_MAX_MB", 100)) * 1024 * 1024)
+
+CAPTURE_ID_RE = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+FORMATS = {"pstats": ".pstats", "speedscope": ".speedscope.json"}
+
+def is_admin(headers) -> bool:
+    token = headers.get("X-Admin-Token")
+    return bool(PROFILE_ADMIN_TOKEN and token) and hmac.compare_digest(token.encode("utf-8"), PROFILE_ADMIN_TOKEN.encode("utf-8"))
+
+class StackSampler:
+    """Samples one thread's Python stack every interval seconds from a background thread. Costs a few percent of
+    the profiled thread's time (the sampler needs the GIL for each sample), so it can run on every request."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id, self.interval = thread_id, interval
+        self.samples = [] # (stack of (name, file, line), root first; seconds it stood for)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            stack = []
+            while frame is not None:
+                stack.append((frame.f_code.co_name, frame.f_code.co_filename, frame.f_code.co_firstlineno))
+                frame = frame.f_back
+            if stack: self.samples.append((tuple(reversed(stack)), now - last))
+            last = now
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def speedscope(self, name: str) -> dict:
+        """The samples in speedscope's file format ("sampled" profile, weights in milliseconds)."""
+        frame_index, frames, samples, weights = {}, [], [], []
+        for stack, seconds in self.samples:
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            samples.append([frame_index[frame] for frame in stack])
+            weights.append(round(seconds * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json", "name": name, "exporter": "resume-analyzer",
+            "shared": {"frames": frames},
+            "profiles": [{"type": "sampled", "name": name, "unit": "milliseconds", "startValue": 0, "endValue": round(sum(weights), 3), "samples": samples, "weights": weights}],
+        }
+
+class RequestProfile:
+    """Profiles the block it wraps, in the calling thread. kind "pstats" (cProfile) always stores its capture;
+    kind "speedscope" (StackSampler) only when the block took at least keep_over_ms. Set .document to the
+    redacted document summary before the block ends; .capture_id is set once a capture is stored."""
+
+    def __init__(self, kind: str, endpoint: str, keep_over_ms: float = 0):
+        self.kind, self.endpoint, self.keep_over_ms = kind, endpoint, keep_over_ms
+        self.document, self.capture_id = {}, None
+
+    def __enter__(self):
+        if self.kind == "pstats":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_MS / 1000)
+            self._profiler.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if self.kind == "pstats": self._profiler.disable()
+        else: self._profiler.stop()
+        if self.kind == "pstats" or elapsed_ms >= self.keep_over_ms:
+            try:
+                self.capture_id = store_capture(self, elapsed_ms, failed=exc_type is not None)
+            except OSError as e:
+                print(f"PYTHON_ERROR: Could not store profile: {e}")
+        return False
+
+class _NoProfile:
+    document, capture_id = {}, None
+    def __enter__(self): return self
+    def __exit__(self, exc_type, exc, tb): return False
+
+def request_profile(headers, endpoint: str):
+    """A RequestProfile for this request: cProfile when an admin sent X-Profile: 1, stack sampling when
+    PROFILE_SLOW_MS is set, otherwise one that does nothing."""
+    if headers.get("X-Profile") == "1" and is_admin(headers): return RequestProfile("pstats", endpoint)
+    if PROFILE_SLOW_MS > 0: return RequestProfile("speedscope", endpoint, keep_over_ms=PROFILE_SLOW_MS)
+    return _NoProfile()
+
+def document_summary(kind: str, size: int, result: dict) -> dict:
+    """What a capture records about the document: its type, byte size and the numbers of the analysis's feature
+    record (word count, roles, bullets, section flags, ...), so slow shapes can be recognized without the text."""
+    features = {name: value for name, value in (result.get("features") or {}).items() if name != "version"}
+    return {"kind": kind, "bytes": size, "partial": bool(result.get("partial")), "error": "error" in result, **features}
+
+def _capture_files(capture_id: str) -> list:
+    return [os.path.join(PROFILE_DIR, capture_id + suffix) for suffix in (*FORMATS.values(), ".json")]
+
+def store_capture(profile: RequestProfile, elapsed_ms: float, failed: bool = False) -> str:
+    """Writes the profile and its summary (<id>.json, written last, so listed captures are complete), then applies retention."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    capture_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    data_path = os.path.join(PROFILE_DIR, capture_id + FORMATS[profile.kind])
+    tmp_path = f"{data_path}.tmp"
+    if profile.kind == "pstats":
+        profile._profiler.dump_stats(tmp_path)
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f: json.dump(profile._profiler.speedscope(f"{profile.endpoint} {elapsed_ms:.0f} ms"), f)
+    os.replace(tmp_path, data_path)
+    summary = {
+        "id": capture_id, "createdAt": time.time(), "endpoint": profile.endpoint, "format": profile.kind,
+        "trigger": "admin" if profile.kind == "pstats" else "slow", "durationMs": round(elapsed_ms, 1), "failed": failed,
+        "bytes": os.path.getsize(data_path), "document": profile.document, "pid": os.getpid(),
+    }
+    with open(os.path.join(PROFILE_DIR, f"{capture_id}.json.tmp"), "w", encoding="utf-8") as f: json.dump(summary, f)
+    os.replace(os.path.join(PROFILE_DIR, f"{capture_id}.json.tmp"), os.path.join(PROFILE_DIR, f"{capture_id}.json"))
+    print(f"PYTHON_LOG: Stored {profile.kind} profile {capture_id} of a {elapsed_ms:.0f} ms {profile.endpoint} request.")
+    enforce_retention()
+    return capture_id
+
+def list_captures() -> list:
+    """Summaries of the stored captures, newest first."""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    captures = []
+    for name in names:
+        if not name.endswith(".json") or name.endswith(".speedscope.json") or not CAPTURE_ID_RE.match(name[:-5]): continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f: captures.append(json.load(f))
+        except (OSError, ValueError):
+            continue # Removed by another worker's retention pass
+    return sorted(captures, key=lambda capture: capture["id"], reverse=True)
+
+def capture_file(capture_id: str):
+    """(path, format) of a stored capture's profile, or None."""
+    if not CAPTURE_ID_RE.match(capture_id): return None
+    for kind, suffix in FORMATS.items():
+        path = os.path.join(PROFILE_DIR, capture_id + suffix)
+        if os.path.exists(path): return path, kind
+    return None
+
+def enforce_retention():
+    """Deletes the oldest captures beyond PROFILE_MAX_CAPTURES or PROFILE_MAX_MB in total. Every worker runs this
+    after it stores a capture; files another worker already removed are skipped."""
+    captures, total_bytes = list_captures(), 0
+    for i, capture in enumerate(captures):
+        total_bytes += capture["bytes"]
+        if i == 0 or (i < PROFILE_MAX_CAPTURES and total_bytes <= PROFILE_MAX_BYTES): continue # The newest always stays
+        for path in _capture_files(capture["id"]):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,69 @@
+# File: python-resume-analyzer/response_format.py
+# Description: Trimmed analysis responses (?compact=1 / ?fields=...) and an orjson-backed JSON provider for Flask.
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError: # Optional; the stdlib encoder is used without it
+    orjson = None
+
+# What ?compact=1 returns: the scores, keyword lists and suggestions, without the per-section breakdown
+COMPACT_FIELDS = ("score", "contentQuality", "atsCompatibility", "keywordOptimization", "keywords", "suggestions")
+
+def requested_fields(args):
+    """The dotted field paths asked for by ?fields=a,b.c or ?compact=1, or None for the full response."""
+    if args.get('fields'): return tuple(path.strip() for path in args['fields'].split(',') if path.strip())
+    if args.get('compact') == '1': return COMPACT_FIELDS
+    return None
+
+def _field_tree(paths) -> dict:
+    # {"sections": {"experience": {"parsed_roles": {"title_guess": None}}}}; None selects the whole value.
+    tree = {}
+    for path in sorted(paths, key=lambda path: path.count('.')): # Shorter paths first, so "sections" wins over "sections.skills"
+        node, parts = tree, path.split('.')
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is None: break
+        else:
+            node[parts[-1]] = None
+    return tree
+
+def _without_role_text(value):
+    if isinstance(value, list): return [_without_role_text(v) for v in value]
+    if isinstance(value, dict): return {k: _without_role_text(v) for k, v in value.items() if k != "role_text"}
+    return value
+
+def _select(value, tree):
+    if tree is None: return _without_role_text(value)
+    if isinstance(value, list): return [_select(v, tree) for v in value]
+    if not isinstance(value, dict): return value
+    return {k: _select(value[k], subtree) for k, subtree in tree.items() if k in value}
+
+def select_fields(result: dict, fields) -> dict:
+    """Only the given dotted paths of an analysis result, e.g. ("score", "sections.experience.parsed_roles.title_guess");
+    a path through a list applies to each element and unknown paths are ignored. Roles are sent as role_offsets
+    into the extracted text rather than as role_text, unless a path names role_text itself. Errors pass through."""
+    if fields is None or not isinstance(result, dict) or "error" in result: return result
+    return _select(result, _field_tree(fields))
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with orjson doing the encoding and decoding when it is installed. Output keeps
+    Flask's sorted keys; indented debug output and calls with extra json.dumps arguments use the stdlib encoder."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs: return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs: return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def _orjson_dumps(self, obj, option: int = 0) -> bytes:
+        if self.sort_keys: option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug): return super().response(*args, **kwargs)
+        # Bytes straight into the response, skipping the str round trip
+        return self._app.response_class(self._orjson_dumps(self._prepare_response_obj(args, kwargs), orjson.OPT_APPEND_NEWLINE), mimetype=self.mimetype)
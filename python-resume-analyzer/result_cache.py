@@ -0,0 +1,169 @@
+# File: python-resume-analyzer/result_cache.py
+# Description: Content-addressed cache for analysis results (in-memory LRU tier + optional shared SQLite tier).
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def cache_key(data: bytes, analyzer_version: str) -> str:
+    """Key for an uploaded document: SHA-256 of its bytes plus the analyzer/model version that produced the result."""
+    return digest_cache_key(hashlib.sha256(data).hexdigest(), analyzer_version)
+
+def digest_cache_key(sha256_hex: str, analyzer_version: str) -> str:
+    """cache_key() for a document whose SHA-256 was computed while it was streamed in."""
+    return f"{analyzer_version}:{sha256_hex}"
+
+class ResultCache:
+    """Two-tier result cache.
+
+    The memory tier is a per-process LRU bounded by max_entries and max_bytes (of stored JSON). The optional disk
+    tier is a SQLite file (db_path) that every gunicorn worker on the host opens, bounded by db_max_entries and
+    db_max_bytes; its entry and byte totals are kept in a one-row table updated in the same transaction as the
+    entries, so a store never has to count the table. The oldest entries are evicted first. Entries in both tiers
+    expire after ttl_seconds. Values are stored as JSON text, so every hit returns a fresh dict.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 86400, db_path: str = None, db_max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024, db_max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self.db_max_bytes = db_max_bytes
+        self._memory = OrderedDict() # key -> (stored_at, json_text)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+        if self.db_path:
+            with contextlib.closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+            with self._transaction() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)")
+                conn.execute("CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at)")
+                conn.execute("CREATE TABLE IF NOT EXISTS results_size (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)")
+                # Counted once, when the file is first opened by this version
+                conn.execute("INSERT OR IGNORE INTO results_size SELECT 0, COUNT(*), COALESCE(SUM(length(value)), 0) FROM results")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # One short-lived connection per call keeps this safe across threads and forked workers. BEGIN IMMEDIATE
+        # takes the write lock up front, so the size row cannot drift between workers.
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _delete_rows(conn, where: str, params: tuple) -> int:
+        # Deletes the matching rows (found through an index) and takes them off the size row; returns how many
+        entries, size = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(length(value)), 0) FROM results WHERE {where}", params).fetchone()
+        if entries:
+            conn.execute(f"DELETE FROM results WHERE {where}", params)
+            conn.execute("UPDATE results_size SET entries = entries - ?, bytes = bytes - ? WHERE id = 0", (entries, size))
+        return entries
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock: self._counters[name] += n
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return json.loads(entry[1])
+                del self._memory[key]
+                self._memory_bytes -= len(entry[1])
+                self._counters["expired"] += 1
+        if self.db_path:
+            try:
+                with contextlib.closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+                    row = conn.execute("SELECT stored_at, value FROM results WHERE key = ?", (key,)).fetchone()
+                if row and now - row[0] > self.ttl_seconds:
+                    with self._transaction() as conn: self._delete_rows(conn, "key = ? AND stored_at = ?", (key, row[0]))
+                    self._count("expired")
+                    row = None
+            except sqlite3.Error as e:
+                print(f"PYTHON_ERROR: Result cache disk lookup failed: {e}")
+                row = None
+            if row:
+                self._remember(key, row[0], row[1])
+                self._count("disk_hits")
+                return json.loads(row[1])
+        self._count("misses")
+        return None
+
+    def _remember(self, key: str, stored_at: float, value: str):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None: self._memory_bytes -= len(previous[1])
+            self._memory[key] = (stored_at, value)
+            self._memory_bytes += len(value)
+            while len(self._memory) > self.max_entries or (self.max_bytes and self._memory_bytes > self.max_bytes):
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self._counters["evictions"] += 1
+
+    def set(self, key: str, result: dict):
+        stored_at, value = time.time(), json.dumps(result)
+        self._remember(key, stored_at, value)
+        self._count("stores")
+        if self.db_path:
+            try:
+                with self._transaction() as conn:
+                    self._delete_rows(conn, "key = ?", (key,))
+                    conn.execute("INSERT INTO results (key, stored_at, value) VALUES (?, ?, ?)", (key, stored_at, value))
+                    conn.execute("UPDATE results_size SET entries = entries + 1, bytes = bytes + ? WHERE id = 0", (len(value),))
+                    self._count("expired", self._delete_rows(conn, "stored_at < ?", (stored_at - self.ttl_seconds,)))
+                    self._count("evictions", self._evict_disk(conn))
+            except sqlite3.Error as e:
+                print(f"PYTHON_ERROR: Result cache disk store failed: {e}")
+
+    def _evict_disk(self, conn) -> int:
+        # Oldest first, a few rows at a time through the stored_at index, until both limits hold again
+        evicted = 0
+        entries, size = conn.execute("SELECT entries, bytes FROM results_size WHERE id = 0").fetchone()
+        while entries > self.db_max_entries or (self.db_max_bytes and size > self.db_max_bytes):
+            oldest = conn.execute("SELECT key, length(value) FROM results ORDER BY stored_at LIMIT ?", (max(1, min(entries - self.db_max_entries, 256)),)).fetchall()
+            if not oldest: break
+            for key, length in oldest:
+                if entries <= self.db_max_entries and not (self.db_max_bytes and size > self.db_max_bytes): break
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                conn.execute("UPDATE results_size SET entries = entries - 1, bytes = bytes - ? WHERE id = 0", (length,))
+                entries, size, evicted = entries - 1, size - length, evicted + 1
+        return evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters, memory_entries=len(self._memory), memory_bytes=self._memory_bytes, max_entries=self.max_entries, ttl_seconds=self.ttl_seconds)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / (hits + stats["misses"]), 4) if hits + stats["misses"] else 0.0
+        stats["disk_tier"] = bool(self.db_path)
+        return stats
+
+def result_cache_from_env(prefix: str = "RESULT_CACHE", default_size: int = 256):
+    """Builds a cache from <prefix>_* environment variables (ENABLED, SIZE, MAX_MB, TTL, DB, DB_MAX_ENTRIES, DB_MAX_MB);
+    returns None when <prefix>_ENABLED=0. A MAX_MB of 0 leaves that tier bounded by entry count only."""
+    if os.environ.get(f"{prefix}_ENABLED", "1") == "0": return None
+    return ResultCache(
+        max_entries=int(os.environ.get(f"{prefix}_SIZE", default_size)),
+        ttl_seconds=float(os.environ.get(f"{prefix}_TTL", 86400)),
+        db_path=os.environ.get(f"{prefix}_DB") or None,
+        db_max_entries=int(os.environ.get(f"{prefix}_DB_MAX_ENTRIES", 10000)),
+        max_bytes=int(float(os.environ.get(f"{prefix}_MAX_MB", 64)) * 1024 * 1024),
+        db_max_bytes=int(float(os.environ.get(f"{prefix}_DB_MAX_MB", 512)) * 1024 * 1024),
+    )
@@ -1,146 +1,491 @@
 # File: python-resume-analyzer/resume_analyzer.py
 # Description: Core logic for PDF parsing and resume analysis with spaCy integration.
 
+import io
+import math
+import mmap
+import multiprocessing
+import os
 import re
+import signal
+import threading
+import time
+import zipfile
 import PyPDF2 
 import spacy
-from collections import Counter
-
-# Load the spaCy English model
+from spacy.tokens import Doc, Span
+from collections import Counter, OrderedDict
 try:
-    nlp = spacy.load("en_core_web_sm")
-    print("PYTHON_LOG: spaCy en_core_web_sm model loaded successfully.")
-except OSError:
-    print("PYTHON_ERROR: spaCy 'en_core_web_sm' model not found. Please run:")
-    print("PYTHON_ERROR: pip install spacy")
-    print("PYTHON_ERROR: python -m spacy download en_core_web_sm")
-    print("PYTHON_ERROR: spaCy features will be limited.")
-    nlp = None 
-
-def extract_text_from_pdf(pdf_file_stream):
-    text = ""
+    import docx # python-docx, for .docx uploads
+    from docx.table import Table as DocxTable
+    from docx.text.paragraph import Paragraph as DocxParagraph
+except ImportError:
+    docx = None
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pdf_workers import PAST_DEADLINE, PdfExtractWorkers, open_document_stream
+from skill_matcher import SkillMatcher, SkillTaxonomy, generate_skill_patterns
+from scoring import SECTIONS, extract_features, load_weights, score_features
+from metrics import timed, count_error, size_class, token_class
+from patterns import (
+    match_section_header, count_quantifiables, DATE_RANGE_RE, YEAR_RE, DEGREE_RES, DEGREE_NAME_KEYWORDS,
+    GPA_RE, COURSEWORK_HONORS_RE, PROJECT_TITLE_PIPE_SUFFIX_RE, PROJECT_TITLE_PAREN_SUFFIX_RE,
+)
+
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
+SPACY_PROFILE = os.environ.get("SPACY_PROFILE", "full")
+
+# The analyzer only needs POS + lemma (tok2vec, tagger, attribute_ruler, lemmatizer), NER (ORG/DATE) and sentence
+# boundaries. "full" gets boundaries from the dependency parser, as before; "fast" drops the parser and uses the
+# much cheaper senter instead (boundaries can differ slightly, so summary sentence counts may too).
+PIPELINE_PROFILES = {
+    "full": {"exclude": ["senter", "textcat", "entity_linker", "trainable_lemmatizer"], "enable": []},
+    "fast": {"exclude": ["parser", "textcat", "entity_linker", "trainable_lemmatizer"], "enable": ["senter"]},
+}
+
+nlp = None # Loaded on first use by get_nlp(); call preload_nlp() to load up front (e.g. in the gunicorn master with --preload)
+_nlp_load_attempted = False
+_nlp_lock = threading.Lock()
+
+def load_nlp(model: str = None, profile: str = None):
+    """Loads a spaCy pipeline trimmed to the given profile. Returns None if the model is not installed."""
+    model = model or SPACY_MODEL
+    profile = profile or SPACY_PROFILE
+    if profile not in PIPELINE_PROFILES:
+        print(f"PYTHON_ERROR: Unknown spaCy profile '{profile}', using 'full'.")
+        profile = "full"
     try:
-        reader = PyPDF2.PdfReader(pdf_file_stream) 
-        num_pages = len(reader.pages)
-        if num_pages == 0:
-            print("PYTHON_LOG: Warning - PDF has no pages or PyPDF2 could not detect them.")
-            return "" 
-        for page_num in range(num_pages):
-            page = reader.pages[page_num]
-            page_text = page.extract_text()
+        loaded = spacy.load(model, exclude=PIPELINE_PROFILES[profile]["exclude"])
+    except OSError:
+        print(f"PYTHON_ERROR: spaCy '{model}' model not found. Please run:")
+        print("PYTHON_ERROR: pip install spacy")
+        print(f"PYTHON_ERROR: python -m spacy download {model}")
+        print("PYTHON_ERROR: spaCy features will be limited.")
+        return None
+    for name in PIPELINE_PROFILES[profile]["enable"]:
+        if name in loaded.disabled: loaded.enable_pipe(name)
+    if not any(name in loaded.pipe_names for name in ("parser", "senter")):
+        loaded.add_pipe("sentencizer") # The model has no trained sentence boundaries; fall back to punctuation rules
+    loaded.meta["profile"] = profile
+    print(f"PYTHON_LOG: spaCy {model} model loaded successfully (profile '{profile}': {', '.join(loaded.pipe_names)}).")
+    return loaded
+
+def get_nlp():
+    """Returns the process-wide spaCy pipeline, loading it on first call (None if it could not be loaded)."""
+    global nlp, _nlp_load_attempted
+    if not _nlp_load_attempted:
+        with _nlp_lock:
+            if not _nlp_load_attempted:
+                nlp = load_nlp()
+                _nlp_load_attempted = True
+    return nlp
+
+def preload_nlp():
+    """Loads the pipeline and compiles the shared skill matcher now instead of on the first request."""
+    if get_nlp(): get_skill_matcher(COMMON_SKILLS)
+
+# Skills, aliases ("K8s" -> Kubernetes) and categories come from skill_taxonomy.json, or the file at SKILL_TAXONOMY_PATH
+SKILL_TAXONOMY = SkillTaxonomy.load()
+COMMON_SKILLS = SKILL_TAXONOMY.skills # Canonical names in file order; the first 50 are the ones suggested as missing
+
+# Score weights: scoring.DEFAULT_WEIGHTS, or the JSON config at SCORING_WEIGHTS_PATH
+SCORING_WEIGHTS = load_weights()
+
+_skill_matchers = {} # tuple(skill_list) -> SkillMatcher, built once per worker process
+
+BULLET_POINT_STARTS = ('-', '*', '•', '➢', '‣', '◦')
+
+class TimeBudget:
+    """Time limit for one analysis, checked between stages and between experience roles (a stage that has started
+    runs to completion). Stages left out, or cut short, once it has run out are listed in skipped."""
+
+    def __init__(self, seconds: float):
+        self.deadline = time.perf_counter() + seconds
+        self.skipped = []
+
+    def exhausted(self, stage: str) -> bool:
+        """True, recording stage as skipped, if the budget has run out."""
+        if time.perf_counter() < self.deadline: return False
+        self.skip(stage)
+        return True
+
+    def skip(self, stage: str):
+        if stage not in self.skipped: self.skipped.append(stage)
+
+def out_of_time(budget, stage: str) -> bool:
+    return budget is not None and budget.exhausted(stage)
+
+def with_partial(analysis: dict, budget) -> dict:
+    """Marks an analysis cut short by its budget: "partial": true and the skipped stages in "skippedStages"."""
+    if budget is None or not budget.skipped: return analysis
+    return dict(analysis, partial=True, skippedStages=list(budget.skipped))
+
+ANALYZER_VERSION = "7" # Bump whenever analysis output changes so cached results from older code are not reused
+
+_analyzer_versions = {} # id(nlp) -> version string; nlp.meta rebuilds the whole meta dict on every access
+
+def analyzer_version() -> str:
+    nlp = get_nlp()
+    version = _analyzer_versions.get(id(nlp))
+    if version is None:
+        model = f"{nlp.meta['lang']}_{nlp.meta['name']}-{nlp.meta['version']}/{nlp.meta['profile']}" if nlp else "no-model"
+        version = _analyzer_versions[id(nlp)] = f"{ANALYZER_VERSION}/{model}"
+    return version
+
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", 16)) # Page count at which extraction moves to a process pool
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_PAGE_TIMEOUT = float(os.environ.get("PDF_PAGE_TIMEOUT", 10)) # Seconds; a page that takes longer is skipped (0 disables)
+PDF_EXTRACT_TIMEOUT = float(os.environ.get("PDF_EXTRACT_TIMEOUT", 30)) # Seconds for a whole document; later pages are skipped (0 disables)
+MAX_DOCUMENT_PAGES = int(os.environ.get("MAX_DOCUMENT_PAGES", 50)) # Longer documents are refused before any text is extracted (0 disables)
+DOCX_MAX_XML_BYTES = int(os.environ.get("DOCX_MAX_XML_BYTES", 8 * 1024 * 1024)) # Uncompressed size cap for a DOCX's XML parts
+
+class PageTimeout(Exception):
+    pass
+
+class DocumentTooLarge(ValueError):
+    """The document is over a page or size limit; raised before its text is extracted."""
+
+# Extraction processes for capped extraction off the main thread and for long PDFs; spawned on first use, then reused
+pdf_extract_workers = PdfExtractWorkers(max_idle=PDF_EXTRACT_WORKERS)
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeout()
+
+def _extract_page_with_timeout(page, page_timeout: float) -> str:
+    # SIGALRM can only interrupt the main thread; iter_pdf_pages() extracts in a subprocess everywhere else.
+    if not page_timeout: return page.extract_text() or ""
+    previous_handler = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, page_timeout)
+    try:
+        return page.extract_text() or ""
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+def _skip_pages(first_page: int, end_page: int, reason: str):
+    for page_num in range(first_page, end_page):
+        print(f"PYTHON_LOG: Warning - Skipped page {page_num + 1}; {reason}.")
+        yield page_num, None
+
+def iter_pdf_pages(pdf_source, parallel_min_pages: int = None, max_workers: int = None, page_timeout: float = None, max_pages: int = None, extract_timeout: float = None):
+    """Yields (page_number, text) for every page in order, as soon as each page is ready.
+    pdf_source is a binary stream or a path (read through mmap). A document with more than max_pages pages raises
+    DocumentTooLarge before any page is extracted. Documents with at least parallel_min_pages pages are shared out
+    among max_workers of pdf_extract_workers' processes. A page that takes longer than page_timeout seconds is
+    skipped (yielded with text None) instead of stalling the worker, and once extract_timeout seconds have passed
+    for the whole document the pages not yet extracted are skipped too. Off the main thread (e.g. under gunicorn's
+    gthread workers) a capped extraction runs in one of those processes, which is killed when a page overruns."""
+    parallel_min_pages = PDF_PARALLEL_MIN_PAGES if parallel_min_pages is None else parallel_min_pages
+    max_workers = PDF_EXTRACT_WORKERS if max_workers is None else max_workers
+    page_timeout = PDF_PAGE_TIMEOUT if page_timeout is None else page_timeout
+    max_pages = MAX_DOCUMENT_PAGES if max_pages is None else max_pages
+    extract_timeout = PDF_EXTRACT_TIMEOUT if extract_timeout is None else extract_timeout
+    pdf_file_stream = open_document_stream(pdf_source)
+    try:
+        yield from _iter_pdf_pages(pdf_source, pdf_file_stream, parallel_min_pages, max_workers, page_timeout, max_pages, extract_timeout)
+    finally:
+        if isinstance(pdf_file_stream, mmap.mmap): pdf_file_stream.close()
+
+def _iter_pdf_pages(pdf_source, pdf_file_stream, parallel_min_pages: int, max_workers: int, page_timeout: float, max_pages: int, extract_timeout: float):
+    deadline = time.monotonic() + extract_timeout if extract_timeout else None
+    reader = PyPDF2.PdfReader(pdf_file_stream)
+    num_pages = len(reader.pages)
+    if max_pages and num_pages > max_pages:
+        raise DocumentTooLarge(f"The PDF has {num_pages} pages; at most {max_pages} can be analyzed.")
+    parallel = max_workers > 1 and num_pages >= parallel_min_pages
+    in_subprocess = (page_timeout or deadline) and threading.current_thread() is not threading.main_thread()
+    if parallel or in_subprocess:
+        if isinstance(pdf_source, (str, os.PathLike)):
+            worker_source = os.fspath(pdf_source)
+        else:
+            pdf_file_stream.seek(0)
+            worker_source = pdf_file_stream.read()
+        processes = min(max_workers, num_pages) if parallel else 1
+        started = time.monotonic()
+        pdf_extract_workers.prestart(processes) # Only slow on first use; that start-up is not the document's fault
+        if deadline: deadline += time.monotonic() - started
+        # Pages that run concurrently have their caps folded into one deadline for the document: as long as every
+        # process's share of pages would take if each page ran to page_timeout, and no later than extract_timeout
+        if parallel and page_timeout:
+            pages_deadline = time.monotonic() + page_timeout * math.ceil(num_pages / processes)
+            deadline = min(deadline, pages_deadline) if deadline else pages_deadline
+        for page_num, page_text, skip_reason in pdf_extract_workers.iter_pages(worker_source, num_pages, processes, page_timeout, deadline):
+            if page_text is None: yield from _skip_pages(page_num, page_num + 1, skip_reason)
+            else: yield page_num, page_text
+        return
+    for page_num in range(num_pages):
+        remaining = deadline - time.monotonic() if deadline else 0
+        if deadline and remaining <= 0:
+            yield from _skip_pages(page_num, num_pages, PAST_DEADLINE)
+            return
+        try:
+            yield page_num, _extract_page_with_timeout(reader.pages[page_num], min(page_timeout, remaining) if page_timeout and remaining else page_timeout or remaining)
+        except PageTimeout:
+            yield from _skip_pages(page_num, page_num + 1, PAST_DEADLINE if deadline and time.monotonic() >= deadline else f"text extraction exceeded {page_timeout}s")
+
+def extract_text_from_pdf(pdf_source, strict: bool = False, **extract_options):
+    """Text of a PDF given as a binary stream or a path. Raises DocumentTooLarge; other read errors give "" (or,
+    with strict=True, are raised too, e.g. for callers that report why a file failed)."""
+    with timed("pdf_extract") as span:
+        text = _extract_text_from_pdf(pdf_source, strict, **extract_options)
+        span.set(size=size_class(len(text)))
+    return text
+
+def _extract_text_from_pdf(pdf_source, strict: bool, **extract_options):
+    page_texts = []
+    num_pages = 0
+    try:
+        for page_num, page_text in iter_pdf_pages(pdf_source, **extract_options):
+            num_pages += 1
             if page_text:
-                text += page_text
-            else:
+                page_texts.append(page_text)
+            elif page_text is not None:
                 print(f"PYTHON_LOG: Warning - No text extracted from page {page_num + 1}. This page might be image-based or empty.")
+        if num_pages == 0:
+            print("PYTHON_LOG: Warning - PDF has no pages or PyPDF2 could not detect them.")
+            return ""
+        text = "".join(page_texts)
         if not text.strip():
             print("PYTHON_LOG: Warning - Extracted text is empty after processing all pages.")
         return text
+    except DocumentTooLarge:
+        raise
     except Exception as e:
         print(f"PYTHON_ERROR: ERROR during PDF text extraction with PyPDF2: {e}")
+        count_error("pdf_extract", type(e).__name__)
+        if strict: raise
         return ""
 
-def identify_sections(text: str) -> dict:
+def extract_text_from_docx(docx_source, max_pages: int = None, strict: bool = False) -> str:
+    """Text of a DOCX given as a seekable binary stream or a path: paragraphs and table cells in document order.
+    Raises DocumentTooLarge; other read errors (or python-docx not being installed) give "", unless strict=True."""
+    with timed("docx_extract") as span:
+        text = _extract_text_from_docx(docx_source, MAX_DOCUMENT_PAGES if max_pages is None else max_pages, strict)
+        span.set(size=size_class(len(text)))
+    return text
+
+def _check_docx_limits(archive: zipfile.ZipFile, max_pages: int):
+    # A DOCX is a zip; the XML is inflated and parsed into an lxml tree, so cap its uncompressed size first.
+    xml_bytes = sum(info.file_size for info in archive.infolist() if info.filename.endswith(".xml"))
+    if xml_bytes > DOCX_MAX_XML_BYTES:
+        raise DocumentTooLarge(f"The DOCX expands to {xml_bytes // 1024} KB of XML; at most {DOCX_MAX_XML_BYTES // 1024} KB can be analyzed.")
+    # Word records the page count of the last save in docProps/app.xml; documents without it are only size-capped.
+    try:
+        if not max_pages or archive.getinfo("docProps/app.xml").file_size > 64 * 1024: return
+        pages = re.search(rb"<Pages>(\d+)</Pages>", archive.read("docProps/app.xml"))
+    except KeyError:
+        return
+    if pages and int(pages.group(1)) > max_pages:
+        raise DocumentTooLarge(f"The DOCX has {int(pages.group(1))} pages; at most {max_pages} can be analyzed.")
+
+def _extract_text_from_docx(docx_source, max_pages: int, strict: bool) -> str:
+    if docx is None:
+        print("PYTHON_ERROR: python-docx is not installed; DOCX text extraction is unavailable.")
+        if strict: raise ImportError("python-docx is not installed")
+        return ""
+    # zipfile reads members straight from a path or stream as they are needed, so no mapping is needed here
+    try:
+        if hasattr(docx_source, "seek"): docx_source.seek(0)
+        with zipfile.ZipFile(docx_source) as archive: _check_docx_limits(archive, max_pages)
+        if hasattr(docx_source, "seek"): docx_source.seek(0)
+        document = docx.Document(docx_source)
+        lines = []
+        for block in document.element.body.iterchildren():
+            if block.tag.endswith("}p"):
+                lines.append(DocxParagraph(block, document).text)
+            elif block.tag.endswith("}tbl"):
+                for row in DocxTable(block, document).rows:
+                    cells = []
+                    for cell in row.cells: # Merged cells come back once per grid column
+                        if not cells or cell.text != cells[-1]: cells.append(cell.text)
+                    lines.extend(cells)
+        text = "\n".join(lines)
+        if not text.strip():
+            print("PYTHON_LOG: Warning - Extracted text is empty after reading the DOCX.")
+        return text
+    except DocumentTooLarge:
+        raise
+    except Exception as e:
+        print(f"PYTHON_ERROR: ERROR during DOCX text extraction with python-docx: {e}")
+        count_error("docx_extract", type(e).__name__)
+        if strict: raise
+        return ""
+
+def extract_document_text(source, kind: str = "pdf") -> str:
+    """Text of an uploaded document of the given kind ("pdf" or "docx"), from a binary stream or a path."""
+    return extract_text_from_docx(source) if kind == "docx" else extract_text_from_pdf(source)
+
+def _strip_offsets(text: str, start: int, end: int) -> tuple:
+    while start < end and text[start].isspace(): start += 1
+    while end > start and text[end - 1].isspace(): end -= 1
+    return (start, end)
+
+def identify_section_spans(text: str) -> dict:
+    """Splits the resume into named sections, returning (start, end) character offsets into text for each one."""
     sections = {}
-    section_patterns = {
-        "summary": r"(?i)^\s*(summary|objective|profile|about\s+me|professional\s+profile)\s*[:\-\s]*$",
-        "experience": r"(?i)^\s*(experience|professional\s+experience|work\s+history|employment|career\s+history|relevant\s+experience)\s*[:\-\s]*$",
-        "education": r"(?i)^\s*(education|academic\s+background|qualifications|academic\s+profile)\s*[:\-\s]*$",
-        "skills": r"(?i)^\s*(skills|technical\s+skills|core\s+competencies|proficiencies|technical\s+expertise|technologies)\s*[:\-\s]*$",
-        "projects": r"(?i)^\s*(projects|personal\s+projects|portfolio|key\s+projects|technical\s+projects|selected\s+projects)\s*[:\-\s]*$",
-        "awards": r"(?i)^\s*(awards|honors|recognitions|achievements)\s*[:\-\s]*$",
-        "publications": r"(?i)^\s*(publications|presentations)\s*[:\-\s]*$",
-        "references": r"(?i)^\s*(references)\s*[:\-\s]*$",
-        "contact": r"(?i)^\s*(contact|contact\s+information|personal\s+details)\s*[:\-\s]*$"
-    }
-    lines = text.splitlines()
     current_section_name = None
-    current_section_content = []
-    header_content = []
+    current_section_start, current_section_end = None, None # Offsets of the first/last content line of the open section
+    header_end = None
     first_section_found = False
-    for line in lines:
+    offset = 0
+    for line_with_ending in text.splitlines(keepends=True):
+        line = line_with_ending.splitlines()[0]
+        line_start, line_end = offset, offset + len(line)
+        offset += len(line_with_ending)
         line_stripped = line.strip()
         if not line_stripped: 
-            if current_section_name: current_section_content.append(line)
-            elif not first_section_found: header_content.append(line)
+            if current_section_name:
+                if current_section_start is None: current_section_start = line_start
+                current_section_end = line_end
+            elif not first_section_found: header_end = line_end
             continue
-        matched_section_this_line = False
-        for section_name, pattern in section_patterns.items():
-            match = re.match(pattern, line_stripped)
-            if match and len(line_stripped.split()) < 7 and not any(char.isdigit() for char in line_stripped) : 
-                first_section_found = True
-                if current_section_name and current_section_content: 
-                    sections[current_section_name] = "\n".join(current_section_content).strip()
-                current_section_name = section_name
-                current_section_content = [] 
-                matched_section_this_line = True
-                break 
-        if not matched_section_this_line:
-            if current_section_name: current_section_content.append(line)
-            elif not first_section_found: header_content.append(line)
-    if current_section_name and current_section_content:
-        sections[current_section_name] = "\n".join(current_section_content).strip()
-    if header_content and not sections.get("summary") and not sections.get("contact"):
-        potential_preamble = "\n".join(header_content).strip()
-        if 5 < len(potential_preamble.split()) < 150 : 
-            if "summary" not in sections: sections["summary_implicit"] = potential_preamble 
-            elif "contact" not in sections: sections["contact_implicit"] = potential_preamble
+        section_name = match_section_header(line_stripped)
+        if section_name:
+            first_section_found = True
+            if current_section_name and current_section_start is not None: 
+                sections[current_section_name] = _strip_offsets(text, current_section_start, current_section_end)
+            current_section_name = section_name
+            current_section_start, current_section_end = None, None
+        else:
+            if current_section_name:
+                if current_section_start is None: current_section_start = line_start
+                current_section_end = line_end
+            elif not first_section_found: header_end = line_end
+    if current_section_name and current_section_start is not None:
+        sections[current_section_name] = _strip_offsets(text, current_section_start, current_section_end)
+    has_content = lambda name: name in sections and sections[name][1] > sections[name][0]
+    if header_end is not None and not has_content("summary") and not has_content("contact"):
+        preamble_start, preamble_end = _strip_offsets(text, 0, header_end)
+        if 5 < len(text[preamble_start:preamble_end].split()) < 150 : 
+            if "summary" not in sections: sections["summary_implicit"] = (preamble_start, preamble_end)
+            elif "contact" not in sections: sections["contact_implicit"] = (preamble_start, preamble_end)
     if not sections: 
-        sections["general_content"] = text.strip()
-    # for name, content in sections.items():
-        # print(f"PYTHON_LOG: Final identified section: '{name}' (approx {len(content)} chars)")
+        sections["general_content"] = _strip_offsets(text, 0, len(text))
     return sections
 
-def generate_skill_patterns(skill_list: list):
-    patterns = []
-    for skill in skill_list:
-        skill_lower = skill.lower()
-        pattern_tokens = []
-        if skill_lower == "c#": pattern_tokens = [{"LOWER": "c"}, {"TEXT": "#"}]
-        elif skill_lower == "c++": pattern_tokens = [{"LOWER": "c"}, {"TEXT": {"REGEX": r"(\+\+)"}}]
-        elif ".js" in skill_lower and not skill_lower.startswith("."): 
-            parts = skill_lower.rsplit('.', 1)
-            if len(parts) == 2 and parts[1] == "js": pattern_tokens = [{"LOWER": parts[0].replace(" ", "").replace("-", "")}, {"LOWER": "."}, {"LOWER": "js"}]
-            else: pattern_tokens = [{"LOWER": token.strip()} for token in re.split(r'(\s|\.|\#|\+)', skill_lower) if token and token.strip()]
-        elif " " in skill_lower: pattern_tokens = [{"LOWER": token} for token in skill_lower.split()]
-        else: pattern_tokens = [{"LEMMA": skill_lower}]
-        if pattern_tokens: patterns.append({"label": skill.upper(), "pattern": pattern_tokens})
-    return patterns
+def identify_sections(text: str) -> dict:
+    return {name: text[start:end] for name, (start, end) in identify_section_spans(text).items()}
+
+def section_doc(doc, start: int, end: int):
+    """Returns the slice of an already-parsed doc (or span) covering doc.text[start:end] without re-running the pipeline.
+    Falls back to parsing the slice on its own only if the offsets do not land on token boundaries."""
+    if isinstance(doc, Span):
+        span = doc.doc.char_span(doc.start_char + start, doc.start_char + end)
+    else:
+        span = doc.char_span(start, end)
+    return span if span is not None else get_nlp()(doc.text[start:end])
+
+def iter_line_offsets(text: str):
+    """Yields (line, start, end) for each line of text, with offsets excluding the line ending."""
+    offset = 0
+    for line_with_ending in text.splitlines(keepends=True):
+        line = line_with_ending.splitlines()[0]
+        yield line, offset, offset + len(line)
+        offset += len(line_with_ending)
+
+def section_sents(doc_section) -> list:
+    """Sentences of a doc or section span, clipped to the span so sentences running across a section header are not
+    counted twice. A sentence that only touches the span (clipped to nothing) is not one of its sentences."""
+    if not isinstance(doc_section, Span): return list(doc_section.sents)
+    doc = doc_section.doc
+    clipped = [(max(sent.start, doc_section.start), min(sent.end, doc_section.end)) for sent in doc_section.sents]
+    return [doc[start:end] for start, end in clipped if start < end]
+
+def get_skill_matcher(skill_list: list) -> SkillMatcher:
+    """Returns the process-wide SkillMatcher for skill_list, compiling it on first use.
+    COMMON_SKILLS gets the full taxonomy with aliases; any other list is matched by its names only."""
+    key = tuple(skill_list)
+    matcher = _skill_matchers.get(key)
+    if matcher is None:
+        taxonomy = SKILL_TAXONOMY if key == tuple(COMMON_SKILLS) else SkillTaxonomy.from_skills(skill_list)
+        with timed("skill_matcher_build"): matcher = _skill_matchers[key] = SkillMatcher(get_nlp().tokenizer, taxonomy)
+    return matcher
 
 def extract_keywords_from_text_spacy(doc, skill_list: list) -> list:
-    if not nlp: return [] 
-    found_keywords = set()
-    matcher = spacy.matcher.Matcher(nlp.vocab)
-    skill_patterns = generate_skill_patterns(skill_list)
-    for p in skill_patterns: matcher.add(p["label"], [p["pattern"]])
-    matches = matcher(doc)
-    for match_id, start, end in matches:
-        original_skill_name_from_list = nlp.vocab.strings[match_id] 
-        matched_skill = next((s for s in skill_list if s.upper() == original_skill_name_from_list), original_skill_name_from_list)
-        found_keywords.add(matched_skill)
-    return list(found_keywords)
-
-def analyze_individual_job_entry(job_text: str) -> dict:
-    """Analyzes a single job entry text for action verbs and quantifiable results."""
+    if not get_nlp(): return [] 
+    return get_skill_matcher(skill_list)(doc)
+
+def extract_resume_skills(resume_text: str, skill_list: list = None) -> list:
+    """Skills in a resume: a full pipeline pass (lemma matching) plus the surface matches used for job descriptions,
+    so anything extract_job_skills() can find in a job is also found in a resume with the same wording."""
+    nlp = get_nlp()
+    matcher = get_skill_matcher(skill_list or COMMON_SKILLS)
+    return sorted(set(matcher(nlp(resume_text))) | set(matcher.match_surface(nlp.make_doc(resume_text))))
+
+def extract_job_skills(job_text: str, skill_list: list = None) -> list:
+    """Skills in a job posting. Only tokenizes (nlp.make_doc), so it is cheap enough to run over a whole job catalog."""
+    return sorted(get_skill_matcher(skill_list or COMMON_SKILLS).match_surface(get_nlp().make_doc(job_text)))
+
+def compare_resume_to_jobs(resume_text: str, job_descriptions: list, skill_list: list = None) -> dict:
+    """Matches one resume against one or more job descriptions by the skills each of them mentions.
+
+    The resume goes through the full pipeline once; each job description is only tokenized and scanned with the
+    same compiled SkillMatcher, so each extra job description costs a tokenizer pass plus a set comparison.
+    Returns {"resumeSkills": [...], "results": [{"matching", "missing", "extra", "score"}, ...]} in job order;
+    score is the percentage of the job's skills found in the resume."""
+    if not get_nlp(): return {"error": "NLP model (spaCy) could not be loaded. Comparison is unavailable."}
+    resume_skills = set(extract_resume_skills(resume_text, skill_list))
+    results = []
+    for job_description in job_descriptions:
+        if not isinstance(job_description, str) or not job_description.strip():
+            results.append({"error": "Job description must be a non-empty string."})
+            continue
+        job_skills = set(extract_job_skills(job_description, skill_list))
+        matching = job_skills & resume_skills
+        results.append({
+            "matching": sorted(matching), "missing": sorted(job_skills - resume_skills), "extra": sorted(resume_skills - job_skills),
+            "score": round(100 * len(matching) / len(job_skills)) if job_skills else 0,
+        })
+    return {"resumeSkills": sorted(resume_skills), "results": results}
+
+PARSED_PIECES = int(os.environ.get("PARSED_PIECES", 4096)) # Experience lines and bullets kept parsed per worker
+_parsed_pieces = OrderedDict() # (disabled pipes, text) -> Doc, least recently used first
+
+def pipe_cached(texts: list, disable: tuple = ()) -> list:
+    """nlp.pipe(texts) as a list, except that texts this worker has parsed recently (with the same pipes disabled)
+    are not parsed again. Only for texts parsed on their own, whose Doc depends on nothing but the text; a re-upload
+    with one bullet edited then parses just that bullet."""
+    keys = [(disable, text) for text in texts]
+    with _nlp_lock:
+        docs = {key: _parsed_pieces[key] for key in keys if key in _parsed_pieces}
+        for key in docs: _parsed_pieces.move_to_end(key)
+    stale = list(dict.fromkeys(key for key in keys if key not in docs))
+    docs.update(zip(stale, get_nlp().pipe([text for _, text in stale], disable=list(disable))))
+    with _nlp_lock:
+        for key in stale: _parsed_pieces[key] = docs[key]
+        while len(_parsed_pieces) > PARSED_PIECES: _parsed_pieces.popitem(last=False)
+    return [docs[key] for key in keys]
+
+def bullet_texts(job_text: str) -> list:
+    """The text after the bullet character of each bullet line in a job entry."""
+    return [line.strip()[1:].strip() for line in job_text.splitlines() if line.strip().startswith(BULLET_POINT_STARTS)]
+
+def parse_job_entries(job_texts: list) -> list:
+    """(doc, bullet_docs) for each job entry, all parsed in one pipe_cached() call. Each bullet's text is parsed on its
+    own, and so is an entry without bullets (doc is None for the others), which is how analyze_individual_job_entry()
+    reads them."""
+    bullets = [bullet_texts(job_text) for job_text in job_texts]
+    docs = iter(pipe_cached([text for job_text, entry_bullets in zip(job_texts, bullets) for text in (entry_bullets or [job_text])]))
+    return [(None, [next(docs) for _ in entry_bullets]) if entry_bullets else (next(docs), []) for entry_bullets in bullets]
+
+def analyze_individual_job_entry(job_text: str, parsed: tuple = None) -> dict:
+    """Analyzes a single job entry text for action verbs and quantifiable results.
+    parsed is the entry's (doc, bullet_docs) from parse_job_entries(), when it was parsed along with other entries."""
+    nlp = get_nlp()
     if not nlp: return {"action_verbs_count": 0, "quantifiable_results_count": 0, "bullet_points_count": 0, "action_verb_lemmas": [], "feedback": "spaCy model not loaded."}
     
-    doc_job_entry = nlp(job_text)
+    doc_job_entry, bullet_docs = parsed or parse_job_entries([job_text])[0]
     action_verb_lemmas = set()
-    bullet_points_count = 0
-    quantifiable_results_count = 0
+    bullet_points_count = len(bullet_docs)
     
-    bullet_point_starts = ['-', '*', '•', '➢', '‣', '◦']
-    for line in job_text.splitlines():
-        stripped_line = line.strip()
-        if stripped_line.startswith(tuple(bullet_point_starts)):
-            bullet_points_count +=1
-            line_doc = nlp(stripped_line[1:].strip()) 
-            if len(line_doc) > 0:
-                token = line_doc[0]
-                if token.pos_ == "VERB" and token.is_alpha and not token.is_stop:
-                    action_verb_lemmas.add(token.lemma_.lower())
+    for line_doc in bullet_docs:
+        if len(line_doc) > 0:
+            token = line_doc[0]
+            if token.pos_ == "VERB" and token.is_alpha and not token.is_stop:
+                action_verb_lemmas.add(token.lemma_.lower())
 
-    job_entry_sents_list = list(doc_job_entry.sents) # Convert generator to list
-    if bullet_points_count == 0 and len(job_entry_sents_list) > 0: # CORRECTED LINE
+    if bullet_points_count == 0:
+        job_entry_sents_list = list(doc_job_entry.sents) # Convert generator to list
         for sent in job_entry_sents_list: # Iterate over the list
             if len(sent) > 0:
                 token = sent[0]
@@ -148,14 +493,11 @@ def analyze_individual_job_entry(job_text: str) -> dict:
                      action_verb_lemmas.add(token.lemma_.lower())
         bullet_points_count = len(job_entry_sents_list) 
 
-    quantifiable_patterns = [
-        r"\b\d{1,3}(?:,\d{3})*(?:\.\d+)?%?\b", r"\b\d+(?:\.\d+)?[KMBkm]\b", r"[\$€£]\s*\d{1,3}(?:,\d{3})*(?:\.\d+)?", 
-        r"\b(?:increase[sd]?|decrease[sd]?|grew|reduce[sd]?|save[sd]?|improve[sd]?|optimize[sd]?|achieve[sd]?|manage[sd]?|led|generate[sd]?|deliver[sd]?|exceed[ed]*|surpasse[sd]*)\s+(?:by\s+|to\s+|approx\.?\s+)?\d+(?:\.\d+)?%?",
-        r"\b(?:over|more\s+than|under|less\s+than|approx(?:imately)?\.?|about|up\s+to|at\s+least)\s+\d+(?:\.\d+)?\b", 
-        r"\b\d+(?:\.\d+)?\s+(?:units|users|clients|projects|dollars|hours|transactions|downloads|features|campaigns|items|records|revenue|percent|points|members|customers|leads|bugs|tickets|deployments|releases)\b"
-    ]
-    for pattern in quantifiable_patterns: quantifiable_results_count += len(re.findall(pattern, job_text, re.IGNORECASE))
+    quantifiable_results_count = sum(count_quantifiables(job_text).values())
+    return job_entry_analysis(action_verb_lemmas, bullet_points_count, quantifiable_results_count)
 
+def job_entry_analysis(action_verb_lemmas: set, bullet_points_count: int, quantifiable_results_count: int) -> dict:
+    """Counts and feedback for one job entry, from its action verb lemmas, bullet count and quantifiable result count."""
     feedback_parts = []
     if bullet_points_count > 0:
         if len(action_verb_lemmas) >= bullet_points_count * 0.6: feedback_parts.append(f"Good use of action verbs ({len(action_verb_lemmas)} found).")
@@ -173,47 +515,74 @@ def analyze_individual_job_entry(job_text: str) -> dict:
         "feedback": " ".join(feedback_parts) if feedback_parts else "Describe your responsibilities and achievements clearly."
     }
 
-def segment_experience(experience_text: str) -> list:
-    if not nlp: return [{"role_text": experience_text, "title_guess": "Experience Details", "company_guess": "N/A", "dates_guess": "N/A", **analyze_individual_job_entry(experience_text)}]
+JOB_TITLE_KEYWORDS = ("engineer", "developer", "manager", "analyst", "specialist", "lead", "architect", "consultant", "director", "president", "officer", "intern", "associate", "coordinator", "designer", "scientist", "administrator", "executive", "head of")
+
+def is_potential_title(stripped_line: str) -> bool:
+    """A short, mostly capitalized line naming a job title ("Senior Software Engineer")."""
+    words = stripped_line.split()
+    if len(words) < 7 and sum(1 for w in words if w.istitle() or w.isupper()) > len(words)/2 :
+        return any(tk in stripped_line.lower() for tk in JOB_TITLE_KEYWORDS)
+    return False
+
+LINE_SKIPPED_PIPES = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "sentencizer") # A line is only parsed for its entities
+LINE_CHUNK = 64 # Experience lines parsed per pipe_cached() call
+
+def segment_experience(experience_text: str, budget: TimeBudget = None) -> list:
+    """Splits the experience section into roles. Each line is parsed on its own for its ORG entities, LINE_CHUNK lines
+    per pipe_cached() call, and each role as in analyze_individual_job_entry(), all roles through one more call,
+    instead of one pipeline call per line and per bullet. Nothing is read from the parse of the whole resume, so the
+    result depends on experience_text alone.
+    With a budget, each role is analyzed as soon as the next one starts, and the budget is checked before every line.
+    If it runs out, the roles analyzed so far are returned and "segment_experience" is marked skipped: the work left
+    over is at most one chunk of lines and one role."""
+    nlp = get_nlp()
+    if not nlp: return [{"role_text": experience_text, "role_offsets": [0, len(experience_text)], "title_guess": "Experience Details", "company_guess": "N/A", "dates_guess": "N/A", **analyze_individual_job_entry(experience_text)}]
     
-    doc = nlp(experience_text)
+    lines = list(iter_line_offsets(experience_text))
+    line_texts = [line.strip() for line, _, _ in lines if line.strip()]
+    disabled = tuple(name for name in LINE_SKIPPED_PIPES if name in nlp.pipe_names)
+    line_docs = (doc for chunk_start in range(0, len(line_texts), LINE_CHUNK) for doc in pipe_cached(line_texts[chunk_start:chunk_start + LINE_CHUNK], disabled)) # Parsed a chunk at a time, as the loop gets to it
     job_entries_data = []
+    pending_roles = [] # (role_start, role_end, title, company, dates) segmented but not analyzed yet
     current_entry_lines = []
     current_title, current_company, current_dates = "N/A", "N/A", "N/A"
     
-    date_pattern = r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|Present|Current|To\sDate)[\w\s\.,\-–'’]*\d{4}\b|\b\d{4}\s*-\s*\d{4}\b|\b\d{4}\s*-\s*Present\b"
-    job_title_keywords = ["engineer", "developer", "manager", "analyst", "specialist", "lead", "architect", "consultant", "director", "president", "officer", "intern", "associate", "coordinator", "designer", "scientist", "administrator", "executive", "head of"]
-
-    def save_current_entry():
-        if current_entry_lines:
-            role_text = "\n".join(current_entry_lines).strip()
-            analysis = analyze_individual_job_entry(role_text)
+    def analyze_pending_roles():
+        role_texts = [experience_text[role_start:role_end] for role_start, role_end, *_ in pending_roles]
+        for role_text, (role_start, role_end, title, company, dates), parsed in zip(role_texts, pending_roles, parse_job_entries(role_texts)):
+            analysis = analyze_individual_job_entry(role_text, parsed)
             job_entries_data.append({
-                "role_text": role_text,
-                "title_guess": current_title if current_title != "N/A" else (analysis.get("job_titles_in_text", ["N/A"])[0] if analysis.get("job_titles_in_text") else "N/A"),
-                "company_guess": current_company,
-                "dates_guess": current_dates,
+                "role_text": role_text, "role_offsets": [role_start, role_end],
+                "title_guess": title if title != "N/A" else (analysis.get("job_titles_in_text", ["N/A"])[0] if analysis.get("job_titles_in_text") else "N/A"),
+                "company_guess": company,
+                "dates_guess": dates,
                 **analysis 
             })
+        pending_roles.clear()
+
+    def save_current_entry():
+        if current_entry_lines:
+            pending_roles.append((*_strip_offsets(experience_text, current_entry_start, current_entry_end), current_title, current_company, current_dates))
+            if budget is not None: analyze_pending_roles()
             return True
         return False
 
-    lines = experience_text.splitlines()
-    for i, line in enumerate(lines):
+    current_entry_start = current_entry_end = 0
+    for i, (line, line_start, line_end) in enumerate(lines):
+        if out_of_time(budget, "segment_experience"): return job_entries_data
         stripped_line = line.strip()
         if not stripped_line:
+            if not current_entry_lines: current_entry_start = line_start
             current_entry_lines.append(line) 
+            current_entry_end = line_end
             continue
 
-        date_match = re.search(date_pattern, stripped_line, re.IGNORECASE)
-        line_doc = nlp(stripped_line)
+        date_match = DATE_RANGE_RE.search(stripped_line)
+        line_doc = next(line_docs)
         org_entities = [ent.text for ent in line_doc.ents if ent.label_ == "ORG"]
         
         is_new_header = False
-        line_is_potential_title = False
-        if len(stripped_line.split()) < 7 and sum(1 for w in stripped_line.split() if w.istitle() or w.isupper()) > len(stripped_line.split())/2 :
-            if any(tk.lower() in stripped_line.lower() for tk in job_title_keywords):
-                line_is_potential_title = True
+        line_is_potential_title = is_potential_title(stripped_line)
 
         if date_match:
             is_new_header = True
@@ -230,18 +599,23 @@ def segment_experience(experience_text: str) -> list:
                 if org_entities: current_company = org_entities[0]
                 if line_is_potential_title: current_title = stripped_line
                 current_entry_lines = [line] 
+                current_entry_start, current_entry_end = line_start, line_end
                 continue 
 
+        if not current_entry_lines: current_entry_start = line_start
         current_entry_lines.append(line)
+        current_entry_end = line_end
         if current_title == "N/A" and line_is_potential_title: current_title = stripped_line
         if current_company == "N/A" and org_entities: current_company = org_entities[0]
         if current_dates == "N/A" and date_match: current_dates = date_match.group(0).strip()
 
-    save_current_entry() 
+    if out_of_time(budget, "segment_experience"): return job_entries_data
+    save_current_entry()
+    analyze_pending_roles()
 
     if not job_entries_data: 
         analysis = analyze_individual_job_entry(experience_text)
-        job_entries_data.append({"role_text": experience_text, "title_guess": "Experience Details", "company_guess": "N/A", "dates_guess": "N/A", **analysis})
+        job_entries_data.append({"role_text": experience_text, "role_offsets": [0, len(experience_text)], "title_guess": "Experience Details", "company_guess": "N/A", "dates_guess": "N/A", **analysis})
 
     print(f"PYTHON_LOG: Segmented experience into {len(job_entries_data)} roles.")
     # for i, entry in enumerate(job_entries_data):
@@ -249,12 +623,18 @@ def segment_experience(experience_text: str) -> list:
     return job_entries_data
 
 
-def analyze_experience_section_spacy(doc_experience) -> dict:
-    if not nlp: return {"action_verbs_count": 0, "quantifiable_results_count": 0, "feedback": "spaCy model not loaded.", "job_titles": [], "bullet_points_count": 0, "unique_action_verbs": 0, "parsed_roles": []}
+def analyze_experience_section_spacy(doc_experience, budget: TimeBudget = None) -> dict:
+    if not get_nlp(): return {"action_verbs_count": 0, "quantifiable_results_count": 0, "feedback": "spaCy model not loaded.", "job_titles": [], "bullet_points_count": 0, "unique_action_verbs": 0, "parsed_roles": []}
     
     experience_text = doc_experience.text
-    parsed_roles = segment_experience(experience_text) 
-    
+    with timed("segment_experience", size=size_class(len(experience_text)), tokens=token_class(len(doc_experience))): parsed_roles = segment_experience(experience_text, budget)
+    if not parsed_roles and budget is not None and "segment_experience" in budget.skipped:
+        return experience_analysis(experience_text, parsed_roles, lambda: job_entry_analysis(set(), 0, 0)) # Out of time before the first role
+    return experience_analysis(experience_text, parsed_roles, lambda: analyze_individual_job_entry(experience_text))
+
+def experience_analysis(experience_text: str, parsed_roles: list, analyze_whole_section) -> dict:
+    """Totals and feedback for the experience section from its parsed roles. analyze_whole_section() gives the
+    job entry analysis of the whole section, used instead when it could not be split into roles."""
     total_action_verbs = sum(role.get("action_verbs_count", 0) for role in parsed_roles)
     total_quantifiables = sum(role.get("quantifiable_results_count", 0) for role in parsed_roles)
     total_bullets = sum(role.get("bullet_points_count", 0) for role in parsed_roles)
@@ -274,7 +654,7 @@ def analyze_experience_section_spacy(doc_experience) -> dict:
     if not parsed_roles or (len(parsed_roles) == 1 and parsed_roles[0]["title_guess"] == "Experience Details"):
         feedback_parts.append("Could not clearly segment individual job roles. Ensure each role has a clear title, company, and dates, possibly on separate lines or distinctly formatted.")
         # Analyze the whole block if segmentation failed
-        overall_analysis_fallback = analyze_individual_job_entry(experience_text)
+        overall_analysis_fallback = analyze_whole_section()
         total_action_verbs = overall_analysis_fallback["action_verbs_count"]
         total_quantifiables = overall_analysis_fallback["quantifiable_results_count"]
         total_bullets = overall_analysis_fallback["bullet_points_count"]
@@ -332,23 +712,27 @@ def analyze_experience_section_spacy(doc_experience) -> dict:
 
 def analyze_education_section_spacy(doc_education) -> dict:
     # ... (Keep the enhanced version from the previous update)
-    if not nlp: return {"clarity": 0, "feedback": "spaCy model not loaded.", "degrees": [], "institutions": [], "grad_dates": []}
-    analysis = {"clarity": 5, "feedback": "", "degrees": [], "institutions": [], "grad_dates": [], "gpa_found": False, "relevant_coursework_honors_found": False}
+    if not get_nlp(): return {"clarity": 0, "feedback": "spaCy model not loaded.", "degrees": [], "institutions": [], "grad_dates": []}
+    institutions, grad_dates = [], []
     for ent in doc_education.ents:
-        if ent.label_ == "ORG": analysis["institutions"].append(ent.text.strip())
+        if ent.label_ == "ORG": institutions.append(ent.text.strip())
         elif ent.label_ == "DATE": 
-            if re.search(r"\b(?:19|20)\d{2}\b", ent.text): analysis["grad_dates"].append(ent.text.strip())
-    degree_keywords = [r"B\.S\.?", r"M\.S\.?", r"Ph\.D\.?", r"Bachelor(?:'s)?\s*(?:of\s*(?:Science|Arts|Engineering|Technology|Business|Commerce|Applied\sScience))?", r"Master(?:'s)?\s*(?:of\s*(?:Science|Arts|Engineering|Technology|Business|Administration|Applied\sScience))?", r"Associate(?:'s)?", r"Diploma", r"Certificate", r"B\.Tech", r"M\.Tech", r"MBA", r"Doctorate", r"B\.A\.", r"M\.A\."]
-    for keyword_pattern in degree_keywords:
-        matches = re.finditer(keyword_pattern + r"(?:\s+(?:in|of)\s+[\w\s\(\)&/-]+)?", doc_education.text, re.IGNORECASE)
+            if YEAR_RE.search(ent.text): grad_dates.append(ent.text.strip())
+    return education_analysis(doc_education.text, institutions, grad_dates)
+
+def education_analysis(education_text: str, institutions: list, grad_dates: list) -> dict:
+    """Degrees, GPA/coursework, clarity and feedback for the education section, given the institutions and dates found in it."""
+    analysis = {"clarity": 5, "feedback": "", "degrees": [], "institutions": institutions, "grad_dates": grad_dates, "gpa_found": False, "relevant_coursework_honors_found": False}
+    for degree_re in DEGREE_RES:
+        matches = degree_re.finditer(education_text)
         for match in matches: 
             degree_text = match.group(0).strip()
             if len(degree_text.split()) < 12: analysis["degrees"].append(degree_text)
     analysis["institutions"] = sorted(list(set(analysis["institutions"])))
     analysis["grad_dates"] = sorted(list(set(analysis["grad_dates"])))
-    analysis["degrees"] = sorted(list(set(d for d in analysis["degrees"] if len(d.split()) > 1 or any(kw.replace(r"(?:'s)?","").replace(r"\s*(?:of\s*(?:Science|Arts|Engineering|Technology|Business|Commerce|Applied\sScience))?","").lower() in d.lower() for kw in ["Bachelor", "Master", "Associate", "Doctorate", "Diploma", "Certificate", "B.S", "M.S", "Ph.D", "MBA", "B.Tech", "M.Tech"] ))))
-    if re.search(r"(?i)(?:GPA|Grade\s*Point\s*Average|CGPA)\s*[:\s]*\d\.\d+", doc_education.text): analysis["gpa_found"] = True
-    if re.search(r"(?i)(?:Relevant\s*Coursework|Honors|Dean's\s*List|Cum\s*Laude|Scholarship|Awarded)", doc_education.text): analysis["relevant_coursework_honors_found"] = True
+    analysis["degrees"] = sorted(list(set(d for d in analysis["degrees"] if len(d.split()) > 1 or any(kw in d.lower() for kw in DEGREE_NAME_KEYWORDS))))
+    if GPA_RE.search(education_text): analysis["gpa_found"] = True
+    if COURSEWORK_HONORS_RE.search(education_text): analysis["relevant_coursework_honors_found"] = True
     clarity_score = 2
     if analysis["institutions"]: clarity_score += 2
     if analysis["degrees"]: clarity_score += 3
@@ -370,20 +754,23 @@ def analyze_education_section_spacy(doc_education) -> dict:
 
 def analyze_projects_section_spacy(doc_projects, skill_list) -> dict:
     # ... (Keep the enhanced version from the previous update)
-    if not nlp: return {"clarity": 0, "feedback": "spaCy model not loaded.", "project_count": 0, "tech_keywords_count": 0}
+    if not get_nlp(): return {"clarity": 0, "feedback": "spaCy model not loaded.", "project_count": 0, "tech_keywords_count": 0}
+    return projects_analysis(doc_projects.text, extract_keywords_from_text_spacy(doc_projects, skill_list))
+
+def projects_analysis(projects_text: str, project_keywords: list) -> dict:
+    """Project count, titles, clarity and feedback for the projects section, given the skills mentioned in it."""
     analysis = {"clarity": 5, "feedback": "", "project_count": 0, "tech_keywords_count": 0, "project_titles": []}
     project_titles_set = set()
-    project_lines = doc_projects.text.splitlines()
+    project_lines = projects_text.splitlines()
     for i, line in enumerate(project_lines):
         stripped_line = line.strip()
         if stripped_line:
             is_likely_title = (stripped_line[0].isupper() and len(stripped_line.split()) < 8 and not stripped_line.startswith(('-', '*', '•')) and (i == 0 or not project_lines[i-1].strip().endswith((',', ';', 'and', 'or', 'for', 'with', 'to', 'in', 'on', 'at', 'of'))))
             if is_likely_title:
                 analysis["project_count"] += 1
-                title_candidate = re.sub(r"\s*\|.*$", "", stripped_line).strip()
-                title_candidate = re.sub(r"\s*\(.*$", "", title_candidate).strip()
+                title_candidate = PROJECT_TITLE_PIPE_SUFFIX_RE.sub("", stripped_line).strip()
+                title_candidate = PROJECT_TITLE_PAREN_SUFFIX_RE.sub("", title_candidate).strip()
                 if len(title_candidate) > 2: project_titles_set.add(title_candidate)
-    project_keywords = extract_keywords_from_text_spacy(doc_projects, skill_list)
     analysis["tech_keywords_count"] = len(project_keywords)
     clarity_score = 3
     if analysis["project_count"] > 0: clarity_score +=3
@@ -391,7 +778,7 @@ def analyze_projects_section_spacy(doc_projects, skill_list) -> dict:
     if len(project_titles_set) > 0 : clarity_score +=1 
     analysis["clarity"] = min(clarity_score, 10)
     feedback_parts = []
-    if analysis["project_count"] == 0 and len(doc_projects.text) > 50: feedback_parts.append("No distinct projects clearly identified. If you have projects, ensure each has a clear title and is well-separated.")
+    if analysis["project_count"] == 0 and len(projects_text) > 50: feedback_parts.append("No distinct projects clearly identified. If you have projects, ensure each has a clear title and is well-separated.")
     elif analysis["project_count"] > 0:
         feedback_parts.append(f"Identified approximately {analysis['project_count']} project(s).")
         if project_titles_set: feedback_parts.append(f"Potential project titles include: {', '.join(list(project_titles_set)[:2])}{'...' if len(project_titles_set) > 2 else ''}.")
@@ -404,141 +791,106 @@ def analyze_projects_section_spacy(doc_projects, skill_list) -> dict:
     return analysis
 
 
-def analyze_resume_text(text: str) -> dict:
-    if not nlp: 
-        return { "error": "NLP model (spaCy) could not be loaded. Analysis features are limited.", 
-            "score": 0, "contentQuality": 0, "atsCompatibility": 0, "keywordOptimization": 0,
-            "suggestions": ["Critical NLP component failed to load. Please contact support."],
-            "keywords": {"present": [], "missing": []}, "sections": {}, "raw_text_preview": text[:1000] }
+IMPACT_WORDS = frozenset(["achieved", "led", "drove", "spearheaded", "transformed", "innovated", "launched", "managed", "developed", "created", "pioneered", "orchestrated", "delivered", "generated", "secured", "grew", "reduced", "improved", "optimized", "streamlined", "established"])
 
-    if not text.strip(): 
-        return { "error": "Could not extract readable text from the resume.",
-            "score": 0, "contentQuality": 0, "atsCompatibility": 0, "keywordOptimization": 0,
-            "suggestions": ["The resume appears to be empty or unreadable. Please upload a text-based PDF."],
-            "keywords": {"present": [], "missing": []}, "sections": {}, "raw_text_preview": "No text extracted." }
-
-    doc = nlp(text) 
-    extracted_sections_content = identify_sections(text) 
-
-    common_skills_list = [ 
-        "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Ruby", "Swift", "Kotlin", "PHP", "Scala", "Rust", "Perl", "Objective-C",
-        "React", "React.js", "Angular", "AngularJS", "Vue.js", "Svelte", "HTML", "HTML5", "CSS", "CSS3", "SASS", "SCSS", "LESS", "jQuery", "Bootstrap", "Tailwind CSS", "Next.js", "Nuxt.js", "Gatsby", "Ember.js", "Redux", "Vuex", "MobX",
-        "Node.js", "Express.js", "Django", "Flask", "Spring", "Spring Boot", "Ruby on Rails", ".NET", ".NET Core", "ASP.NET", "FastAPI", "Laravel", "Symfony",
-        "SQL", "MySQL", "PostgreSQL", "Microsoft SQL Server", "MongoDB", "NoSQL", "Oracle", "SQLite", "Firebase", "Firestore", "DynamoDB", "Redis", "Cassandra", "Elasticsearch",
-        "Amazon Web Services", "AWS", "Microsoft Azure", "Azure", "Google Cloud Platform", "GCP", "Heroku", "DigitalOcean", "Linode", "Vercel", "Netlify", "CloudFormation", "ARM Templates",
-        "Docker", "Kubernetes", "K8s", "CI/CD", "Jenkins", "GitLab CI", "GitHub Actions", "CircleCI", "Travis CI", "ArgoCD", "Spinnaker",
-        "Terraform", "Ansible", "Chef", "Puppet", "Linux", "Unix", "Shell Scripting", "Bash", "PowerShell", "Windows Server",
-        "Machine Learning", "ML", "Deep Learning", "DL", "Artificial Intelligence", "AI", "Natural Language Processing", "NLP", "Computer Vision", "CV",
-        "Data Analysis", "Data Science", "Data Engineering", "Data Visualization", "Statistics", "Pandas", "NumPy", "SciPy", "Matplotlib", "Seaborn", "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "Apache Spark", "Tableau", "Power BI",
-        "Big Data", "Hadoop", "Spark", "Kafka", "Data Warehousing", "ETL", "Airflow", "Snowflake", "Redshift",
-        "Agile", "Scrum", "Kanban", "JIRA", "Confluence", "Lean", "Six Sigma", "DevOps", "Site Reliability Engineering", "SRE",
-        "RESTful APIs", "REST APIs", "GraphQL", "Microservices", "API Design", "SOAP", "gRPC", "WebSockets", "OAuth", "JWT",
-        "Cybersecurity", "Information Security", "Network Security", "Penetration Testing", "Cryptography", "SIEM", "Firewalls", "Ethical Hacking",
-        "Problem Solving", "Communication Skills", "Teamwork", "Collaboration", "Leadership", "Project Management", "Product Management", 
-        "Analytical Skills", "Critical Thinking", "Creativity", "Adaptability", "Time Management", "Customer Service", "Sales", "Marketing", "UI/UX Design", "User Experience", "User Interface", "Figma", "Adobe XD", "Sketch"
-    ]
-    
-    all_keywords_present = extract_keywords_from_text_spacy(doc, common_skills_list) 
-    
-    final_sections_analysis = {}
-    summary_analysis_data = {}
-    experience_analysis_data = {}
-    skills_analysis_data = {}
-    education_analysis_data = {}
-    projects_analysis_data = {} 
-
-    summary_text_content = extracted_sections_content.get("summary") or extracted_sections_content.get("summary_implicit", "")
-    if summary_text_content:
-        doc_summary = nlp(summary_text_content) 
-        summary_sents_list = list(doc_summary.sents) 
-        num_sents = len(summary_sents_list)
-        clarity_score = 8 if num_sents >= 2 and num_sents <= 4 else (5 if num_sents == 1 or num_sents == 5 else 3) 
-        impact_words = ["achieved", "led", "drove", "spearheaded", "transformed", "innovated", "launched", "managed", "developed", "created", "pioneered", "orchestrated", "delivered", "generated", "secured", "grew", "reduced", "improved", "optimized", "streamlined", "established"]
-        impact_verb_count = sum(1 for token in doc_summary if token.pos_ == "VERB" and token.lemma_.lower() in impact_words)
-        impact_score = min(6 + impact_verb_count * 2.5, 10) if impact_verb_count > 0 else 4 
-        summary_analysis_data = {
-            "clarity": int(clarity_score), "impact": int(impact_score),  
-            "feedback": f"Summary ({len(summary_text_content)} chars, {num_sents} sentences): " + 
-                        ("Appears well-structured with an appropriate number of sentences. " if clarity_score >= 7 else "Aim for 2-4 concise, impactful sentences for your summary. ") +
-                        (f"Effectively uses {impact_verb_count} strong impact verb(s). " if impact_verb_count > 1 else (f"Includes {impact_verb_count} impact verb. " if impact_verb_count ==1 else "" )) +
-                        ("Consider incorporating more strong action verbs or highlighting key quantifiable achievements. " if impact_score < 7 else "Strong impact demonstrated.")
-        }
-        final_sections_analysis["summary"] = summary_analysis_data
-
-    if "experience" in extracted_sections_content:
-        experience_text_content = extracted_sections_content["experience"]
-        if experience_text_content:
-            doc_experience_spacy = nlp(experience_text_content)
-            experience_analysis_data = analyze_experience_section_spacy(doc_experience_spacy)
-            final_sections_analysis["experience"] = experience_analysis_data
-            
-    if "skills" in extracted_sections_content:
-        skills_text_content = extracted_sections_content["skills"]
-        if skills_text_content:
-            doc_skills = nlp(skills_text_content) 
-            identified_skills_in_section = extract_keywords_from_text_spacy(doc_skills, common_skills_list)
-            num_skill_lines = skills_text_content.count('\n') + 1
-            organization_score = 8 if num_skill_lines > max(4, len(identified_skills_in_section) / 2.0) else (6 if num_skill_lines > 2 else 4) 
-            skills_analysis_data = {
-                "relevance": int(min(len(identified_skills_in_section) * 1.5, 10)), 
-                "organization": int(organization_score), 
-                "feedback": f"Skills section ({len(skills_text_content)} chars): Found {len(identified_skills_in_section)} relevant skills (e.g., {', '.join(identified_skills_in_section[:6])}{'...' if len(identified_skills_in_section) > 6 else ''}). " +
-                            ("Appears well-organized. " if organization_score > 6 else "Consider categorizing skills (e.g., 'Programming Languages', 'Cloud Technologies', 'Tools') for enhanced readability and ATS parsing. ") +
-                            "Ensure skills listed are tailored to the requirements of target roles."
-            }
-            final_sections_analysis["skills"] = skills_analysis_data
-
-    if "education" in extracted_sections_content:
-        education_text_content = extracted_sections_content["education"]
-        if education_text_content:
-            doc_education_spacy = nlp(education_text_content)
-            education_analysis_data = analyze_education_section_spacy(doc_education_spacy)
-            education_analysis_data.setdefault("impact", 0)
-            final_sections_analysis["education"] = education_analysis_data
-    
-    if "projects" in extracted_sections_content:
-        projects_text_content = extracted_sections_content["projects"]
-        if projects_text_content:
-            doc_projects_spacy = nlp(projects_text_content)
-            projects_analysis_data = analyze_projects_section_spacy(doc_projects_spacy, common_skills_list)
-            projects_analysis_data.setdefault("impact", min(projects_analysis_data.get("tech_keywords_count",0) * 1.5 + projects_analysis_data.get("project_count",0), 9)) 
-            final_sections_analysis["projects"] = projects_analysis_data
-
-    score_total = 0
-    weights_sum = 0
-    num_key_sections_found = 0 
-    
-    if summary_analysis_data: score_total += (summary_analysis_data.get("clarity",0) + summary_analysis_data.get("impact",0)) * 0.15; weights_sum += 0.15 * 20; num_key_sections_found+=1
-    if experience_analysis_data: score_total += (experience_analysis_data.get("unique_action_verbs",0) * 1.0 + experience_analysis_data.get("quantifiable_results_count",0)*2.0) * 0.30 ; weights_sum += 0.30 * 30; num_key_sections_found+=1
-    if skills_analysis_data: score_total += (skills_analysis_data.get("relevance",0) + skills_analysis_data.get("organization",0)) * 0.15; weights_sum += 0.15 * 20; num_key_sections_found+=1
-    if education_analysis_data: score_total += education_analysis_data.get("clarity",0) * 0.10; weights_sum += 0.10 * 10; num_key_sections_found+=1
-    if projects_analysis_data: score_total += (projects_analysis_data.get("clarity",0) + projects_analysis_data.get("impact",0)) * 0.10; weights_sum += 0.10 * 20; num_key_sections_found+=1
-    
-    base_structural_score = (score_total / weights_sum) * 80 if weights_sum > 0 else 40 
-    keyword_bonus = min(len(all_keywords_present) * 0.75, 20) 
-    score = min(max(50, int(base_structural_score + keyword_bonus)), 100) 
-    content_quality = min(max(55, int(score * 0.85 + keyword_bonus * 0.4 + num_key_sections_found * 2.5)), 100) 
-    ats_compatibility = min(max(60, score - 15 + (5 if len(all_keywords_present) > 8 else 0) + (5 if num_key_sections_found >=3 else 0) ), 98) 
-    keyword_optimization = min(len(all_keywords_present) * 3, 100) 
+def analyze_summary_section(doc_summary, summary_text_content: str) -> dict:
+    impact_verb_count = sum(1 for token in doc_summary if token.pos_ == "VERB" and token.lemma_.lower() in IMPACT_WORDS)
+    return summary_analysis(summary_text_content, len(section_sents(doc_summary)), impact_verb_count)
+
+def summary_analysis(summary_text_content: str, num_sents: int, impact_verb_count: int) -> dict:
+    clarity_score = 8 if num_sents >= 2 and num_sents <= 4 else (5 if num_sents == 1 or num_sents == 5 else 3) 
+    impact_score = min(6 + impact_verb_count * 2.5, 10) if impact_verb_count > 0 else 4 
+    summary_analysis_data = {
+        "clarity": int(clarity_score), "impact": int(impact_score),  
+        "feedback": f"Summary ({len(summary_text_content)} chars, {num_sents} sentences): " + 
+                    ("Appears well-structured with an appropriate number of sentences. " if clarity_score >= 7 else "Aim for 2-4 concise, impactful sentences for your summary. ") +
+                    (f"Effectively uses {impact_verb_count} strong impact verb(s). " if impact_verb_count > 1 else (f"Includes {impact_verb_count} impact verb. " if impact_verb_count ==1 else "" )) +
+                    ("Consider incorporating more strong action verbs or highlighting key quantifiable achievements. " if impact_score < 7 else "Strong impact demonstrated.")
+    }
+    return summary_analysis_data
+
+def analyze_skills_section(doc_skills, skills_text_content: str) -> dict:
+    return skills_analysis(skills_text_content, extract_keywords_from_text_spacy(doc_skills, COMMON_SKILLS))
+
+def skills_analysis(skills_text_content: str, identified_skills_in_section: list) -> dict:
+    num_skill_lines = skills_text_content.count('\n') + 1
+    organization_score = 8 if num_skill_lines > max(4, len(identified_skills_in_section) / 2.0) else (6 if num_skill_lines > 2 else 4) 
+    skills_analysis_data = {
+        "relevance": int(min(len(identified_skills_in_section) * 1.5, 10)), 
+        "organization": int(organization_score), 
+        "feedback": f"Skills section ({len(skills_text_content)} chars): Found {len(identified_skills_in_section)} relevant skills (e.g., {', '.join(identified_skills_in_section[:6])}{'...' if len(identified_skills_in_section) > 6 else ''}). " +
+                    ("Appears well-organized. " if organization_score > 6 else "Consider categorizing skills (e.g., 'Programming Languages', 'Cloud Technologies', 'Tools') for enhanced readability and ATS parsing. ") +
+                    "Ensure skills listed are tailored to the requirements of target roles."
+    }
+    return skills_analysis_data
+
+def analyze_section(name: str, doc_section, section_text: str, budget: TimeBudget = None) -> dict:
+    """Runs the analyzer for one of the scored sections (summary, experience, skills, education, projects).
+    budget is checked between experience roles."""
+    if name == "summary": return analyze_summary_section(doc_section, section_text)
+    if name == "experience": return analyze_experience_section_spacy(doc_section, budget)
+    if name == "skills": return analyze_skills_section(doc_section, section_text)
+    if name == "education": return with_impact(name, analyze_education_section_spacy(doc_section))
+    if name == "projects": return with_impact(name, analyze_projects_section_spacy(doc_section, COMMON_SKILLS))
+    raise ValueError(f"Unknown section '{name}'")
+
+def with_impact(name: str, section_analysis: dict) -> dict:
+    """Education and projects analyses get the "impact" value the score uses: 0 for education, from tech keywords and project count for projects."""
+    if name == "education": section_analysis.setdefault("impact", 0)
+    elif name == "projects": section_analysis.setdefault("impact", min(section_analysis.get("tech_keywords_count",0) * 1.5 + section_analysis.get("project_count",0), 9)) 
+    return section_analysis
+
+def with_resume_offsets(name: str, section_analysis: dict, section_start: int) -> dict:
+    """Section analyses record role_offsets relative to their section; the response gives offsets into the whole
+    extracted text, so a client can show a role's text without it being repeated in the payload."""
+    if name != "experience" or not section_start or "parsed_roles" not in section_analysis: return section_analysis
+    parsed_roles = [dict(role, role_offsets=[role["role_offsets"][0] + section_start, role["role_offsets"][1] + section_start]) if "role_offsets" in role else role for role in section_analysis["parsed_roles"]]
+    return dict(section_analysis, parsed_roles=parsed_roles)
+
+def scored_sections(extracted_sections_content: dict) -> list:
+    """(name, source section) for each scored section present, in analysis order. The summary falls back to the
+    implicit summary (the untitled block above the first header)."""
+    summary_section_name = "summary" if extracted_sections_content.get("summary") else "summary_implicit"
+    sources = {"summary": summary_section_name, "experience": "experience", "skills": "skills", "education": "education", "projects": "projects"}
+    return [(name, source) for name, source in sources.items() if extracted_sections_content.get(source)]
+
+def combine_section_analyses(text: str, extracted_sections_content: dict, final_sections_analysis: dict, all_keywords_present: list, skipped_sections=()) -> dict:
+    """Scores, suggestions and the response body, from the per-section analyses and the keywords of the whole resume.
+    Sections in skipped_sections were present but not analyzed (time budget); they get no "add this section" suggestion."""
+    summary_analysis_data = final_sections_analysis.get("summary", {})
+    experience_analysis_data = final_sections_analysis.get("experience", {})
+    skills_analysis_data = final_sections_analysis.get("skills", {})
+    education_analysis_data = final_sections_analysis.get("education", {})
+    projects_analysis_data = final_sections_analysis.get("projects", {})
+
+    present_lower = {k.lower() for k in all_keywords_present}
+    missing_keywords = [skill for skill in COMMON_SKILLS[:50] if skill.lower() not in present_lower]
+
+    # The scores come from the feature record alone, so stored records can be re-scored when the weights change
+    features = extract_features(text, final_sections_analysis, all_keywords_present, missing_keywords)
+    scores = score_features(features, SCORING_WEIGHTS)
+    num_key_sections_found = sum(features[f"has_{name}"] for name in SECTIONS)
     
     suggestions = [] 
-    if not summary_analysis_data: suggestions.append("Add a 'Summary' or 'Objective' section to highlight your value proposition.")
+    if not summary_analysis_data:
+        if "summary" not in skipped_sections: suggestions.append("Add a 'Summary' or 'Objective' section to highlight your value proposition.")
     elif summary_analysis_data.get("clarity",0) < 7 : suggestions.append("Refine your Summary for clarity and conciseness (aim for 2-4 impactful sentences).")
     elif summary_analysis_data.get("impact",0) < 7 : suggestions.append("Boost Summary impact with stronger action verbs and highlight key quantifiable achievements.")
 
-    if not experience_analysis_data: suggestions.append("The 'Experience' section is vital; detail roles with strong action verbs and quantifiable results.")
+    if not experience_analysis_data:
+        if "experience" not in skipped_sections: suggestions.append("The 'Experience' section is vital; detail roles with strong action verbs and quantifiable results.")
     else:
         if experience_analysis_data.get("quantifiable_results_count", 0) < max(1, experience_analysis_data.get("bullet_points_count",0) * 0.25) : suggestions.append("Increase quantifiable results in your Experience section (e.g., 'Increased X by Y%'). Aim for at least 25% of points to be quantified.")
         if experience_analysis_data.get("unique_action_verbs", 0) < max(2, experience_analysis_data.get("bullet_points_count",0) * 0.5) : suggestions.append("Use more varied and strong action verbs at the start of Experience bullet points.")
         if not experience_analysis_data.get("job_titles") and experience_analysis_data.get("bullet_points_count",0) > 0 : suggestions.append("Ensure job titles in Experience are clear and prominent for each role.")
         if not experience_analysis_data.get("dates") and experience_analysis_data.get("bullet_points_count",0) > 1 : suggestions.append("Add employment dates for each role in Experience for better context.")
 
-    if not skills_analysis_data or skills_analysis_data.get("relevance",0) < 7 : suggestions.append("Enhance your 'Skills' section: ensure it's comprehensive, well-organized (e.g., by category like 'Languages', 'Frameworks', 'Tools'), and lists skills relevant to your target roles.")
+    if (not skills_analysis_data and "skills" not in skipped_sections) or (skills_analysis_data and skills_analysis_data.get("relevance",0) < 7) : suggestions.append("Enhance your 'Skills' section: ensure it's comprehensive, well-organized (e.g., by category like 'Languages', 'Frameworks', 'Tools'), and lists skills relevant to your target roles.")
     elif skills_analysis_data and skills_analysis_data.get("organization",0) < 7 : suggestions.append("Improve the organization of your Skills section by grouping related skills or using clear formatting.")
     
-    if not education_analysis_data or education_analysis_data.get("clarity",0) < 7: suggestions.append("Ensure your 'Education' section clearly states degrees, institutions, and graduation dates (or expected). Consider adding GPA if strong, or relevant coursework/honors for recent graduates.")
+    if (not education_analysis_data and "education" not in skipped_sections) or (education_analysis_data and education_analysis_data.get("clarity",0) < 7): suggestions.append("Ensure your 'Education' section clearly states degrees, institutions, and graduation dates (or expected). Consider adding GPA if strong, or relevant coursework/honors for recent graduates.")
 
-    if not projects_analysis_data and ("projects" in extracted_sections_content or len(text.split()) > 450) : 
+    if not projects_analysis_data and "projects" not in skipped_sections and ("projects" in extracted_sections_content or len(text.split()) > 450) : 
         suggestions.append("Consider adding or expanding a 'Projects' section to showcase practical application of your skills, especially personal or academic projects relevant to your field.")
     elif projects_analysis_data:
         if projects_analysis_data.get("tech_keywords_count",0) < projects_analysis_data.get("project_count",1) * 0.5 and projects_analysis_data.get("project_count",0) > 0:
@@ -556,14 +908,132 @@ def analyze_resume_text(text: str) -> dict:
         suggestions.append("Ensure your resume includes standard sections like Experience, Education, and Skills with clear headers for better ATS parsing and readability.")
 
 
-    missing_keywords = [skill for skill in common_skills_list[:50] if skill.lower() not in (k.lower() for k in all_keywords_present)]
-
     analysis = {
-        "score": int(score), "contentQuality": int(content_quality), "atsCompatibility": int(ats_compatibility), "keywordOptimization": int(keyword_optimization),
+        **scores,
         "suggestions": list(set(suggestions)), 
         "keywords": { "present": all_keywords_present, "missing": missing_keywords[:15]}, 
         "sections": final_sections_analysis,
+        "features": features,
         "raw_text_preview": text[:1000] + ("..." if len(text) > 1000 else "")
     }
-    print(f"PYTHON_LOG: spaCy-enhanced analysis complete. Final Score: {score}, Content Quality: {content_quality}")
+    print(f"PYTHON_LOG: Analysis complete. Final Score: {scores['score']}, Content Quality: {scores['contentQuality']}")
     return analysis
+
+
+
+def _analysis_unavailable(text: str):
+    nlp = get_nlp()
+    if not nlp: 
+        return { "error": "NLP model (spaCy) could not be loaded. Analysis features are limited.", 
+            "score": 0, "contentQuality": 0, "atsCompatibility": 0, "keywordOptimization": 0,
+            "suggestions": ["Critical NLP component failed to load. Please contact support."],
+            "keywords": {"present": [], "missing": []}, "sections": {}, "raw_text_preview": text[:1000] }
+
+    if not text.strip(): return empty_text_result()
+    return None
+
+def empty_text_result() -> dict:
+    return { "error": "Could not extract readable text from the resume.",
+        "score": 0, "contentQuality": 0, "atsCompatibility": 0, "keywordOptimization": 0,
+        "suggestions": ["The resume appears to be empty or unreadable. Please upload a text-based PDF."],
+        "keywords": {"present": [], "missing": []}, "sections": {}, "raw_text_preview": "No text extracted." }
+
+def _nothing_analyzed(text: str, budget: TimeBudget) -> dict:
+    # The budget ran out before the parse: only the (cheap) section split is done, and every section is skipped
+    extracted_sections_content = identify_sections(text)
+    skipped_sections = [name for name, _ in scored_sections(extracted_sections_content)]
+    for stage in ["keywords"] + [f"{name}_section" for name in skipped_sections]: budget.skip(stage)
+    return with_partial(combine_section_analyses(text, extracted_sections_content, {}, [], skipped_sections), budget)
+
+def analyze_resume_text(text: str, doc=None, on_section=None, budget: TimeBudget = None) -> dict:
+    """Full analysis of one resume. Pass doc when text has already been parsed (e.g. by nlp.pipe in analyze_resumes).
+    on_section(name, section_analysis), if given, is called as each section's analysis finishes.
+    With a budget, stages (and experience roles) that would start after it runs out are skipped, and the result
+    has "partial": true and "skippedStages".
+    A re-upload with a few lines edited costs little more than the parse: the experience analysis reads nothing
+    from the parse of the whole resume, and its lines and bullets go through pipe_cached(), so only the edited ones
+    are parsed again (on the same worker, within PARSED_PIECES)."""
+    unavailable = _analysis_unavailable(text)
+    if unavailable: return unavailable
+
+    labels = {"size": size_class(len(text))}
+    if doc is None and out_of_time(budget, "parse"): return _nothing_analyzed(text, budget)
+    if doc is None:
+        with timed("parse", **labels) as span:
+            doc = get_nlp()(text) # The only full pipeline pass; every section below is analyzed as a slice of this doc
+            span.set(tokens=token_class(len(doc)))
+    labels["tokens"] = token_class(len(doc))
+    with timed("identify_sections", **labels): section_spans = identify_section_spans(text)
+    extracted_sections_content = {name: text[start:end] for name, (start, end) in section_spans.items()}
+
+    with timed("keywords", **labels): all_keywords_present = sorted(extract_keywords_from_text_spacy(doc, COMMON_SKILLS)) # Sorted, so the order does not depend on the hash seed
+    
+    final_sections_analysis, skipped_sections = {}, set()
+    for name, source in scored_sections(extracted_sections_content):
+        if out_of_time(budget, f"{name}_section"):
+            skipped_sections.add(name)
+            continue
+        with timed(f"{name}_section", **labels):
+            section_analysis = analyze_section(name, section_doc(doc, *section_spans[source]), extracted_sections_content[source], budget)
+        final_sections_analysis[name] = with_resume_offsets(name, section_analysis, section_spans[source][0])
+        if on_section: on_section(name, final_sections_analysis[name])
+    return with_partial(combine_section_analyses(text, extracted_sections_content, final_sections_analysis, all_keywords_present, skipped_sections), budget)
+
+
+def _analyze_resume_batch(texts: list, batch_size: int) -> list:
+    nlp = get_nlp()
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        if not isinstance(text, str): results[i] = {"error": "Resume text must be a string."}
+        elif not nlp or not text.strip(): results[i] = analyze_resume_text(text)
+        else: pending.append(i)
+    docs = nlp.pipe((texts[i] for i in pending), batch_size=batch_size) if pending else []
+    for i, doc in zip(pending, docs):
+        try:
+            results[i] = analyze_resume_text(texts[i], doc=doc)
+        except Exception as e:
+            print(f"PYTHON_ERROR: Batch item {i} failed during analysis: {e}")
+            results[i] = {"error": f"An unexpected error occurred during analysis: {str(e)}"}
+    return results
+
+_batch_pools = {} # n_process -> ProcessPoolExecutor, kept for the life of the process
+_batch_pools_lock = threading.Lock()
+
+def _exit_with_parent(parent_pid: int):
+    # A parent killed without running its exit handlers (kill -9, the OOM killer) would otherwise leave the pool behind
+    while os.getppid() == parent_pid: time.sleep(1)
+    os._exit(1)
+
+def _init_batch_worker(parent_pid: int):
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    preload_nlp()
+
+def batch_pool(n_process: int) -> ProcessPoolExecutor:
+    """This process's pool of n_process analysis workers, started on first use and reused by every later batch.
+    Workers are spawned rather than forked (forking a threaded server can deadlock) and each loads the model once."""
+    with _batch_pools_lock:
+        pool = _batch_pools.get(n_process)
+        if pool is None:
+            pool = _batch_pools[n_process] = ProcessPoolExecutor(max_workers=n_process, mp_context=multiprocessing.get_context("spawn"), initializer=_init_batch_worker, initargs=(os.getpid(),))
+        return pool
+
+def analyze_resumes(texts: list, batch_size: int = 16, n_process: int = 1) -> list:
+    """Analyzes many resume texts, returning one result per input in input order.
+    Texts are parsed with nlp.pipe in batches of batch_size. With n_process > 1 the batches are spread over the
+    long-lived batch_pool(n_process), so both parsing and the per-section analysis run in parallel; each worker uses
+    its own copy of the model. A failing item gets an {"error": ...} result instead of failing the whole batch."""
+    texts = list(texts)
+    batch_size = max(1, int(batch_size))
+    n_process = max(1, min(int(n_process), os.cpu_count() or 1))
+    if n_process == 1 or len(texts) <= batch_size:
+        return _analyze_resume_batch(texts, batch_size)
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    pool = batch_pool(n_process)
+    try:
+        chunk_results = list(pool.map(_analyze_resume_batch, chunks, [batch_size] * len(chunks)))
+    except BrokenProcessPool:
+        with _batch_pools_lock: # A worker died (out of memory?); the next batch starts a fresh pool
+            if _batch_pools.get(n_process) is pool: del _batch_pools[n_process]
+        raise
+    return [result for chunk in chunk_results for result in chunk]
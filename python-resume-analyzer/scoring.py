@@ -0,0 +1,177 @@
+# File: python-resume-analyzer/scoring.py
+# Description: Resume scores (score, contentQuality, atsCompatibility, keywordOptimization) from a versioned numeric
+# feature record and a pluggable weight config. Scoring works on NumPy arrays, so stored feature records can be
+# re-scored in bulk after a weight change without re-running extraction or spaCy.
+# Usage: python scoring.py pack analyses.jsonl features.npz       (feature records, analyses or bulk_analyze.py output)
+#        python scoring.py rescore features.npz [--weights new.json] [--out scores.npz]
+
+import argparse
+import json
+import math
+import os
+import time
+import numpy as np
+
+FEATURE_VERSION = 1 # Bump when a feature is added, removed or computed differently; stored records keep their version
+SECTIONS = ("summary", "experience", "skills", "education", "projects")
+
+# Column order of feature matrices. Only ever append names (and bump FEATURE_VERSION).
+FEATURE_NAMES = (
+    "word_count", "keywords_present", "keywords_missing",
+    "has_summary", "has_experience", "has_skills", "has_education", "has_projects",
+    "summary_clarity", "summary_impact",
+    "experience_roles", "experience_action_verbs", "experience_unique_action_verbs", "experience_quantifiable_results", "experience_bullet_points",
+    "skills_relevance", "skills_organization",
+    "education_clarity",
+    "projects_clarity", "projects_impact", "projects_count", "projects_tech_keywords",
+)
+_COLUMN = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Each section adds weight * (sum of its features times their factors) to the structural score, and weight * max to
+# the total it is normalized by, when it is present. The rest shapes the four published numbers from that score.
+DEFAULT_WEIGHTS = {
+    "name": "default", "version": 1,
+    "sections": {
+        "summary": {"weight": 0.15, "max": 20, "features": {"summary_clarity": 1.0, "summary_impact": 1.0}},
+        "experience": {"weight": 0.30, "max": 30, "features": {"experience_unique_action_verbs": 1.0, "experience_quantifiable_results": 2.0}},
+        "skills": {"weight": 0.15, "max": 20, "features": {"skills_relevance": 1.0, "skills_organization": 1.0}},
+        "education": {"weight": 0.10, "max": 10, "features": {"education_clarity": 1.0}},
+        "projects": {"weight": 0.10, "max": 20, "features": {"projects_clarity": 1.0, "projects_impact": 1.0}},
+    },
+    "structural_scale": 80, "structural_default": 40,
+    "keyword_bonus_per_keyword": 0.75, "keyword_bonus_cap": 20,
+    "score_min": 50, "score_max": 100,
+    "content_quality": {"score_factor": 0.85, "keyword_bonus_factor": 0.4, "per_section": 2.5, "min": 55, "max": 100},
+    "ats": {"offset": -15, "many_keywords": 8, "many_keywords_bonus": 5, "many_sections": 3, "many_sections_bonus": 5, "min": 60, "max": 98},
+    "keyword_optimization": {"per_keyword": 3, "max": 100},
+}
+
+def load_weights(path: str = None) -> dict:
+    """Weight config from a JSON file (default: SCORING_WEIGHTS_PATH, else DEFAULT_WEIGHTS). Keys the file leaves
+    out keep their default; a section's "features" replace the default ones as a whole."""
+    path = path or os.environ.get("SCORING_WEIGHTS_PATH")
+    if not path: return DEFAULT_WEIGHTS
+    with open(path, encoding="utf-8") as f: overrides = json.load(f)
+    weights = {key: (dict(value) if isinstance(value, dict) else value) for key, value in DEFAULT_WEIGHTS.items()}
+    weights["sections"] = {name: dict(section) for name, section in DEFAULT_WEIGHTS["sections"].items()}
+    for key, value in overrides.items():
+        if key == "sections":
+            for name, section in value.items():
+                if name not in SECTIONS: raise ValueError(f"Unknown section '{name}' in {path}")
+                weights["sections"][name].update(section)
+        elif isinstance(weights.get(key), dict): weights[key].update(value)
+        else: weights[key] = value
+    for section in weights["sections"].values():
+        unknown = set(section["features"]) - set(FEATURE_NAMES)
+        if unknown: raise ValueError(f"Unknown features {sorted(unknown)} in {path}")
+    print(f"PYTHON_LOG: Loaded scoring weights '{weights['name']}' (version {weights['version']}) from {path}.")
+    return weights
+
+def extract_features(text: str, final_sections_analysis: dict, all_keywords_present: list, missing_keywords: list) -> dict:
+    """The feature record of one analysis: {"version": FEATURE_VERSION, <name>: number, ...} for every FEATURE_NAMES entry."""
+    summary = final_sections_analysis.get("summary") or {}
+    experience = final_sections_analysis.get("experience") or {}
+    skills = final_sections_analysis.get("skills") or {}
+    education = final_sections_analysis.get("education") or {}
+    projects = final_sections_analysis.get("projects") or {}
+    features = {
+        "word_count": len(text.split()), "keywords_present": len(all_keywords_present), "keywords_missing": len(missing_keywords),
+        **{f"has_{name}": int(bool(final_sections_analysis.get(name))) for name in SECTIONS},
+        "summary_clarity": summary.get("clarity", 0), "summary_impact": summary.get("impact", 0),
+        "experience_roles": len(experience.get("parsed_roles", [])), "experience_action_verbs": experience.get("action_verbs_count", 0),
+        "experience_unique_action_verbs": experience.get("unique_action_verbs", 0), "experience_quantifiable_results": experience.get("quantifiable_results_count", 0),
+        "experience_bullet_points": experience.get("bullet_points_count", 0),
+        "skills_relevance": skills.get("relevance", 0), "skills_organization": skills.get("organization", 0),
+        "education_clarity": education.get("clarity", 0),
+        "projects_clarity": projects.get("clarity", 0), "projects_impact": projects.get("impact", 0),
+        "projects_count": projects.get("project_count", 0), "projects_tech_keywords": projects.get("tech_keywords_count", 0),
+    }
+    return {"version": FEATURE_VERSION, **features}
+
+def features_matrix(records) -> np.ndarray:
+    """(len(records), len(FEATURE_NAMES)) float64 matrix of feature records (or analyses that contain one as "features",
+    or bulk_analyze.py lines)."""
+    rows = []
+    for record in records:
+        record = record.get("result", record) # bulk_analyze.py lines
+        record = record.get("features", record)
+        if record.get("version") != FEATURE_VERSION: raise ValueError(f"Feature record version {record.get('version')} is not {FEATURE_VERSION}; re-analyze to upgrade it.")
+        rows.append([record[name] for name in FEATURE_NAMES])
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(FEATURE_NAMES))
+
+class _ScalarOps:
+    # The NumPy functions _scores() uses, for plain numbers: one record is scored without building arrays
+    where = staticmethod(lambda condition, a, b: a if condition else b)
+    minimum, maximum, trunc = staticmethod(min), staticmethod(max), staticmethod(math.trunc)
+    zeros = staticmethod(lambda n: 0.0)
+    divide = staticmethod(lambda a, b: a / b if b else 0.0)
+
+def _scores(column, n, weights: dict, ops) -> dict:
+    """The score formula, written once for both NumPy columns (ops=np) and single records (ops=_ScalarOps)."""
+    score_total, weights_sum, num_key_sections_found = ops.zeros(n), ops.zeros(n), ops.zeros(n)
+    for name, section in weights["sections"].items():
+        present = column(f"has_{name}") > 0
+        section_sum = ops.zeros(n)
+        for feature, factor in section["features"].items(): section_sum = section_sum + column(feature) * factor
+        score_total = ops.where(present, score_total + section_sum * section["weight"], score_total)
+        weights_sum = ops.where(present, weights_sum + section["weight"] * section["max"], weights_sum)
+        num_key_sections_found = num_key_sections_found + present
+    keywords = column("keywords_present")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_structural_score = ops.where(weights_sum > 0, ops.divide(score_total, weights_sum) * weights["structural_scale"], weights["structural_default"])
+    keyword_bonus = ops.minimum(keywords * weights["keyword_bonus_per_keyword"], weights["keyword_bonus_cap"])
+    score = ops.minimum(ops.maximum(weights["score_min"], ops.trunc(base_structural_score + keyword_bonus)), weights["score_max"])
+    quality = weights["content_quality"]
+    content_quality = ops.minimum(ops.maximum(quality["min"], ops.trunc(score * quality["score_factor"] + keyword_bonus * quality["keyword_bonus_factor"] + num_key_sections_found * quality["per_section"])), quality["max"])
+    ats = weights["ats"]
+    ats_compatibility = ops.minimum(ops.maximum(ats["min"], score + ats["offset"] + ops.where(keywords > ats["many_keywords"], ats["many_keywords_bonus"], 0) + ops.where(num_key_sections_found >= ats["many_sections"], ats["many_sections_bonus"], 0)), ats["max"])
+    optimization = weights["keyword_optimization"]
+    keyword_optimization = ops.minimum(keywords * optimization["per_keyword"], optimization["max"])
+    return {"score": score, "contentQuality": content_quality, "atsCompatibility": ats_compatibility, "keywordOptimization": keyword_optimization}
+
+def score_matrix(features: np.ndarray, weights: dict = None) -> dict:
+    """Scores for every row of a features_matrix() at once: {"score": int64 array, "contentQuality": ..., ...}.
+    Element for element the same arithmetic, and so the same results, as score_features()."""
+    scores = _scores(lambda name: features[:, _COLUMN[name]], features.shape[0], weights or DEFAULT_WEIGHTS, np)
+    return {name: values.astype(np.int64) for name, values in scores.items()}
+
+def score_features(record: dict, weights: dict = None) -> dict:
+    """The four scores of one feature record, as ints."""
+    if record.get("version") != FEATURE_VERSION: raise ValueError(f"Feature record version {record.get('version')} is not {FEATURE_VERSION}; re-analyze to upgrade it.")
+    return {name: int(value) for name, value in _scores(record.__getitem__, None, weights or DEFAULT_WEIGHTS, _ScalarOps).items()}
+
+def save_features(path: str, features: np.ndarray):
+    np.savez(path, features=features, names=np.array(FEATURE_NAMES), version=FEATURE_VERSION)
+
+def load_features(path: str) -> np.ndarray:
+    """A matrix saved by save_features(); its columns are checked against FEATURE_NAMES."""
+    with np.load(path) as saved:
+        if int(saved["version"]) != FEATURE_VERSION or tuple(saved["names"]) != FEATURE_NAMES:
+            raise ValueError(f"{path} holds version {int(saved['version'])} features; this code scores version {FEATURE_VERSION}.")
+        return saved["features"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="JSON lines of feature records or analyses -> .npz feature matrix")
+    pack.add_argument("jsonl")
+    pack.add_argument("out")
+    rescore = commands.add_parser("rescore", help="score a .npz feature matrix with a weight config")
+    rescore.add_argument("features")
+    rescore.add_argument("--weights", help="JSON weight config (default: SCORING_WEIGHTS_PATH or the built-in weights)")
+    rescore.add_argument("--out", help="write the scores to this .npz")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        with open(args.jsonl, encoding="utf-8") as f: records = [json.loads(line) for line in f if line.strip()]
+        features = features_matrix(record for record in records if "features" in record.get("result", record) or "version" in record) # Failures have none
+        save_features(args.out, features)
+        print(f"Packed {len(features)} feature records into {args.out} ({len(records) - len(features)} lines without one skipped).")
+    else:
+        features, weights = load_features(args.features), load_weights(args.weights)
+        start = time.perf_counter()
+        scores = score_matrix(features, weights)
+        elapsed = time.perf_counter() - start
+        print(f"Scored {len(features)} resumes with weights '{weights['name']}' (version {weights['version']}) in {elapsed:.3f}s.")
+        for name, values in scores.items(): print(f"  {name:20} mean {values.mean():6.2f}  min {values.min():3d}  max {values.max():3d}" if len(values) else f"  {name}: -")
+        if args.out: np.savez(args.out, **scores)
@@ -0,0 +1,150 @@
+# File: python-resume-analyzer/skill_matcher.py
+# Description: Skill taxonomy (skills, aliases, categories) loaded from a data file and compiled into a token trie
+# that finds every skill mention in one pass over a document, whatever the size of the taxonomy.
+
+import json
+import os
+import re
+from spacy.attrs import LEMMA, LOWER
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+_END = None # Trie key for "a form ends here"; tokens are never None
+_VERB_POS = ("VERB", "AUX")
+_YEAR = re.compile(r"\s*(?:(?:19|20)\d\d|['’]\d\d)\b") # "2021", "'21"
+_DATE_ENTS = ("DATE", "TIME")
+_COMPANY_SUFFIXES = {"inc", "corp", "corporation", "co", "llc", "ltd", "plc", "gmbh"}
+_LINE_STARTS = {".", "!", "?", "-", "*", "•", "–"}
+
+def ambiguous_form_in_context(doc, start: int, end: int) -> bool:
+    """Whether an ambiguous form at doc[start:end], already at the right casing, reads as the skill here. Not when:
+    it names a date ("Spring 2024", or inside a DATE entity), it names an employer ("at Oracle", "Oracle Corp"), or it
+    opens a line or sentence, where the capital says nothing, and runs into a lowercase word ("Sketch wireframes")."""
+    before = next((token for token in reversed(doc[:start]) if not token.is_space or "\n" in token.text), None)
+    after = next((token for token in doc[end:] if not token.is_space), None)
+    if _YEAR.match(doc[end:end + 3].text) or (after is not None and after.lower_.rstrip(".") in _COMPANY_SUFFIXES): return False
+    if any(token.ent_type_ in _DATE_ENTS for token in doc[start:end]): return False
+    if before is not None and before.lower_ in ("at", "@"): return False
+    line_start = before is None or before.is_space or before.text in _LINE_STARTS
+    runs_on = after is not None and after.i == end and after.is_alpha and after.is_lower and not after.is_stop # Same line, next word
+    return not (line_start and runs_on)
+
+def generate_skill_patterns(skill_list: list):
+    # Token Matcher patterns for a plain skill list, as used before the taxonomy trie (kept for bench_skill_matcher.py).
+    patterns = []
+    for skill in skill_list:
+        skill_lower = skill.lower()
+        pattern_tokens = []
+        if skill_lower == "c#": pattern_tokens = [{"LOWER": "c"}, {"TEXT": "#"}]
+        elif skill_lower == "c++": pattern_tokens = [{"LOWER": "c"}, {"TEXT": {"REGEX": r"(\+\+)"}}]
+        elif ".js" in skill_lower and not skill_lower.startswith("."):
+            parts = skill_lower.rsplit('.', 1)
+            if len(parts) == 2 and parts[1] == "js": pattern_tokens = [{"LOWER": parts[0].replace(" ", "").replace("-", "")}, {"LOWER": "."}, {"LOWER": "js"}]
+            else: pattern_tokens = [{"LOWER": token.strip()} for token in re.split(r'(\s|\.|\#|\+)', skill_lower) if token and token.strip()]
+        elif " " in skill_lower: pattern_tokens = [{"LOWER": token} for token in skill_lower.split()]
+        else: pattern_tokens = [{"LEMMA": skill_lower}]
+        if pattern_tokens: patterns.append({"label": skill.upper(), "pattern": pattern_tokens})
+    return patterns
+
+class SkillTaxonomy:
+    """Canonical skills in file order, each with aliases, a category and the forms that need disambiguation.
+
+    Entries are {"skill": "Kubernetes", "aliases": ["K8s"], "category": "devops"}; "ambiguous": ["Go"] lists forms
+    that are also ordinary words, which only count when written with that casing (or in capitals), not as a verb and
+    not as part of a date or an employer's name.
+    """
+
+    def __init__(self, entries: list):
+        self.entries = [dict(entry, aliases=list(entry.get("aliases", [])), ambiguous=list(entry.get("ambiguous", []))) for entry in entries]
+        self.skills = [entry["skill"] for entry in self.entries]
+        self.category_by_skill = {entry["skill"]: entry.get("category") for entry in self.entries}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_skills(cls, skill_list: list):
+        """A taxonomy with no aliases, for callers that pass their own skill list."""
+        return cls([{"skill": skill} for skill in skill_list])
+
+    @classmethod
+    def load(cls, path: str = None):
+        """Reads a JSON list of entries from path (default: SKILL_TAXONOMY_PATH, else skill_taxonomy.json here)."""
+        path = path or os.environ.get("SKILL_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH
+        with open(path, encoding="utf-8") as f: entries = json.load(f)
+        print(f"PYTHON_LOG: Loaded skill taxonomy with {len(entries)} skills from {path}.")
+        return cls(entries)
+
+    def forms(self):
+        """(skill, form, ambiguous) for every canonical name and alias."""
+        for entry in self.entries:
+            for form in [entry["skill"]] + entry["aliases"]: yield entry["skill"], form, form in entry["ambiguous"]
+
+def build_trie(taxonomy: SkillTaxonomy, tokenize) -> dict:
+    """Nested dicts of token keys, one path per form; tokenize(form) gives the keys (e.g. lowercase token hashes).
+    Where a form ends, node[None] maps each skill to the exact forms it needs (empty: no check, some unambiguous form ends there)."""
+    trie = {}
+    for skill, form, ambiguous in taxonomy.forms():
+        keys = tokenize(form)
+        if not keys: continue
+        node = trie
+        for key in keys: node = node.setdefault(key, {})
+        required = node.setdefault(_END, {})
+        if not ambiguous: required[skill] = frozenset()
+        elif required.get(skill) != frozenset(): required[skill] = required.get(skill, frozenset()) | {form, form.upper()}
+    return trie
+
+def find_in_trie(trie: dict, keys: list, lemmas: list = None):
+    """(start, end, {skill: required forms}) for every form found in a sequence of token keys. Each start walks the
+    trie only as far as the tokens keep matching. With lemmas, single-token unambiguous forms also match on the lemma."""
+    n = len(keys)
+    for i, key in enumerate(keys):
+        if lemmas is not None and lemmas[i] != key:
+            by_lemma = trie.get(lemmas[i])
+            if by_lemma is not None and _END in by_lemma: yield i, i + 1, {skill: forms for skill, forms in by_lemma[_END].items() if not forms}
+        node, j = trie.get(key), i + 1
+        while node is not None:
+            if _END in node: yield i, j, node[_END]
+            if j >= n: break
+            node, j = node.get(keys[j]), j + 1
+
+class SkillMatcher:
+    """Compiles a taxonomy once, with the tokenizer the documents go through, into a trie keyed by lowercase token
+    hashes, then finds skills in any Doc or Span from its LOWER (and LEMMA) arrays.
+
+    A document costs a few dict lookups per token however many skills there are. Single-token forms also match on
+    the lemma when the doc has lemmas ("Microservice" / "microservices"). Ambiguous forms (the "Go" language vs. the
+    verb) are the only matches that look further: at the exact casing, the words around them (ambiguous_form_in_context)
+    and, if the doc is tagged, the part of speech.
+    """
+
+    def __init__(self, tokenizer, taxonomy):
+        if isinstance(taxonomy, (list, tuple)): taxonomy = SkillTaxonomy.from_skills(taxonomy)
+        self.taxonomy = taxonomy
+        self.skill_list = taxonomy.skills
+        self.strings = tokenizer.vocab.strings
+        self.trie = build_trie(taxonomy, lambda form: [token.lower for token in tokenizer(form) if not token.is_space])
+
+    def _match(self, doclike, use_lemmas: bool) -> list:
+        doc = getattr(doclike, "doc", doclike)
+        start, end = (doclike.start, doclike.end) if doclike is not doc else (0, len(doc))
+        lowers = doc.to_array(LOWER)[start:end].tolist() # Doc.to_array is a C loop; Span.to_array and per-token access are not
+        lemmas = None
+        if use_lemmas and doc.has_annotation("LEMMA"):
+            strings = self.strings
+            lemmas = [lemma if lemma == lower else strings[strings[lemma].lower()] for lower, lemma in zip(lowers, doc.to_array(LEMMA)[start:end].tolist())]
+        tagged = doc.has_annotation("POS")
+        found_keywords = set()
+        for match_start, match_end, skills in find_in_trie(self.trie, lowers, lemmas):
+            for skill, forms in skills.items():
+                if skill in found_keywords: continue
+                if forms and (doclike[match_start:match_end].text not in forms or (tagged and doclike[match_start].pos_ in _VERB_POS)
+                              or not ambiguous_form_in_context(doc, start + match_start, start + match_end)): continue
+                found_keywords.add(skill)
+        return list(found_keywords)
+
+    def __call__(self, doclike) -> list:
+        return self._match(doclike, use_lemmas=True)
+
+    def match_surface(self, doclike) -> list:
+        """Matches on token text only, so it also works on tokenizer-only docs (nlp.make_doc) without lemmas or tags."""
+        return self._match(doclike, use_lemmas=False)
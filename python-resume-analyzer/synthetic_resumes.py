@@ -0,0 +1,89 @@
+# File: python-resume-analyzer/synthetic_resumes.py
+# Description: Deterministic synthetic resumes (text and PDF) of controllable size, for benchmarks and load tests.
+
+import os
+import random
+
+ACTION_VERBS = ["led", "developed", "built", "designed", "implemented", "managed", "created", "improved", "reduced", "increased", "optimized", "delivered", "launched", "migrated", "automated", "streamlined", "mentored", "deployed"]
+COMPANIES = ["Acme Corp", "Globex Inc", "Initech LLC", "Stark Industries", "Hooli Inc", "Umbrella Labs", "Wayne Enterprises"]
+UNIVERSITIES = ["Stanford University", "MIT", "University of Texas", "Georgia Institute of Technology"]
+JOB_TITLES = ["Senior Software Engineer", "Data Analyst", "Product Manager", "Backend Developer", "Machine Learning Engineer", "DevOps Engineer"]
+SKILLS = ["Python", "Java", "React", "Docker", "Kubernetes", "AWS", "SQL", "Flask", "Django", "TensorFlow", "Node.js", "C++", "C#", "Machine Learning", "Agile", "GraphQL", "Redis", "PostgreSQL", "Terraform", "Kafka"]
+ALL_SECTIONS = ("summary", "experience", "skills", "education", "projects")
+
+SIZE_PRESETS = {
+    "small": {"roles": 1, "bullets": 3, "projects": 1, "pages": 1},
+    "medium": {"roles": 3, "bullets": 5, "projects": 2, "pages": 2},
+    "large": {"roles": 8, "bullets": 8, "projects": 4, "pages": 4},
+    "long_pdf": {"roles": 20, "bullets": 6, "projects": 6, "pages": 20}, # Above PDF_PARALLEL_MIN_PAGES, so extraction uses the process pool
+}
+
+def synthetic_resume(seed: int = 0, roles: int = 3, bullets: int = 5, projects: int = 2, sections=ALL_SECTIONS) -> str:
+    """Resume text with the given number of experience roles, bullets per role and projects; same seed, same text."""
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe", ""]
+    if "summary" in sections:
+        lines += ["Summary",
+                  f"Engineer who {rng.choice(ACTION_VERBS)} teams and {rng.choice(ACTION_VERBS)} products used by millions. "
+                  f"Skilled in {rng.choice(SKILLS)}, {rng.choice(SKILLS)} and {rng.choice(SKILLS)}. Grew revenue by {rng.randint(5, 60)}%.", ""]
+    if "experience" in sections and roles:
+        lines.append("Experience")
+        for role in range(roles):
+            start_year = 2024 - 2 * (roles - role)
+            lines += [rng.choice(JOB_TITLES), rng.choice(COMPANIES), f"{rng.choice(['Jan', 'Mar', 'Jun', 'Sep'])} {start_year} - {'Present' if role == roles - 1 else f'Dec {start_year + 1}'}"]
+            for _ in range(bullets):
+                lines.append(f"- {rng.choice(ACTION_VERBS).capitalize()} a {rng.choice(SKILLS)} service for {rng.randint(2, 900)} customers, "
+                             f"{rng.choice(['reducing latency by', 'saving', 'improving throughput by'])} {rng.randint(5, 80)}{rng.choice(['%', 'K', ' hours'])}.")
+            lines.append("")
+    if "skills" in sections:
+        lines += ["Skills", ", ".join(rng.sample(SKILLS, 10)), ""]
+    if "education" in sections:
+        lines += ["Education", f"Bachelor of Science in Computer Science, {rng.choice(UNIVERSITIES)}, {rng.randint(2008, 2018)}", f"GPA: 3.{rng.randint(0, 9)}", "Relevant Coursework: Algorithms, Distributed Systems", ""]
+    if "projects" in sections and projects:
+        lines.append("Projects")
+        for project in range(projects):
+            lines += [f"Project {chr(65 + project % 26)}{project} Tracker | {rng.choice(SKILLS)}, {rng.choice(SKILLS)}",
+                      f"- Built a {rng.choice(SKILLS)} app with {rng.choice(SKILLS)} used by {rng.randint(10, 5000)} users."]
+    return "\n".join(lines)
+
+def _pdf_escape(line: str) -> str:
+    line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return line.encode("latin-1", "replace").decode("latin-1")
+
+def text_to_pdf(text: str, pages: int = 1, padding_bytes: int = 0) -> bytes:
+    """Minimal text-only PDF (Helvetica, no external dependencies) with the lines of text spread evenly over pages.
+    padding_bytes adds an unreferenced binary stream of random bytes (standing in for embedded images or fonts),
+    which also makes every padded PDF unique, so uploads of it are never result-cache hits."""
+    lines = text.splitlines()
+    pages = max(1, min(pages, len(lines)))
+    per_page, extra = divmod(len(lines), pages)
+    bounds = [i * per_page + min(i, extra) for i in range(pages + 1)]
+    page_lines = [lines[bounds[i]:bounds[i + 1]] for i in range(pages)]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for chunk in page_lines:
+        content = "\n".join(["BT", "/F1 9 Tf", "11 TL", "40 800 Td"] + [f"({_pdf_escape(line)}) Tj T*" for line in chunk] + ["ET"]).encode("latin-1")
+        page_number, content_number = len(objects) + 1, len(objects) + 2
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>".encode())
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        kids.append(f"{page_number} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+    if padding_bytes: objects.append(b"<< /Length %d >>\nstream\n" % padding_bytes + os.urandom(padding_bytes) + b"\nendstream")
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1) + b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+def synthetic_corpus(size: str = "medium", count: int = 10, seed: int = 0) -> list:
+    """count (text, pdf_bytes) pairs built from one of SIZE_PRESETS."""
+    preset = dict(SIZE_PRESETS[size])
+    pages = preset.pop("pages")
+    corpus = []
+    for i in range(count):
+        text = synthetic_resume(seed + i, **preset)
+        corpus.append((text, text_to_pdf(text, pages)))
+    return corpus
@@ -0,0 +1,71 @@
+# Checks admission control: interactive requests go before queued batch work, full queues and long waits are refused.
+# Run with: python -m pytest test_admission.py  (or python test_admission.py)
+import threading
+import time
+import pytest
+import metrics
+from admission import AdmissionController, Overloaded
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+def take_slot(controller, lane):
+    with controller.slot(lane): pass
+
+def test_interactive_goes_before_queued_batch_work():
+    controller, order = AdmissionController(concurrency=1), []
+    def run(lane):
+        with controller.slot(lane): order.append(lane)
+    with controller.slot("batch"):
+        batch = threading.Thread(target=run, args=("batch",))
+        batch.start()
+        wait_for(lambda: controller.stats()["waiting"]["batch"] == 1)
+        interactive = threading.Thread(target=run, args=("interactive",))
+        interactive.start()
+        wait_for(lambda: controller.stats()["waiting"]["interactive"] == 1)
+    batch.join()
+    interactive.join()
+    assert order == ["interactive", "batch"]
+    assert controller.stats()["running"] == {"interactive": 0, "batch": 0}
+
+def test_full_queue_is_refused_with_retry_after():
+    controller = AdmissionController(concurrency=1, queue_limits={"batch": 1})
+    with controller.slot("interactive"):
+        waiter = threading.Thread(target=take_slot, args=(controller, "batch"))
+        waiter.start()
+        wait_for(lambda: controller.stats()["waiting"]["batch"] == 1)
+        with pytest.raises(Overloaded) as refused:
+            controller.acquire("batch")
+        assert refused.value.reason == "queue_full" and refused.value.lane == "batch"
+        assert refused.value.retry_after >= 1
+    waiter.join()
+    assert controller.stats()["rejected"] == 1
+
+def test_wait_past_the_lane_limit_times_out_and_leaves_the_queue():
+    controller = AdmissionController(concurrency=1, max_waits={"interactive": 0.05})
+    with controller.slot("batch"):
+        with pytest.raises(Overloaded) as refused:
+            controller.acquire("interactive")
+        assert refused.value.reason == "timeout"
+        assert controller.stats()["waiting"] == {"interactive": 0, "batch": 0}
+    with controller.slot("interactive", block=True): pass # The slot is free again
+
+def test_queue_depth_and_wait_time_are_exported():
+    controller = AdmissionController(concurrency=1)
+    with controller.slot("batch"):
+        waiter = threading.Thread(target=take_slot, args=(controller, "interactive"))
+        waiter.start()
+        wait_for(lambda: controller.stats()["waiting"]["interactive"] == 1)
+        rendered = metrics.render_metrics()
+        assert 'resume_analyzer_admission_queued{lane="interactive"} 1' in rendered
+        assert 'resume_analyzer_admission_running{lane="batch"} 1' in rendered
+    waiter.join()
+    assert 'resume_analyzer_admission_wait_seconds_count{lane="interactive",outcome="admitted"}' in metrics.render_metrics()
+
+if __name__ == "__main__":
+    for test in (test_interactive_goes_before_queued_batch_work, test_full_queue_is_refused_with_retry_after,
+                 test_wait_past_the_lane_limit_times_out_and_leaves_the_queue, test_queue_depth_and_wait_time_are_exported): test()
+    print("ok")
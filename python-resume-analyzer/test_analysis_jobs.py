@@ -0,0 +1,82 @@
+# Checks the background analysis job queue against both job stores: progress events, failures, the pending limit
+# and expiry of finished jobs. Needs no spaCy model. Run with: python -m pytest test_analysis_jobs.py  (or python test_analysis_jobs.py)
+import os
+import tempfile
+import threading
+import time
+from analysis_jobs import FINISHED_STATUSES, AnalysisJobQueue, MemoryJobStore, SQLiteJobStore
+
+def with_each_store(test, **options):
+    test(MemoryJobStore(**options))
+    with tempfile.TemporaryDirectory() as tmp: test(SQLiteJobStore(os.path.join(tmp, "jobs.sqlite"), **options))
+
+def wait_until_finished(store, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in FINISHED_STATUSES: return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def sections_job(progress, names):
+    for name in names: progress("section", {"name": name})
+    return {"score": len(names)}
+
+def check_events_and_result(store):
+    queue = AnalysisJobQueue(store, max_workers=1)
+    job_id = queue.submit(sections_job, ["summary", "skills"])
+    job = wait_until_finished(store, job_id)
+    assert job["status"] == "done" and job["result"] == {"score": 2} and job["error"] is None
+    assert store.events(job_id) == [("status", {"status": "running"}), ("section", {"name": "summary"}), ("section", {"name": "skills"}), ("done", {"score": 2})]
+    assert store.events(job_id, after=3) == [("done", {"score": 2})] # A reconnecting reader skips what it has seen
+
+def check_failures(store):
+    queue = AnalysisJobQueue(store, max_workers=1)
+    reported = wait_until_finished(store, queue.submit(lambda progress: {"error": "Failed to read PDF"}))
+    assert reported["status"] == "failed" and reported["error"] == "Failed to read PDF"
+    def crash(progress): raise RuntimeError("boom")
+    crashed = queue.submit(crash)
+    assert wait_until_finished(store, crashed)["error"] == "boom" and store.events(crashed)[-1] == ("failed", {"error": "boom"})
+
+def check_pending_limit(store):
+    queue, release = AnalysisJobQueue(store, max_workers=1, max_pending=2), threading.Event()
+    held = [queue.submit(lambda progress: release.wait(5)) for _ in range(2)] # One running, one queued
+    assert all(held) and queue.submit(sections_job, []) is None
+    release.set()
+    for job_id in held: wait_until_finished(store, job_id)
+    deadline, job_id = time.time() + 5, None
+    while job_id is None and time.time() < deadline: job_id = queue.submit(sections_job, []) # A slot frees just after the job is marked done
+    assert job_id is not None and wait_until_finished(store, job_id)["status"] == "done"
+
+def check_expiry(store):
+    store.create("finished"); store.update("finished", status="done", result={"score": 1}); store.add_event("finished", "done", {"score": 1})
+    store.create("running"); store.update("running", status="running")
+    time.sleep(0.1)
+    store.create("new") # Creating a job sweeps out finished jobs older than the TTL
+    assert store.get("finished") is None and store.events("finished") == []
+    assert store.get("running")["status"] == "running" and store.get("new")["status"] == "queued"
+
+def test_events_and_result():
+    with_each_store(check_events_and_result)
+
+def test_failures():
+    with_each_store(check_failures)
+
+def test_pending_limit():
+    with_each_store(check_pending_limit)
+
+def test_finished_jobs_expire():
+    with_each_store(check_expiry, ttl_seconds=0.05)
+
+def test_sqlite_store_is_shared():
+    # What one gunicorn worker runs, another can report on and stream
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite")
+        job_id = AnalysisJobQueue(SQLiteJobStore(path)).submit(sections_job, ["summary"])
+        other_worker = SQLiteJobStore(path)
+        assert wait_until_finished(other_worker, job_id)["result"] == {"score": 1}
+        assert [event for event, _ in other_worker.events(job_id)] == ["status", "section", "done"]
+
+if __name__ == "__main__":
+    for test in (test_events_and_result, test_failures, test_pending_limit, test_finished_jobs_expire, test_sqlite_store_is_shared): test()
+    print("ok")
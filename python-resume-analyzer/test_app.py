@@ -0,0 +1,118 @@
+# Checks the HTTP routes (/compare, async /analyze and /jobs) with Flask's test client, no server needed, and that
+# /analyze/batch holds an admission slot for all of its work. Needs the spaCy model.
+# Run with: python -m pytest test_app.py  (or python test_app.py)
+import io
+import json
+import os
+import threading
+import time
+
+os.environ.setdefault("RESULT_CACHE_ENABLED", "0")
+import app as app_module
+from admission import AdmissionController
+from analysis_jobs import AnalysisJobQueue, MemoryJobStore
+from app import app
+from synthetic_resumes import synthetic_resume, text_to_pdf
+
+RESUME = "Skills\nPython, Flask, Docker, PostgreSQL\n\nExperience\nBackend Developer at Acme Corp\n- Built Flask APIs in Python\n"
+JOB = "We are hiring a backend developer with Python, Flask and Kubernetes experience."
+PDF = text_to_pdf(synthetic_resume(0))
+
+def submit_async(client):
+    return client.post("/analyze?async=1", data={"file": (io.BytesIO(PDF), "resume.pdf")}, content_type="multipart/form-data")
+
+def read_events(response) -> list:
+    # (id, event, data) for each Server-Sent Event in the response body
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields: events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+def test_compare_one_job_description():
+    response = app.test_client().post("/compare", json={"resumeText": RESUME, "jobDescription": JOB})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body) == {"matching", "missing", "extra", "score", "resumeSkills"}
+    assert "Python" in body["matching"] and "Kubernetes" in body["missing"] and "Docker" in body["extra"]
+    assert body["score"] == round(100 * len(body["matching"]) / (len(body["matching"]) + len(body["missing"])))
+    assert set(body["matching"]) | set(body["extra"]) == set(body["resumeSkills"])
+
+def test_compare_job_description_list():
+    client = app.test_client()
+    response = client.post("/compare", json={"resumeText": RESUME, "jobDescriptions": [JOB, "Docker and PostgreSQL administrator", "   "]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body["results"]) == 3 and "error" in body["results"][2] # A bad entry does not fail the others
+    single = client.post("/compare", json={"resumeText": RESUME, "jobDescription": JOB}).get_json()
+    assert body["results"][0] == {name: single[name] for name in ("matching", "missing", "extra", "score")}
+    assert body["results"][1]["score"] == 100 and body["resumeSkills"] == single["resumeSkills"]
+
+def test_compare_rejects_bad_requests():
+    client = app.test_client()
+    for payload in ({}, {"resumeText": "  ", "jobDescription": JOB}, {"resumeText": RESUME}, {"resumeText": RESUME, "jobDescription": 42},
+                    {"resumeText": RESUME, "jobDescriptions": []}, {"resumeText": RESUME, "jobDescriptions": JOB}):
+        response = client.post("/compare", json=payload)
+        assert response.status_code == 400 and "error" in response.get_json(), payload
+    assert client.post("/compare", data="not json", content_type="text/plain").status_code == 400
+    response = client.post("/compare", json={"resumeText": RESUME, "jobDescription": "   "}) # Blank single job description
+    assert response.status_code == 400 and "error" in response.get_json()
+    os.environ["COMPARE_MAX_JOB_DESCRIPTIONS"] = "2"
+    try:
+        assert client.post("/compare", json={"resumeText": RESUME, "jobDescriptions": [JOB] * 3}).status_code == 400
+    finally:
+        del os.environ["COMPARE_MAX_JOB_DESCRIPTIONS"]
+
+def test_async_analysis_and_event_replay():
+    client = app.test_client()
+    response = submit_async(client)
+    assert response.status_code == 202
+    job_id = response.get_json()["jobId"]
+    assert response.headers["Location"] == f"/jobs/{job_id}"
+    deadline = time.time() + 60
+    while client.get(f"/jobs/{job_id}").get_json()["status"] not in ("done", "failed") and time.time() < deadline: time.sleep(0.05)
+    job = client.get(f"/jobs/{job_id}").get_json()
+    assert job["status"] == "done" and client.get(f"/jobs/{job_id}?fields=score").get_json()["result"] == {"score": job["result"]["score"]}
+
+    events = read_events(client.get(f"/jobs/{job_id}/events"))
+    assert [seq for seq, _, _ in events] == list(range(1, len(events) + 1))
+    assert events[0][1] == "status" and {event for _, event, _ in events[1:-1]} == {"section"} and events[-1][1:] == ("done", job["result"])
+    # A client that reconnects with the last ID it saw gets only the events after it, with the same IDs
+    assert read_events(client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": "2"})) == events[2:]
+    assert read_events(client.get(f"/jobs/{job_id}/events?after=2")) == events[2:]
+
+def test_async_analysis_full_queue_and_unknown_jobs():
+    client, release, saved = app.test_client(), threading.Event(), app_module.analysis_jobs
+    app_module.analysis_jobs = AnalysisJobQueue(MemoryJobStore(), max_workers=1, max_pending=1)
+    try:
+        app_module.analysis_jobs.submit(lambda progress: release.wait(10))
+        response = submit_async(client)
+        assert response.status_code == 503 and response.headers["Retry-After"] and "error" in response.get_json()
+    finally:
+        release.set()
+        app_module.analysis_jobs = saved
+    assert client.get("/jobs/no-such-job").status_code == 404
+    assert client.get("/jobs/no-such-job/events").status_code == 404
+
+def test_batch_holds_a_slot_for_every_chunk():
+    saved = app_module.admission, app_module.analyze_resumes
+    controller, calls = AdmissionController(concurrency=1), []
+    def analyze_resumes(texts, batch_size, n_process=1):
+        calls.append((len(texts), n_process, controller.stats()["running"]["batch"]))
+        return [{"score": 0} for _ in texts]
+    app_module.admission, app_module.analyze_resumes = controller, analyze_resumes
+    try:
+        assert len(app_module.analyze_in_batch_slots(["text"] * 10, batch_size=2, n_process=2)) == 10
+        assert calls == [(4, 2, 1), (4, 2, 1), (2, 2, 1)] # One pool round (2 processes x 2 texts) per slot
+        calls.clear()
+        assert len(app_module.analyze_in_batch_slots(["text"] * 6, batch_size=16, n_process=1)) == 6
+        assert calls == [(4, 1, 1), (2, 1, 1)]
+    finally:
+        app_module.admission, app_module.analyze_resumes = saved
+    assert controller.stats()["running"]["batch"] == 0
+
+if __name__ == "__main__":
+    for test in (test_compare_one_job_description, test_compare_job_description_list, test_compare_rejects_bad_requests,
+                 test_async_analysis_and_event_replay, test_async_analysis_full_queue_and_unknown_jobs,
+                 test_batch_holds_a_slot_for_every_chunk): test()
+    print("ok")
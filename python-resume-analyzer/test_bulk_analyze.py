@@ -0,0 +1,51 @@
+# Checks the bulk CLI: input listing, ordered keyed output with failure kinds, and resuming from a checkpoint.
+# Uses ?mode=lite analysis, so it needs no spaCy model. Run with: python -m pytest test_bulk_analyze.py  (or python test_bulk_analyze.py)
+import json
+import os
+import tempfile
+import pytest
+from bulk_analyze import directory_inputs, manifest_inputs, run
+from synthetic_resumes import synthetic_resume, text_to_pdf
+
+def make_inputs(directory):
+    os.makedirs(os.path.join(directory, "b"))
+    for i, name in enumerate(["b/2.pdf", "a.pdf", "c.PDF", "b/1.pdf"]):
+        with open(os.path.join(directory, name), "wb") as f: f.write(text_to_pdf(synthetic_resume(i)))
+    with open(os.path.join(directory, "blank.pdf"), "wb") as f: f.write(text_to_pdf(""))
+    with open(os.path.join(directory, "broken.pdf"), "wb") as f: f.write(b"%PDF-1.4 not really")
+    with open(os.path.join(directory, "notes.txt"), "w") as f: f.write("skipped")
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f: return [json.loads(line) for line in f]
+
+def test_inputs():
+    with tempfile.TemporaryDirectory() as directory:
+        make_inputs(directory)
+        assert [key for key, _ in directory_inputs(directory)] == ["a.pdf", "blank.pdf", "broken.pdf", "c.PDF", "b/1.pdf", "b/2.pdf"]
+        with open(os.path.join(directory, "manifest.txt"), "w") as f: f.write("# comment\nb/1.pdf\nfirst\ta.pdf\n\n")
+        assert manifest_inputs(os.path.join(directory, "manifest.txt")) == [("b/1.pdf", os.path.join(directory, "b/1.pdf")), ("first", os.path.join(directory, "a.pdf"))]
+
+def test_run_and_resume():
+    with tempfile.TemporaryDirectory() as directory:
+        make_inputs(directory)
+        inputs, out = directory_inputs(directory), os.path.join(directory, "out.jsonl")
+        checkpoint = run(inputs, out, workers=1, mode="lite", checkpoint_every=2)
+        lines = read_lines(out)
+        assert [line["key"] for line in lines] == [key for key, _ in inputs]
+        assert {line["key"]: line.get("failure") for line in lines if "failure" in line} == {"blank.pdf": "no_text", "broken.pdf": "unreadable"}
+        assert lines[0]["result"]["mode"] == "lite" and checkpoint.done == 6 and dict(checkpoint.failures) == {"no_text": 1, "unreadable": 1}
+
+        # A run killed after its third checkpointed line, mid-way through writing the fourth
+        with open(out, "rb") as f: complete = f.read()
+        three_lines = len(b"".join(complete.splitlines(keepends=True)[:3]))
+        with open(out, "wb") as f: f.write(complete[:three_lines] + b'{"key": "bl')
+        with open(out + ".checkpoint") as f: saved = json.load(f)
+        with open(out + ".checkpoint", "w") as f: json.dump(dict(saved, done=3, output_bytes=three_lines, failures={"no_text": 1, "unreadable": 1}), f)
+        assert run(inputs, out, workers=1, mode="lite").failures == checkpoint.failures
+        with open(out, "rb") as f: assert f.read() == complete
+
+        with pytest.raises(ValueError): run(inputs[:2], out, workers=1, mode="lite") # Not the inputs of the checkpoint
+
+if __name__ == "__main__":
+    for test in (test_inputs, test_run_and_resume): test()
+    print("ok")
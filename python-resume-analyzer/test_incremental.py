@@ -0,0 +1,53 @@
+# Checks re-analysis of an edited resume: only the edited experience lines and bullets are parsed again, and the
+# result is the same as analyzing the edited text on a fresh worker.
+# Needs the spaCy model. Run with: python -m pytest test_incremental.py  (or python test_incremental.py)
+import json
+import pytest
+import resume_analyzer
+from resume_analyzer import analyze_resume_text, get_nlp
+from synthetic_resumes import synthetic_resume
+
+def normalized(result):
+    return json.dumps(dict(result, suggestions=sorted(result["suggestions"])), sort_keys=True)
+
+def edits(text):
+    lines = text.splitlines()
+    bullet = next(i for i, line in enumerate(lines) if line.startswith("- "))
+    yield "\n".join(lines[:bullet] + [lines[bullet] + " Cut costs by 30%."] + lines[bullet + 1:]) # Edit one bullet
+    yield "\n".join(lines[:bullet] + lines[bullet + 1:]) # Remove a bullet
+    yield text.replace("Summary\n", "Summary\nPassionate about developer tooling.\n") # Change the summary
+    yield text.replace("Projects\n", "Awards\nHackathon winner\n\nProjects\n") # Add a section
+
+def test_reanalysis_matches_cold_run():
+    if not get_nlp(): pytest.skip("spaCy model not installed")
+    for seed in range(12):
+        text = synthetic_resume(seed, roles=1 + seed % 4, bullets=2 + seed % 3, projects=2)
+        analyze_resume_text(text)
+        for edited in edits(text):
+            warm = analyze_resume_text(edited)
+            resume_analyzer._parsed_pieces.clear()
+            assert normalized(warm) == normalized(analyze_resume_text(edited)), (seed, edited)
+            analyze_resume_text(text)
+
+def test_edited_bullet_is_the_only_piece_parsed_again():
+    nlp = get_nlp()
+    if not nlp: pytest.skip("spaCy model not installed")
+    text = synthetic_resume(5, roles=3, bullets=4)
+    edited = next(edits(text))
+    analyze_resume_text(text)
+    piped, pipe = [], nlp.pipe
+    def recording_pipe(texts, **options):
+        piped.extend(texts)
+        return pipe(texts, **options)
+    nlp.pipe = recording_pipe
+    try:
+        analyze_resume_text(edited)
+    finally:
+        del nlp.pipe
+    edited_line = next(line for line in edited.splitlines() if line.endswith("Cut costs by 30%."))
+    assert sorted(piped) == sorted([edited_line, edited_line[2:]]) # The line (for its entities) and the bullet
+
+if __name__ == "__main__":
+    test_reanalysis_matches_cold_run()
+    test_edited_bullet_is_the_only_piece_parsed_again()
+    print("All re-analysis checks passed.")
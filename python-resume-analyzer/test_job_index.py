@@ -0,0 +1,112 @@
+# Checks for the job recommendation index in job_index.py against a brute-force TF-IDF cosine ranking.
+# Run with: python -m pytest test_job_index.py  (or python test_job_index.py)
+import math
+import multiprocessing
+import os
+import random
+import tempfile
+from job_index import JobSkillIndex, PersistentJobIndex
+
+SKILLS = ["Python", "Java", "Go", "Docker", "Kubernetes", "AWS", "SQL", "React", "Kafka", "Terraform", "C++", "Machine Learning"]
+
+def random_catalog(seed=0, n_jobs=300):
+    rng = random.Random(seed)
+    return {f"job-{i}": rng.sample(SKILLS, rng.randint(0, 6)) for i in range(n_jobs)}
+
+def brute_force_scores(catalog, resume_skills):
+    idf = {s: math.log((1 + len(catalog)) / (1 + sum(s in skills for skills in catalog.values()))) + 1 for s in SKILLS}
+    query = set(resume_skills)
+    query_norm = math.sqrt(sum(idf[s] ** 2 for s in query))
+    scores = {}
+    for job_id, skills in catalog.items():
+        shared = query & set(skills)
+        if shared: scores[job_id] = sum(idf[s] ** 2 for s in shared) / (math.sqrt(sum(idf[s] ** 2 for s in set(skills))) * query_norm)
+    return scores
+
+def check_against_brute_force(index, catalog, rng):
+    for _ in range(20):
+        resume_skills = rng.sample(SKILLS, rng.randint(1, 5))
+        expected = brute_force_scores(catalog, resume_skills)
+        results = index.top_k(resume_skills, k=15)
+        assert len(results) == min(15, len(expected))
+        best_expected = sorted(expected.values(), reverse=True)[:15]
+        assert [r["score"] for r in results] == [round(s, 4) for s in best_expected]
+        for r in results:
+            assert abs(r["score"] - expected[r["jobId"]]) < 1e-4
+            assert set(r["matching"]) == set(resume_skills) & set(catalog[r["jobId"]])
+
+def test_top_k_matches_brute_force():
+    catalog = random_catalog()
+    index = JobSkillIndex(SKILLS)
+    for job_id, skills in catalog.items(): index.add(job_id, skills)
+    check_against_brute_force(index, catalog, random.Random(1))
+
+def test_incremental_updates_and_compaction():
+    catalog = random_catalog(seed=2)
+    index = JobSkillIndex(SKILLS)
+    for job_id, skills in catalog.items(): index.add(job_id, skills)
+    rng = random.Random(3)
+    for job_id in rng.sample(sorted(catalog), 200): # Enough removals to trigger compaction
+        assert index.remove(job_id)
+        del catalog[job_id]
+    assert not index.remove("job-missing")
+    catalog["job-0"] = ["Go", "Kafka"] # Re-adding replaces the old posting
+    index.add("job-0", catalog["job-0"])
+    assert len(index) == len(catalog)
+    check_against_brute_force(index, catalog, rng)
+
+def test_save_and_load_round_trip():
+    catalog = random_catalog(seed=4, n_jobs=100)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite")
+        writer, reader = PersistentJobIndex(SKILLS, path), PersistentJobIndex(SKILLS, path)
+        writer.update(added=catalog, removed=["job-1"])
+        del catalog["job-1"]
+        index = reader.current() # Picks up the other instance's write
+        assert len(index) == len(catalog)
+        check_against_brute_force(index, catalog, random.Random(5))
+
+def test_workers_apply_each_others_changes():
+    # The reader only ever applies the changed rows on top of what it has, and must still rank like a fresh index
+    catalog = random_catalog(seed=6, n_jobs=200)
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite")
+        writer, reader = PersistentJobIndex(SKILLS, path), PersistentJobIndex(SKILLS, path)
+        writer.update(added=catalog)
+        first = reader.current()
+        for step in range(5):
+            removed = rng.sample(sorted(catalog), 30)
+            added = {f"job-{step}-{i}": rng.sample(SKILLS, rng.randint(1, 6)) for i in range(10)}
+            added[removed[0]] = ["Go", "Kafka"] # Re-adding an existing job replaces its skills
+            for job_id in removed: del catalog[job_id]
+            catalog.update(added)
+            assert writer.update(added=added, removed=removed[1:])["total"] == len(catalog)
+            index = reader.current()
+            assert index is first and len(index) == len(catalog)
+            check_against_brute_force(index, catalog, rng)
+        writer.index.save(os.path.join(tmp, "old.npz"))
+        migrated = PersistentJobIndex(SKILLS, os.path.join(tmp, "old.npz")) # Seeds old.sqlite from the .npz
+        assert os.path.exists(os.path.join(tmp, "old.sqlite"))
+        check_against_brute_force(migrated.current(), catalog, rng)
+
+def add_jobs(path, worker, n_jobs):
+    index = PersistentJobIndex(SKILLS, path)
+    for i in range(n_jobs): index.update(added={f"worker-{worker}-job-{i}": SKILLS[i % len(SKILLS):][:3]})
+
+def test_concurrent_updates_from_several_processes():
+    # Each process stands in for a gunicorn worker with its own copy of the index; no update may be lost
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.sqlite")
+        workers = [multiprocessing.get_context("fork").Process(target=add_jobs, args=(path, worker, 20)) for worker in range(4)]
+        for process in workers: process.start()
+        for process in workers: process.join()
+        assert len(PersistentJobIndex(SKILLS, path).current()) == 4 * 20
+
+if __name__ == "__main__":
+    test_top_k_matches_brute_force()
+    test_incremental_updates_and_compaction()
+    test_save_and_load_round_trip()
+    test_workers_apply_each_others_changes()
+    test_concurrent_updates_from_several_processes()
+    print("All job index checks passed.")
@@ -0,0 +1,32 @@
+# Checks ?mode=lite analysis: skill index tokens and aliases, role segmentation and the response shape. Needs no spaCy model.
+# Run with: python -m pytest test_lite_analyzer.py  (or python test_lite_analyzer.py)
+from lite_analyzer import analyze_resume_text_lite, analyze_resumes_lite, get_lite_skill_index, segment_experience_lite, tokenize
+from synthetic_resumes import synthetic_resume
+
+def test_skill_index():
+    assert tokenize("Node.js, C++ and CI/CD.") == ["node.js", ",", "c", "+", "+", "and", "ci", "/", "cd", "."]
+    index = get_lite_skill_index()
+    found = index("Ran K8s on Amazon Web Services with Postgres, ReactJS, Node.js and C#; built microservices.")
+    assert {"Kubernetes", "AWS", "PostgreSQL", "React", "Node.js", "C#", "Microservices"} <= set(found)
+    assert "JavaScript" not in found # "js" inside "Node.js" is not a separate token
+    assert set(index("Languages: Go, Rust")) == {"Go", "Rust"} and index("we go where rust is") == []
+
+def test_segment_experience():
+    experience = "\n".join(synthetic_resume(1).split("Experience\n", 1)[1].split("\nSkills\n")[0].splitlines())
+    roles = segment_experience_lite(experience)
+    assert [role["dates_guess"] for role in roles] == ["Sep 2018 - Dec 2019", "Mar 2020 - Dec 2021", "Jun 2022"]
+    assert [role["company_guess"] for role in roles][:2] == ["Stark Industries", "Initech LLC"]
+    assert all(role["bullet_points_count"] == 5 for role in roles)
+    assert all(experience[slice(*role["role_offsets"])] == role["role_text"] for role in roles)
+
+def test_result_shape():
+    result = analyze_resume_text_lite(synthetic_resume(2))
+    assert result["mode"] == "lite" and 50 <= result["score"] <= 100
+    assert {"score", "contentQuality", "atsCompatibility", "keywordOptimization", "suggestions", "keywords", "sections", "raw_text_preview"} <= set(result)
+    assert set(result["sections"]) == {"summary", "experience", "skills", "education", "projects"}
+    assert "error" in analyze_resume_text_lite("  ")
+    assert analyze_resumes_lite([synthetic_resume(2), None])[1] == {"error": "Resume text must be a string."}
+
+if __name__ == "__main__":
+    for test in (test_skill_index, test_segment_experience, test_result_shape): test()
+    print("ok")
@@ -0,0 +1,65 @@
+# Regression checks for the precompiled pattern bank in patterns.py.
+# Each check compares against the per-call re.* code the analyzer used before the patterns were precompiled.
+# Run with: python -m pytest test_patterns.py  (or python test_patterns.py)
+import re
+from patterns import QUANTIFIABLE_PATTERNS, count_quantifiables, match_section_header, DEGREE_RES, DEGREE_KEYWORD_PATTERNS
+
+LEGACY_SECTION_PATTERNS = {
+    "summary": r"(?i)^\s*(summary|objective|profile|about\s+me|professional\s+profile)\s*[:\-\s]*$",
+    "experience": r"(?i)^\s*(experience|professional\s+experience|work\s+history|employment|career\s+history|relevant\s+experience)\s*[:\-\s]*$",
+    "education": r"(?i)^\s*(education|academic\s+background|qualifications|academic\s+profile)\s*[:\-\s]*$",
+    "skills": r"(?i)^\s*(skills|technical\s+skills|core\s+competencies|proficiencies|technical\s+expertise|technologies)\s*[:\-\s]*$",
+    "projects": r"(?i)^\s*(projects|personal\s+projects|portfolio|key\s+projects|technical\s+projects|selected\s+projects)\s*[:\-\s]*$",
+    "awards": r"(?i)^\s*(awards|honors|recognitions|achievements)\s*[:\-\s]*$",
+    "publications": r"(?i)^\s*(publications|presentations)\s*[:\-\s]*$",
+    "references": r"(?i)^\s*(references)\s*[:\-\s]*$",
+    "contact": r"(?i)^\s*(contact|contact\s+information|personal\s+details)\s*[:\-\s]*$"
+}
+
+HEADER_LINES = [
+    "Summary", "SUMMARY:", "Professional Profile", "Academic Profile", "About Me -", "Work History", "Experience 2020",
+    "Technical Skills", "Core Competencies:", "Key Projects", "Portfolio", "Awards", "Honors", "Publications", "References",
+    "Contact Information", "Personal Details", "Skills and interests", "Education", "Qualifications", "Profile", "Employment",
+    "Relevant Experience", "Selected Projects", "Developed a new skills matrix", "Technologies", "Objective:", "projects -",
+]
+
+QUANTIFIABLE_TEXTS = [
+    "- Increased revenue by 25% and reduced costs by $1,200,000 across 3 regions.",
+    "- Managed 12 engineers; improved throughput to 3.5K requests/s, grew users over 40,000.",
+    "- Saved approx. 200 hours per quarter; delivered 15 releases and closed more than 300 tickets.",
+    "- Led 4 projects worth €2.5M; exceeded 120% of target; surpassed 10 downloads milestone.",
+    "- Optimized queries by 3x; achieved 99.9% uptime for at least 50 customers and 1,000 users.",
+    "No numbers here at all.",
+    "Increased increased 5 5 5% 5%% $ 5 £5,000.50 up to 7 less than 2 about 1 under 9.5 12m 7B 8k",
+]
+
+EDUCATION_TEXT = """Bachelor of Science in Computer Science, Stanford University, 2015
+M.S. in Data Science (2018); MBA; Ph.D. of Physics; B.Tech; Diploma in Design; Associate's degree
+Master of Business Administration, B.A. History, M.A. Economics, Doctorate, Certificate in Cloud Computing"""
+
+def legacy_section_name(line_stripped):
+    for section_name, pattern in LEGACY_SECTION_PATTERNS.items():
+        if re.match(pattern, line_stripped) and len(line_stripped.split()) < 7 and not any(char.isdigit() for char in line_stripped):
+            return section_name
+    return None
+
+def test_section_headers_match_legacy_patterns():
+    for line in HEADER_LINES:
+        assert match_section_header(line.strip()) == legacy_section_name(line.strip()), line
+
+def test_quantifiable_counts_unchanged():
+    for text in QUANTIFIABLE_TEXTS + ["\n".join(QUANTIFIABLE_TEXTS)]:
+        counts = count_quantifiables(text)
+        for name, pattern in QUANTIFIABLE_PATTERNS.items():
+            assert counts[name] == len(re.findall(pattern, text, re.IGNORECASE)), (name, text)
+
+def test_degree_matches_unchanged():
+    for keyword_pattern, degree_re in zip(DEGREE_KEYWORD_PATTERNS, DEGREE_RES):
+        legacy = [m.group(0) for m in re.finditer(keyword_pattern + r"(?:\s+(?:in|of)\s+[\w\s\(\)&/-]+)?", EDUCATION_TEXT, re.IGNORECASE)]
+        assert [m.group(0) for m in degree_re.finditer(EDUCATION_TEXT)] == legacy, keyword_pattern
+
+if __name__ == "__main__":
+    test_section_headers_match_legacy_patterns()
+    test_quantifiable_counts_unchanged()
+    test_degree_matches_unchanged()
+    print("All pattern regression checks passed.")
@@ -0,0 +1,65 @@
+# Checks request profiling: admin-only cProfile captures, slow-request sampling to speedscope JSON, and retention.
+# Needs no spaCy model. Run with: python -m pytest test_profiling.py  (or python test_profiling.py)
+import json
+import pstats
+import tempfile
+import time
+import profiling
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end: sum(range(1000))
+
+def with_settings(test, **settings):
+    # The PROFILE_* settings are read from the environment at import; each test swaps in its own and a fresh directory
+    with tempfile.TemporaryDirectory() as directory:
+        settings["PROFILE_DIR"] = directory
+        saved = {name: getattr(profiling, name) for name in settings}
+        for name, value in settings.items(): setattr(profiling, name, value)
+        try:
+            test()
+        finally:
+            for name, value in saved.items(): setattr(profiling, name, value)
+
+def check_triggers():
+    assert isinstance(profiling.request_profile({"X-Profile": "1"}, "/analyze"), profiling._NoProfile) # Not an admin
+    assert isinstance(profiling.request_profile({"X-Profile": "1", "X-Admin-Token": "wrong"}, "/analyze"), profiling._NoProfile)
+    with profiling.request_profile({"X-Profile": "1", "X-Admin-Token": "s3cret"}, "/analyze") as profile:
+        busy(0.01)
+        profile.document = profiling.document_summary("pdf", 1234, {"features": {"version": 1, "word_count": 500, "experience_roles": 40}})
+    [capture] = profiling.list_captures()
+    assert capture["id"] == profile.capture_id and capture["trigger"] == "admin" and capture["format"] == "pstats"
+    assert capture["document"] == {"kind": "pdf", "bytes": 1234, "partial": False, "error": False, "word_count": 500, "experience_roles": 40}
+    path, kind = profiling.capture_file(profile.capture_id)
+    assert kind == "pstats" and any(name == "busy" for _, _, name in pstats.Stats(path).stats)
+
+def check_slow_sampling():
+    with profiling.request_profile({}, "/analyze") as fast: pass
+    assert fast.capture_id is None
+    with profiling.request_profile({}, "/analyze") as slow: busy(0.1)
+    path, kind = profiling.capture_file(slow.capture_id)
+    with open(path) as f: speedscope = json.load(f)
+    frames, [sampled] = speedscope["shared"]["frames"], speedscope["profiles"]
+    assert kind == "speedscope" and sampled["type"] == "sampled" and len(sampled["samples"]) == len(sampled["weights"]) > 5
+    assert sum("busy" in [frames[i]["name"] for i in sample] for sample in sampled["samples"]) >= len(sampled["samples"]) * 0.8
+    assert profiling.capture_file("../../etc/passwd") is None
+
+def check_retention():
+    ids = []
+    for _ in range(5):
+        with profiling.request_profile({}, "/analyze") as profile: busy(0.03)
+        ids.append(profile.capture_id)
+    assert [capture["id"] for capture in profiling.list_captures()] == ids[:-4:-1] # The newest 3
+
+def test_admin_trigger():
+    with_settings(check_triggers, PROFILE_ADMIN_TOKEN="s3cret", PROFILE_SLOW_MS=0)
+
+def test_slow_sampling():
+    with_settings(check_slow_sampling, PROFILE_ADMIN_TOKEN=None, PROFILE_SLOW_MS=50, PROFILE_SAMPLE_MS=2)
+
+def test_retention():
+    with_settings(check_retention, PROFILE_SLOW_MS=20, PROFILE_MAX_CAPTURES=3)
+
+if __name__ == "__main__":
+    for test in (test_admin_trigger, test_slow_sampling, test_retention): test()
+    print("ok")
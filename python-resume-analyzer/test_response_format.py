@@ -0,0 +1,47 @@
+# Checks ?fields= / ?compact=1 selection on analysis results. Run with: python -m pytest test_response_format.py
+import json
+from response_format import COMPACT_FIELDS, FastJSONProvider, requested_fields, select_fields
+
+RESULT = {
+    "score": 80, "contentQuality": 75, "atsCompatibility": 90, "keywordOptimization": 60,
+    "keywords": {"present": ["Python"], "missing": ["Docker"]}, "suggestions": ["Add metrics."], "raw_text_preview": "Jane Doe...",
+    "sections": {
+        "skills": {"relevance": 70, "feedback": "Good."},
+        "experience": {"feedback": "Ok.", "parsed_roles": [
+            {"role_text": "Engineer at Acme", "role_offsets": [10, 26], "title_guess": "Engineer"},
+            {"role_text": "Analyst at Initech", "role_offsets": [27, 45], "title_guess": "Analyst"},
+        ]},
+    },
+}
+
+def test_requested_fields():
+    assert requested_fields({}) is None
+    assert requested_fields({"compact": "1"}) == COMPACT_FIELDS
+    assert requested_fields({"compact": "1", "fields": "score, keywords.missing,"}) == ("score", "keywords.missing")
+
+def test_compact_and_paths():
+    assert select_fields(RESULT, COMPACT_FIELDS) == {k: RESULT[k] for k in COMPACT_FIELDS}
+    assert select_fields(RESULT, ("keywords.missing", "sections.experience.parsed_roles.title_guess", "nope.x")) == {
+        "keywords": {"missing": ["Docker"]}, "sections": {"experience": {"parsed_roles": [{"title_guess": "Engineer"}, {"title_guess": "Analyst"}]}},
+    }
+    assert select_fields(RESULT, ("sections.skills", "sections"))["sections"]["skills"] == RESULT["sections"]["skills"]
+    assert select_fields(RESULT, None) is RESULT and select_fields({"error": "x"}, ("score",)) == {"error": "x"}
+
+def test_role_text_only_when_named():
+    roles = select_fields(RESULT, ("sections",))["sections"]["experience"]["parsed_roles"]
+    assert roles == [{"role_offsets": [10, 26], "title_guess": "Engineer"}, {"role_offsets": [27, 45], "title_guess": "Analyst"}]
+    roles = select_fields(RESULT, ("sections.experience.parsed_roles.role_text",))["sections"]["experience"]["parsed_roles"]
+    assert roles == [{"role_text": "Engineer at Acme"}, {"role_text": "Analyst at Initech"}]
+
+def test_fast_provider_matches_stdlib():
+    from flask import Flask
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    with app.app_context():
+        body = app.json.response(RESULT).get_data()
+    assert json.loads(body) == RESULT
+    assert list(json.loads(body)) == sorted(RESULT) # Flask's sorted keys are kept
+
+if __name__ == "__main__":
+    for test in (test_requested_fields, test_compact_and_paths, test_role_text_only_when_named, test_fast_provider_matches_stdlib): test()
+    print("ok")
@@ -0,0 +1,79 @@
+# Tests for the two-tier result cache: TTL and LRU in memory, the shared SQLite tier, and size-based eviction.
+# Run with: python -m pytest test_result_cache.py  (or python test_result_cache.py)
+import contextlib
+import os
+import sqlite3
+import tempfile
+import time
+from result_cache import ResultCache
+
+def disk_rows(db_path: str) -> tuple:
+    # (rows actually stored, the size row the cache keeps)
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        counted = conn.execute("SELECT COUNT(*), COALESCE(SUM(length(value)), 0) FROM results").fetchone()
+        return counted, conn.execute("SELECT entries, bytes FROM results_size").fetchone()
+
+def test_memory_entries_expire():
+    cache = ResultCache(ttl_seconds=0.05)
+    cache.set("a", {"score": 1})
+    assert cache.get("a") == {"score": 1}
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["expired"], stats["memory_entries"], stats["memory_bytes"]) == (1, 0, 0)
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.set("a", {"n": 1}); cache.set("b", {"n": 2})
+    cache.get("a") # b is now the least recently used
+    cache.set("c", {"n": 3})
+    assert cache.get("b") is None and cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+
+def test_memory_tier_evicts_by_size():
+    value = {"text": "x" * 1000}
+    cache = ResultCache(max_entries=100, max_bytes=2500)
+    for key in "abc": cache.set(key, value)
+    assert cache.get("a") is None and cache.get("c") == value
+    assert cache.stats()["memory_bytes"] <= 2500
+
+def test_disk_tier_is_shared_between_caches():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "results.sqlite")
+        first, second = ResultCache(db_path=db_path), ResultCache(db_path=db_path) # Two workers on one host
+        first.set("a", {"score": 7})
+        assert second.get("a") == {"score": 7}
+        assert second.stats()["disk_hits"] == 1
+        assert second.get("a") == {"score": 7} and second.stats()["memory_hits"] == 1
+        first.set("a", {"score": 8}) # Replacing an entry must not count it twice
+        assert disk_rows(db_path) == ((1, len('{"score": 8}')),) * 2
+
+def test_disk_tier_evicts_oldest_by_count_and_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "results.sqlite")
+        cache = ResultCache(max_entries=1, db_path=db_path, db_max_entries=3)
+        for i in range(5): cache.set(f"k{i}", {"n": i})
+        (entries, size), kept = disk_rows(db_path)
+        assert entries == 3 and kept == (entries, size)
+        assert cache.get("k0") is None and cache.get("k1") is None and cache.get("k2") == {"n": 2}
+
+        value = {"text": "y" * 1000}
+        sized = ResultCache(max_entries=1, db_path=db_path, db_max_entries=100, db_max_bytes=3500)
+        for i in range(5): sized.set(f"big{i}", value)
+        (entries, size), kept = disk_rows(db_path)
+        assert size <= 3500 and kept == (entries, size)
+        assert sized.get("big4") == value and sized.get("big0") is None
+
+def test_disk_entries_expire():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "results.sqlite")
+        ResultCache(db_path=db_path, ttl_seconds=0.05).set("a", {"n": 1})
+        time.sleep(0.1)
+        cache = ResultCache(db_path=db_path, ttl_seconds=0.05)
+        assert cache.get("a") is None and cache.stats()["expired"] == 1
+        assert disk_rows(db_path) == ((0, 0),) * 2
+
+if __name__ == "__main__":
+    for test in (test_memory_entries_expire, test_memory_tier_evicts_least_recently_used, test_memory_tier_evicts_by_size,
+                 test_disk_tier_is_shared_between_caches, test_disk_tier_evicts_oldest_by_count_and_size, test_disk_entries_expire): test()
+    print("ok")
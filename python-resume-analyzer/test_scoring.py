@@ -0,0 +1,46 @@
+# Checks the feature record / score split: bulk and per-record scoring agree, weight configs apply, versions are enforced.
+# Run with: python -m pytest test_scoring.py  (or python test_scoring.py)
+import json
+import os
+import tempfile
+import numpy as np
+import pytest
+from scoring import FEATURE_NAMES, FEATURE_VERSION, features_matrix, load_features, load_weights, save_features, score_features, score_matrix
+
+def record(**features):
+    return {"version": FEATURE_VERSION, **{name: 0 for name in FEATURE_NAMES}, **features}
+
+RECORDS = [
+    record(),
+    record(keywords_present=12, has_summary=1, summary_clarity=8, summary_impact=6, has_experience=1, experience_unique_action_verbs=7, experience_quantifiable_results=5),
+    record(keywords_present=3, has_skills=1, skills_relevance=10, skills_organization=4, has_education=1, education_clarity=9, has_projects=1, projects_clarity=9, projects_impact=4.5),
+]
+
+def test_matrix_matches_records():
+    scores = score_matrix(features_matrix(RECORDS))
+    assert [{name: int(values[i]) for name, values in scores.items()} for i in range(len(RECORDS))] == [score_features(r) for r in RECORDS]
+    assert score_features(RECORDS[0]) == {"score": 50, "contentQuality": 55, "atsCompatibility": 60, "keywordOptimization": 0}
+
+def test_weight_override():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "weights.json")
+        with open(path, "w") as f: json.dump({"name": "keywords-heavy", "keyword_optimization": {"per_keyword": 10}}, f)
+        weights = load_weights(path)
+    assert weights["keyword_optimization"] == {"per_keyword": 10, "max": 100} and weights["sections"]["summary"]["weight"] == 0.15
+    assert score_features(RECORDS[1], weights)["keywordOptimization"] == 100 and score_features(RECORDS[1])["keywordOptimization"] == 36
+    assert score_features(RECORDS[1], weights)["score"] == score_features(RECORDS[1])["score"]
+
+def test_versions_enforced():
+    with pytest.raises(ValueError): score_features(dict(RECORDS[1], version=FEATURE_VERSION + 1))
+    with pytest.raises(ValueError): features_matrix([{"features": dict(RECORDS[1], version=0)}])
+
+def test_save_load_round_trip():
+    features = features_matrix(RECORDS)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "features.npz")
+        save_features(path, features)
+        assert np.array_equal(load_features(path), features)
+
+if __name__ == "__main__":
+    for test in (test_matrix_matches_records, test_weight_override, test_versions_enforced, test_save_load_round_trip): test()
+    print("ok")
@@ -0,0 +1,57 @@
+# Checks that section slices of the one parsed resume Doc count sentences as a separate nlp() of each section did,
+# and that batching experience lines and bullets through nlp.pipe() segments roles as one nlp() call per line did.
+# Needs the spaCy model. Run with: python -m pytest test_section_slices.py  (or python test_section_slices.py)
+import resume_analyzer
+from resume_analyzer import analyze_individual_job_entry, get_nlp, identify_section_spans, section_doc, section_sents, segment_experience
+from synthetic_resumes import synthetic_resume
+
+UNTITLED_SUMMARY = "John Smith\nSoftware engineer with 5 years of experience building web services.\n\nExperience\nSoftware Engineer at Google\n"
+
+def test_summary_sentences_match_a_separate_parse():
+    nlp = get_nlp()
+    texts = [synthetic_resume(seed) for seed in range(12)] + [UNTITLED_SUMMARY]
+    for text in texts:
+        doc = nlp(text)
+        for name, (start, end) in identify_section_spans(text).items():
+            if not name.startswith("summary"): continue
+            assert len(section_sents(section_doc(doc, start, end))) == len(list(nlp(text[start:end]).sents)), (name, text[start:end])
+
+def test_sentences_touching_a_section_are_not_counted():
+    # spaCy's Span.sents also yields a sentence that starts on the doc's last token right after the span (here the
+    # trailing newline); clipped to the span it is empty and must not count as a second sentence or bullet
+    text = "Experience\nSoftware Engineer at Google\n"
+    doc = get_nlp().make_doc(text)
+    for token in doc: token.is_sent_start = token.i in (0, len(doc) - 1)
+    role_start, role_text = text.index("Software"), "Software Engineer at Google"
+    role = section_doc(doc, role_start, role_start + len(role_text))
+    assert [sent.text for sent in section_sents(role)] == [role_text]
+    assert analyze_individual_job_entry(role_text)["bullet_points_count"] == 1
+
+def test_batched_experience_parses_match_one_parse_per_line():
+    nlp = get_nlp()
+    experiences = []
+    for seed in range(12):
+        text = synthetic_resume(seed)
+        start, end = identify_section_spans(text)["experience"]
+        experiences.append(text[start:end])
+    batched = [segment_experience(experience) for experience in experiences]
+    for roles in batched:
+        for role in roles: # A company is only ever read from a line's own entities, never the whole section's
+            line_orgs = {ent.text for line in role["role_text"].splitlines() if line.strip() for ent in nlp(line.strip()).ents if ent.label_ == "ORG"}
+            assert role["company_guess"] == "N/A" or role["company_guess"] in line_orgs, role
+    piped = []
+    def one_call_per_text(texts, disable=()):
+        piped.extend(texts)
+        return [nlp(text, disable=disable) for text in texts]
+    resume_analyzer._parsed_pieces.clear() # Otherwise the second pass is served from the first one's parses
+    nlp.pipe = one_call_per_text
+    try:
+        assert batched == [segment_experience(experience) for experience in experiences]
+    finally:
+        del nlp.pipe
+    lines = {line.strip() for experience in experiences for line in experience.splitlines() if line.strip()}
+    assert lines <= set(piped) # Every line went through nlp() on its own
+
+if __name__ == "__main__":
+    for test in (test_summary_sentences_match_a_separate_parse, test_sentences_touching_a_section_are_not_counted, test_batched_experience_parses_match_one_parse_per_line): test()
+    print("ok")
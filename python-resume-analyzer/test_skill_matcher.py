@@ -0,0 +1,51 @@
+# Checks the skill taxonomy trie: aliases map to canonical skills and ambiguous forms like "Go" need the right casing and
+# context. Needs the spaCy model. Run with: python -m pytest test_skill_matcher.py  (or python test_skill_matcher.py)
+import pytest
+from resume_analyzer import get_nlp, get_skill_matcher, COMMON_SKILLS, SKILL_TAXONOMY
+from skill_matcher import SkillMatcher, SkillTaxonomy
+
+def matcher():
+    if not get_nlp(): pytest.skip("spaCy model not installed")
+    return get_skill_matcher(COMMON_SKILLS)
+
+def test_taxonomy_file():
+    assert len(set(COMMON_SKILLS)) == len(COMMON_SKILLS)
+    forms = [form.lower() for _, form, _ in SKILL_TAXONOMY.forms()]
+    assert len(set(forms)) == len(forms) # No alias is claimed by two skills
+    assert SKILL_TAXONOMY.category_by_skill["Kubernetes"] == "devops"
+
+def test_aliases_map_to_canonical_skills():
+    m, nlp = matcher(), get_nlp()
+    text = "Ran K8s on Amazon Web Services with Postgres, ReactJS and C#; built RESTful APIs, pipelines in PySpark."
+    expected = {"Kubernetes", "AWS", "PostgreSQL", "React", "C#", "REST APIs", "Apache Spark"}
+    assert set(m(nlp(text))) == expected
+    assert set(m.match_surface(nlp.make_doc(text))) == expected
+
+def test_ambiguous_forms():
+    m, nlp = matcher(), get_nlp()
+    assert set(m.match_surface(nlp.make_doc("Languages: Go, Rust, LESS"))) == {"Go", "Rust", "LESS"}
+    assert set(m.match_surface(nlp.make_doc("we go where less rust is, and went on"))) == set()
+    assert set(m.match_surface(nlp.make_doc("Golang services"))) == {"Go"} # Unambiguous alias
+
+def test_ambiguous_forms_in_context():
+    m, nlp = matcher(), get_nlp()
+    for text in ("B.S. Computer Science, expected Spring 2024", "Teaching Assistant, Spring 2021", "Intern, Spring '22",
+                 "Software Engineer at Oracle, 2019 - 2021", "Intern, Oracle Corporation", "Organized the Holiday Bash 2022",
+                 "Sketch artist for the campus paper", "- Sketch wireframes for the mobile app"):
+        assert m(nlp(text)) == [] and m.match_surface(nlp.make_doc(text)) == [], text
+    kept = {"Skills: Spring, Oracle, Sketch, Bash": {"Spring", "Oracle", "Sketch", "Bash"}, "Built Spring services on Oracle\nBash": {"Spring", "Oracle", "Bash"},
+            "Designed screens in Sketch and Figma": {"Sketch", "Figma"}, "Senior Go Developer": {"Go"}}
+    for text, skills in kept.items():
+        assert set(m(nlp(text))) == skills and set(m.match_surface(nlp.make_doc(text))) == skills, text
+
+def test_custom_skill_list_and_spans():
+    nlp = get_nlp() or pytest.skip("spaCy model not installed")
+    custom = SkillMatcher(nlp.tokenizer, ["Python", "Machine Learning"])
+    doc = nlp("Python and machine learning. Also python.")
+    assert sorted(custom(doc)) == ["Machine Learning", "Python"]
+    assert custom(doc[2:5]) == ["Machine Learning"]
+    assert SkillMatcher(nlp.tokenizer, SkillTaxonomy([{"skill": "Go", "ambiguous": ["Go"]}])).match_surface(nlp.make_doc("go")) == []
+
+if __name__ == "__main__":
+    for test in (test_taxonomy_file, test_aliases_map_to_canonical_skills, test_ambiguous_forms, test_ambiguous_forms_in_context, test_custom_skill_list_and_spans): test()
+    print("ok")
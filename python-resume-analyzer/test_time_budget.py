@@ -0,0 +1,62 @@
+# Checks time-budgeted analysis: stages after the budget runs out are skipped and listed.
+# Needs the spaCy model. Run with: python -m pytest test_time_budget.py  (or python test_time_budget.py)
+import time
+import pytest
+import resume_analyzer
+from resume_analyzer import TimeBudget, analyze_resume_text, get_nlp, identify_section_spans, segment_experience
+from synthetic_resumes import synthetic_resume
+
+class CheckBudget(TimeBudget):
+    """Runs out after a fixed number of checks instead of a wall-clock deadline, so the cut-off point is deterministic."""
+
+    def __init__(self, checks: int):
+        super().__init__(0)
+        self.checks_left = checks
+
+    def exhausted(self, stage: str) -> bool:
+        self.checks_left -= 1
+        if self.checks_left >= 0: return False
+        self.skip(stage)
+        return True
+
+def needs_model():
+    if not get_nlp(): pytest.skip("spaCy model not installed")
+
+def test_generous_budget_is_complete():
+    needs_model()
+    text = synthetic_resume(1)
+    result = analyze_resume_text(text, budget=TimeBudget(60))
+    assert "partial" not in result and result == analyze_resume_text(text)
+
+def test_out_of_time_before_parse():
+    needs_model()
+    result = analyze_resume_text(synthetic_resume(1), budget=TimeBudget(0))
+    assert result["partial"] and result["sections"] == {}
+    assert result["skippedStages"] == ["parse", "keywords", "summary_section", "experience_section", "skills_section", "education_section", "projects_section"]
+    assert not any("Add a 'Summary'" in suggestion for suggestion in result["suggestions"]) # Skipped, not missing
+
+def test_cut_between_roles():
+    needs_model()
+    text = synthetic_resume(2, roles=4, bullets=3)
+    full = analyze_resume_text(text)["sections"]["experience"]
+    # parse, summary_section, experience_section, then one check per experience line: stop after about two roles
+    result = analyze_resume_text(text, budget=CheckBudget(3 + 10))
+    assert result["skippedStages"] == ["segment_experience", "skills_section", "education_section", "projects_section"]
+    assert set(result["sections"]) == {"summary", "experience"}
+    roles = result["sections"]["experience"]["parsed_roles"]
+    assert 0 < len(roles) < len(full["parsed_roles"]) and roles == full["parsed_roles"][:len(roles)]
+
+def test_wall_clock_budget_stops_a_long_experience_section():
+    # 300 roles of 8 bullets take seconds to segment; the budget has to stop the parsing, not just discard its result
+    needs_model()
+    text = synthetic_resume(7, roles=300, bullets=8)
+    experience = text[slice(*identify_section_spans(text)["experience"])]
+    resume_analyzer._parsed_pieces.clear()
+    budget, start = TimeBudget(0.2), time.monotonic()
+    roles = segment_experience(experience, budget)
+    assert time.monotonic() - start < 1 and budget.skipped == ["segment_experience"]
+    assert roles and roles == segment_experience(experience[:roles[-1]["role_offsets"][1]]) # Complete roles, as a full run has them
+
+if __name__ == "__main__":
+    for test in (test_generous_budget_is_complete, test_out_of_time_before_parse, test_cut_between_roles, test_wall_clock_budget_stops_a_long_experience_section): test()
+    print("ok")
@@ -0,0 +1,106 @@
+# Checks upload intake: type sniffing, size limits, spooled-file takeover and DOCX text extraction.
+# Run with: python -m pytest test_uploads.py  (or python test_uploads.py)
+import functools
+import io
+import os
+import threading
+import time
+import pytest
+from werkzeug.datastructures import FileStorage
+import pdf_workers
+import resume_analyzer
+from pdf_workers import PdfExtractWorkers
+from resume_analyzer import DocumentTooLarge, extract_text_from_docx, extract_text_from_pdf, iter_pdf_pages
+from synthetic_resumes import synthetic_resume, text_to_pdf
+from uploads import Upload, UploadRejected, document_kind
+
+PDF = text_to_pdf(synthetic_resume(0), 3)
+
+def test_document_kind():
+    assert document_kind(PDF[:1024], "resume.bin") == "pdf"
+    assert document_kind(b"junk\n" + PDF[:1000], "") == "pdf"
+    assert document_kind(b"PK\x03\x04rest", "resume.docx") == "docx"
+    assert document_kind(b"PK\x03\x04rest", "archive.zip") is None
+    assert document_kind(b"plain text", "resume.pdf") is None
+
+def test_limits():
+    with pytest.raises(UploadRejected) as rejected: Upload.from_bytes(PDF, "r.pdf", max_bytes=100)
+    assert rejected.value.status == 413
+    with pytest.raises(UploadRejected) as rejected: Upload.from_bytes(b"hello", "r.txt")
+    assert rejected.value.status == 415
+    with pytest.raises(DocumentTooLarge): extract_text_from_pdf(io.BytesIO(PDF), max_pages=2)
+
+def test_spooled_upload_is_taken_over(tmp_path):
+    spooled = tmp_path / "upload-x.part"
+    spooled.write_bytes(PDF)
+    upload = Upload.from_file_storage(FileStorage(open(spooled, "rb+"), filename="r.pdf"))
+    assert not spooled.exists() and os.path.exists(upload.source)
+    assert upload.kind == "pdf" and upload.size == len(PDF) and upload.sha256 == Upload.from_bytes(PDF, "r.pdf").sha256
+    assert extract_text_from_pdf(upload.source) == extract_text_from_pdf(io.BytesIO(PDF)) # Memory-mapped read
+    path = upload.source
+    upload.close()
+    assert not os.path.exists(path)
+
+def test_docx_text():
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Skills")
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text, table.cell(0, 1).text = "Python", "Docker"
+    document.add_paragraph("Experience")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    upload = Upload.from_bytes(buffer.getvalue(), "r.docx")
+    assert upload.kind == "docx"
+    assert extract_text_from_docx(upload.source).split("\n") == ["Skills", "Python", "Docker", "Experience"]
+
+def extract_or_hang(hung_page: int, page_num: int) -> str:
+    if page_num == hung_page: time.sleep(60)
+    return pdf_workers.extract_page(page_num)
+
+def extract_with_a_hung_page(hung_page: int, in_thread: bool, **options) -> tuple:
+    # Page hung_page never finishes. The extraction processes are spawned, so they get the hang through their extract
+    # function rather than a patched module
+    saved, pages, start = resume_analyzer.pdf_extract_workers, [], time.monotonic()
+    resume_analyzer.pdf_extract_workers = PdfExtractWorkers(extract=functools.partial(extract_or_hang, hung_page))
+    try:
+        run = lambda: pages.extend(iter_pdf_pages(io.BytesIO(PDF), **options))
+        if in_thread:
+            thread = threading.Thread(target=run) # Like a gthread worker: SIGALRM cannot reach it
+            thread.start(); thread.join()
+        else:
+            run()
+    finally:
+        resume_analyzer.pdf_extract_workers.shutdown()
+        resume_analyzer.pdf_extract_workers = saved
+    return [text is not None for _, text in pages], time.monotonic() - start
+
+def test_extraction_processes_are_reused():
+    workers = PdfExtractWorkers()
+    try:
+        first = [text for _, text, _ in workers.iter_pages(PDF, 3, 1, page_timeout=5, deadline=None)]
+        process = workers._idle[0][0]
+        assert [text for _, text, _ in workers.iter_pages(PDF, 3, 2, page_timeout=5, deadline=None)] == first and all(first)
+        assert process in [idle_process for idle_process, _ in workers._idle] and len(workers._idle) == 2
+    finally:
+        workers.shutdown()
+
+def test_page_cap_holds_off_the_main_thread():
+    extracted, elapsed = extract_with_a_hung_page(1, True, page_timeout=0.5, extract_timeout=0, max_workers=1)
+    assert extracted == [True, False, True] and elapsed < 10
+
+def test_document_deadline_skips_the_remaining_pages():
+    extracted, elapsed = extract_with_a_hung_page(1, True, page_timeout=0, extract_timeout=1, max_workers=1)
+    assert extracted == [True, False, False] and elapsed < 10
+
+def test_pool_pages_share_one_deadline():
+    extracted, elapsed = extract_with_a_hung_page(0, False, page_timeout=0.5, extract_timeout=0, max_workers=2, parallel_min_pages=2)
+    assert extracted == [False, True, True] and elapsed < 10
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    for test in (test_document_kind, test_limits, test_docx_text, test_page_cap_holds_off_the_main_thread,
+                 test_document_deadline_skips_the_remaining_pages, test_pool_pages_share_one_deadline,
+                 test_extraction_processes_are_reused): test()
+    with tempfile.TemporaryDirectory() as tmp: test_spooled_upload_is_taken_over(pathlib.Path(tmp))
+    print("ok")
@@ -0,0 +1,123 @@
+# File: python-resume-analyzer/uploads.py
+# Description: Bounded-memory upload handling - request size limits, spooling large uploads to temporary files,
+# and working out whether an upload is a PDF or a DOCX. Spooled files are later read through mmap, not copied.
+
+import hashlib
+import io
+import os
+import tempfile
+from flask import Request
+
+MAX_UPLOAD_BYTES = int(float(os.environ.get("MAX_UPLOAD_MB", 10)) * 1024 * 1024) # Per uploaded document
+MAX_REQUEST_BYTES = int(float(os.environ.get("MAX_REQUEST_MB", 4 * MAX_UPLOAD_BYTES / (1024 * 1024))) * 1024 * 1024) # Whole request body (MAX_CONTENT_LENGTH)
+UPLOAD_SPOOL_BYTES = int(os.environ.get("UPLOAD_SPOOL_BYTES", 512 * 1024)) # Larger request bodies spool file parts to disk
+UPLOAD_TMP_DIR = os.environ.get("UPLOAD_TMP_DIR") or None
+_CHUNK_SIZE = 1024 * 1024
+_HEAD_SIZE = 1024
+
+class UploadRejected(Exception):
+    """An upload refused before it is parsed; status is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 413):
+        super().__init__(message)
+        self.status = status
+
+class SpoolingRequest(Request):
+    """Flask request that writes the file parts of large multipart bodies straight to named temporary files
+    (Werkzeug's default spool is anonymous), so an Upload can take the file over and analysis can map it by path.
+    Files no Upload took over are deleted by remove_spooled_files() at teardown."""
+
+    max_form_memory_size = 1024 * 1024 # Non-file form fields are held in memory, so they get a cap of their own
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_BYTES: return io.BytesIO()
+        spool = tempfile.NamedTemporaryFile("wb+", prefix="upload-", suffix=".part", dir=UPLOAD_TMP_DIR, delete=False)
+        self.__dict__.setdefault("spooled_paths", []).append(spool.name)
+        return spool
+
+    def remove_spooled_files(self):
+        for path in self.__dict__.pop("spooled_paths", []):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass # Taken over by an Upload
+
+def document_kind(head: bytes, filename: str):
+    """"pdf", "docx" or None, from the first KB of the file (or from the extension when the file is empty)."""
+    if b"%PDF-" in head: return "pdf" # Readers accept a header anywhere in the first 1024 bytes
+    extension = os.path.splitext(filename or "")[1].lower()
+    if head.startswith(b"PK\x03\x04") and extension in ("", ".docx"): return "docx" # A zip; python-docx checks the rest
+    return {".pdf": "pdf", ".docx": "docx"}.get(extension) if not head else None
+
+class Upload:
+    """One uploaded document, held in memory when small and in a temporary file (owned by the Upload) otherwise.
+
+    source is what the text extractors take: the file's path, which they memory-map, or a fresh BytesIO.
+    sha256 is computed while the upload is taken in, so the result cache never needs the bytes in memory.
+    Use it as a context manager, or call close(), to delete the temporary file.
+    """
+
+    def __init__(self, filename: str, kind: str, sha256: str, size: int, data: bytes = None, path: str = None):
+        self.filename, self.kind, self.sha256, self.size = filename, kind, sha256, size
+        self.data, self.path = data, path
+
+    @property
+    def source(self):
+        return self.path if self.path is not None else io.BytesIO(self.data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, filename: str, max_bytes: int = None):
+        max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+        if max_bytes and len(data) > max_bytes: raise UploadRejected(_too_large_message(max_bytes))
+        return cls(filename, _kind_or_reject(data[:_HEAD_SIZE], filename), hashlib.sha256(data).hexdigest(), len(data), data=data)
+
+    @classmethod
+    def from_file_storage(cls, file_storage, max_bytes: int = None):
+        """Takes over a Werkzeug FileStorage: a part spooled to disk by SpoolingRequest is renamed (so teardown
+        leaves it alone) and hashed in chunks; an in-memory part is read as bytes."""
+        max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+        stream, filename = file_storage.stream, file_storage.filename
+        spooled_path = getattr(stream, "name", None)
+        if not isinstance(spooled_path, str) or not os.path.exists(spooled_path):
+            stream.seek(0)
+            return cls.from_bytes(stream.read(), filename, max_bytes)
+        stream.flush()
+        path = spooled_path[:-len(".part")] + ".upload" if spooled_path.endswith(".part") else spooled_path + ".upload"
+        os.rename(spooled_path, path)
+        upload = cls(filename, None, None, 0, path=path)
+        try:
+            digest, head = hashlib.sha256(), b""
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    if not head: head = chunk[:_HEAD_SIZE]
+                    digest.update(chunk)
+                    upload.size += len(chunk)
+                    if max_bytes and upload.size > max_bytes: raise UploadRejected(_too_large_message(max_bytes))
+            upload.sha256, upload.kind = digest.hexdigest(), _kind_or_reject(head, filename)
+        except BaseException:
+            upload.close()
+            raise
+        return upload
+
+    def close(self):
+        if self.path is None: return
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def _too_large_message(max_bytes: int) -> str:
+    return f"The uploaded file is larger than the {max_bytes / (1024 * 1024):g} MB limit."
+
+def _kind_or_reject(head: bytes, filename: str) -> str:
+    kind = document_kind(head, filename)
+    if kind is None: raise UploadRejected("Unsupported file type. Upload a PDF or a DOCX file.", status=415)
+    return kind